@@ -13,8 +13,12 @@ class AbstractState:
     ----------
     state: Engine
         the fluid state
+    engine_calls: int
+        the number of state calculations performed by all engines in this process, i.e. a batch of N states counts N
     """
 
+    engine_calls = 0
+
     def __init__(self,
                  engine: str,
                  components: list[str],
@@ -65,10 +69,61 @@ class AbstractState:
         Properties
         """
 
+        AbstractState.engine_calls += 1
+
         self.state.calc(InputSpec, Input1, Input2, *args, **kwargs)
 
         return self.state.state_properties
 
+    def update_many(self, InputSpec: str, Input1: np.ndarray, Input2: np.ndarray, *args: tuple[any], **kwargs: dict[any]) -> Properties:
+        """
+        Evaluates the properties of the fluid for arrays of state specifications
+
+        Parameters
+        ----------
+        InputSpec: str
+            The state variables. This should be two letter, e.g. "PH" for a pressure enthalpy calculation
+        Input1: np.ndarray
+            The values corresponding to state variable 1
+        Input2: np.ndarray
+            The values corresponding to state variable 2
+        *args: tuple[any]
+            Any additional arguments needed by the calculation engine
+
+        Returns
+        -------
+        Properties
+        """
+
+        AbstractState.engine_calls += np.broadcast(np.asarray(Input1), np.asarray(Input2)).size
+
+        return self.state.calc_batch(InputSpec, Input1, Input2, *args, **kwargs)
+
+    def saturation_curve(self) -> "SaturationCurve | None":
+        """
+        Retrieves the saturation curve of the fluid, if the calculation engine provides one
+
+        Returns
+        -------
+        SaturationCurve | None
+        """
+
+        return self.state.saturation_curve()
+
+    def copy(self) -> "AbstractState":
+        """
+        Creates a copy of the Abstract state with a copy of its engine
+
+        Returns
+        -------
+        AbstractState
+        """
+
+        temp_state = AbstractState.__new__(AbstractState)
+        temp_state.state = self.state.copy()
+
+        return temp_state
+
     def update_composition(self, composition: list[float]) -> NoReturn:
         """
         Updates the component mole fractions in the underlying state
@@ -122,6 +177,8 @@ def PropSI(prop: str,
     ------
     ValueError
         state variable inputs are of unrecognised type
+    ValueError
+        the state calculation failed for any of the states
     """
 
     temp_fluid = fluid.copy()
@@ -131,7 +188,7 @@ def PropSI(prop: str,
     # convert a scalar input to a list
     if type(x) in [float, int, np.float64]:
         x_ = np.array([x])
-    elif type(x) in [np.array]:
+    elif type(x) in [np.ndarray]:
         x_ = x
     elif type(x) in [list]:
         x_ = np.array(x)
@@ -140,14 +197,36 @@ def PropSI(prop: str,
 
     if type(y) in [float, int, np.float64]:
         y_ = np.array([y])
-    elif type(y) in [np.array]:
+    elif type(y) in [np.ndarray]:
         y_ = y
     elif type(y) in [list]:
         y_ = np.array(y)
     else:
         raise ValueError("unrecognised type")
 
-    if x_.size == y_.size and profile is True:
+    if prop in temp_fluid.state.state.batch_properties:
+
+        if x_.size == y_.size and profile is True:
+            batch = temp_fluid.update_many(xy_str, x_, y_)
+        else:
+            batch = temp_fluid.update_many(xy_str, x_[:, np.newaxis], y_[np.newaxis, :])
+
+        # the batch calculations return failed states as NaN, whereas the individual calculations raise an error
+        failed = np.isnan(batch.H)
+        if failed.any():
+            i = np.unravel_index(np.argmax(failed), failed.shape)
+            x_fail = x_[i[0]]
+            y_fail = y_[i[0]] if failed.ndim == 1 else y_[i[1]]
+
+            msg = "\nThe {} calculation failed for {} of {} states, e.g. {} = {} and {} = {}".format(
+                xy_str, failed.sum(), failed.size, x_str, x_fail, y_str, y_fail)
+            raise ValueError(msg)
+
+        z = batch[prop]
+        if x_.size == 1 and y_.size == 1:
+            z = z.ravel()[0]
+
+    elif x_.size == y_.size and profile is True:
 
         z = np.zeros(x_.size)
         for i, x in enumerate(x_):
@@ -167,4 +246,3 @@ def PropSI(prop: str,
                 z[i, j] = temp_fluid.properties[prop]
 
     return z
-
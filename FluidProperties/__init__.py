@@ -15,8 +15,8 @@ factory.register("default", CoolPropEngine)
 with open(os.path.dirname(__file__)+"\\engines.json") as file:
     data = json.load(file)
 
-     # load the plugins
-    loader.load_plugins(data["plugins"])
+     # register the plugins, which are only imported when one of their engines is first created
+    loader.load_plugins(data["plugins"], lazy=True)
 
      # create the characters
     # engines = [factory.create(item) for item in data["engines"]]  # i prefer to return the engines as a dictionary
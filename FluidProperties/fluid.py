@@ -123,6 +123,42 @@ class Fluid:
 
         self.properties = self.state.update(InputSpec, Input1, Input2, *args, **kwargs)
 
+    def update_many(self, InputSpec: str, Input1: np.ndarray, Input2: np.ndarray, *args: tuple[any], **kwargs: dict[any]) -> Properties:
+        """
+        Evaluates the properties of the fluid for arrays of state specifications in a single call. The inputs are
+        broadcast against each other. The properties of the fluid itself are not changed.
+
+        Parameters
+        ----------
+        InputSpec: str
+            The state variables. This should be two letter, e.g. "PH" for a pressure enthalpy calculation
+        Input1: np.ndarray
+            The values corresponding to state variable 1
+        Input2: np.ndarray
+            The values corresponding to state variable 2
+        *args: tuple[any]
+            Any additional arguments needed by the calculation engine
+
+        Returns
+        -------
+        Properties
+            one array per property, e.g. H, S, T, P, D, Q and MU. States that cannot be calculated are NaN
+        """
+
+        return self.state.update_many(InputSpec, Input1, Input2, *args, **kwargs)
+
+    def saturation_curve(self) -> "SaturationCurve | None":
+        """
+        Retrieves the saturation curve of the fluid, which is shared by all fluids of the same definition. This is only
+        available for pure fluids of engines that provide one, e.g. CoolProp.
+
+        Returns
+        -------
+        SaturationCurve | None
+        """
+
+        return self.state.saturation_curve()
+
     def update_composition(self, Zs: list[float], InPlace: Optional[bool] = True) -> "Fluid":
         """
         Updates the composition of the fluid
@@ -166,7 +202,8 @@ class Fluid:
 
     def copy(self) -> "Fluid":
         """
-        Creates a deepcopy of the current fluid
+        Creates a copy of the current fluid. The property engine is copied rather than constructed again, so that the
+        copy shares the pooled and immutable data of the engine, e.g. the CoolProp backends, but not its state.
 
         Returns
         -------
@@ -174,15 +211,20 @@ class Fluid:
 
         """
 
-        comps = []
-        for i, comp in enumerate(self.components):
-            comps.append(comp)
-            comps.append(self.composition[i])
+        temp_fluid = Fluid.__new__(Fluid)
+
+        temp_fluid.engine = self.engine
+        temp_fluid.name = self.name
+        temp_fluid.components = [comp for comp in self.components]
+        temp_fluid.composition = [compo for compo in self.composition]
+        temp_fluid.mixture = self.mixture
+
+        temp_fluid.state = self.state.copy()
 
-        temp_props = self.properties.copy()
+        temp_fluid.properties = self.properties.copy()
 
-        temp_fluid = Fluid(comps, *self.args, engine=self.engine, **self.kwargs)
-        temp_fluid.properties = temp_props
+        temp_fluid.args = self.args
+        temp_fluid.kwargs = self.kwargs
 
         return temp_fluid  # type: ignore
 
@@ -1,4 +1,9 @@
+import ast
 import importlib
+import importlib.util
+import sys
+
+from . import factory
 
 
 class ModuleInterface:
@@ -9,13 +14,67 @@ class ModuleInterface:
         """Register the necessary items in the game character factory."""
 
 
+class LazyPlugin:
+    """
+    Stands in for the creation function of an engine until it is first used. The plugin, and with it the heavy
+    dependencies of the engine (e.g. GeoProp, ThermoFun or Reaktoro), is only imported then.
+    """
+
+    def __init__(self, plugin_file, engine_name):
+        self.plugin_file = plugin_file
+        self.engine_name = engine_name
+
+    def __call__(self, *args, **kwargs):
+        """Imports and registers the plugin, then creates the engine."""
+        creation_func = factory.engine_creation_funcs.get(self.engine_name)
+
+        if creation_func is self or creation_func is None:
+            import_module(self.plugin_file).register()
+            creation_func = factory.engine_creation_funcs.get(self.engine_name)
+
+            if creation_func is self or creation_func is None:
+                msg = "\nThe plugin \"{}\" did not register the engine \"{}\"".format(self.plugin_file, self.engine_name)
+                raise ValueError(msg)
+
+        return creation_func(*args, **kwargs)
+
+
 def import_module(name):
     """Imports a module given a name."""
     return importlib.import_module(name, "plugins_test")
 
 
-def load_plugins(plugins):
-    """Loads the plugins defined in the plugins list."""
+def registered_names(name):
+    """Finds the names a plugin registers, by reading its register function without importing the plugin."""
+    try:
+        with open(importlib.util.find_spec(name).origin) as file:
+            tree = ast.parse(file.read())
+    except:
+        return []
+
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "register":
+            for call in ast.walk(node):
+                if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) and call.func.attr == "register" \
+                        and call.args and isinstance(call.args[0], ast.Constant) and isinstance(call.args[0].value, str):
+                    names.append(call.args[0].value)
+
+    return names
+
+
+def load_plugins(plugins, lazy=False):
+    """
+    Loads the plugins defined in the plugins list. Lazy plugins are registered without being imported, unless they
+    are imported already or the names they register cannot be found.
+    """
     for plugin_file in plugins:
-        plugin = import_module(plugin_file)
-        plugin.register()
+        names = registered_names(plugin_file) if lazy and plugin_file not in sys.modules else []
+
+        if names:
+            for name in names:
+                if name not in factory.engine_creation_funcs:
+                    factory.register(name, LazyPlugin(plugin_file, name))
+        else:
+            plugin = import_module(plugin_file)
+            plugin.register()
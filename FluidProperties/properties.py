@@ -53,7 +53,10 @@ class Properties:
         "Properties"
         """
 
-        return Properties(self.__dict__)  # type: ignore
+        temp_props = Properties.__new__(Properties)
+        temp_props.__dict__.update(self.__dict__)
+
+        return temp_props  # type: ignore
 
     def as_dict(self) -> dict[str, float]:
         """
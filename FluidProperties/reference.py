@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from typing import Callable, NoReturn, Optional
+
+
+class ReferenceStates:
+    """
+    This class is a process-wide registry of the reference state (i.e. at Pref and Tref) of every fluid definition
+
+    Attributes
+    ----------
+    maxsize: int
+        the maximum number of reference states kept in the registry
+    states: OrderedDict[tuple, tuple[float, float]]
+        the specific enthalpy and entropy at the reference state for each fluid definition
+    hits: int
+        the number of reference states retrieved from the registry
+    misses: int
+        the number of reference states that had to be calculated
+    """
+
+    def __init__(self, maxsize: Optional[int]=4096) -> NoReturn:
+        """
+        instantiates the ReferenceStates registry
+
+        Parameters
+        ----------
+        maxsize: Optional[int]
+            the maximum number of reference states kept in the registry
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.maxsize = maxsize
+        self.states = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(backend: str, components: list[str], composition: Optional[list[float] | None]=None) -> tuple:
+        """
+        creates the registry key for a fluid definition
+
+        Parameters
+        ----------
+        backend: str
+            the name of the backend evaluating the reference state, e.g. "coolprop"
+        components: list[str]
+            the component names
+        composition: Optional[list[float] | None]
+            the component mole fractions
+
+        Returns
+        -------
+        tuple
+        """
+
+        if composition is None or len(composition) < 2:
+            return backend, tuple(components), None
+
+        return backend, tuple(components), tuple(float(z) for z in composition)
+
+    def get(self, key: tuple, calc_func: Callable[[], tuple[float, float]]) -> tuple[float, float]:
+        """
+        retrieves the reference state of a fluid definition, calculating it on first use
+
+        Parameters
+        ----------
+        key: tuple
+            the registry key, see ReferenceStates.key
+        calc_func: Callable[[], tuple[float, float]]
+            function returning the specific enthalpy and entropy at the reference state
+
+        Returns
+        -------
+        tuple[float, float]
+        """
+
+        if key in self.states:
+            self.hits += 1
+            self.states.move_to_end(key)
+
+            return self.states[key]
+
+        self.misses += 1
+
+        h0, s0 = calc_func()
+        self.states[key] = (h0, s0)
+
+        if len(self.states) > self.maxsize:
+            self.states.popitem(last=False)
+
+        return h0, s0
+
+    def clear(self) -> NoReturn:
+        """
+        removes all reference states from the registry and resets the counters
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.states.clear()
+
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        returns the registry statistics
+
+        Returns
+        -------
+        dict[str, int]
+        """
+
+        return {"size": len(self.states), "hits": self.hits, "misses": self.misses}
+
+
+reference_states = ReferenceStates()
@@ -0,0 +1,444 @@
+from bisect import bisect_right
+from collections import OrderedDict
+import math
+from typing import Callable, NoReturn, Optional
+
+import numpy as np
+from scipy.interpolate import CubicHermiteSpline, PchipInterpolator
+
+
+class SaturationCurve:
+    """
+    This class describes the saturation curve of a pure fluid up to its critical point. The saturation pressure and
+    temperature, and the specific enthalpy and entropy of the saturated liquid and vapour are interpolated by splines,
+    which are generated on first use.
+
+    The saturation pressure is interpolated as ln(P) over 1/T (and vice versa) by cubic Hermite splines, using the
+    slope from the Clausius-Clapeyron equation. The saturated properties are interpolated by monotone (PCHIP) splines
+    over (1 - T/T_crit)^(1/3), which is (nearly) linear in these properties close to the critical point. The spline
+    nodes are uniformly spaced in the latter.
+
+    Attributes
+    ----------
+    engine: Engine
+        the calculation engine of the fluid, which must support "TQ" batch calculations
+    T_crit: float
+        the critical temperature, in K
+    p_crit: float
+        the critical pressure, in Pa
+    T_min: float
+        the minimum temperature of the saturation curve, in K
+    N: int
+        the number of spline nodes
+    splines: dict[str, CubicHermiteSpline] | None
+        the splines of the saturation curve
+    """
+
+    def __init__(self, engine: "Engine", T_crit: float, p_crit: float, T_min: float, N: Optional[int]=1000) -> NoReturn:
+        """
+        instantiates the SaturationCurve
+
+        Parameters
+        ----------
+        engine: Engine
+            the calculation engine of the fluid, which must support "TQ" batch calculations
+        T_crit: float
+            the critical temperature, in K
+        p_crit: float
+            the critical pressure, in Pa
+        T_min: float
+            the minimum temperature of the saturation curve, in K
+        N: Optional[int]
+            the number of spline nodes
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.engine = engine
+
+        self.T_crit = T_crit
+        self.p_crit = p_crit
+        self.T_min = T_min
+
+        self.N = N
+
+        self.splines = None
+
+    def __tau(self, T: float | np.ndarray) -> float | np.ndarray:
+        """
+        Helper function to calculate the spline coordinate of the saturated properties
+
+        Parameters
+        ----------
+        T: float | np.ndarray
+            the temperature, in K
+
+        Returns
+        -------
+        float | np.ndarray
+        """
+
+        if np.ndim(T) == 0:
+            x = 1 - T / self.T_crit
+            return math.copysign(abs(x) ** (1 / 3), x)
+
+        return np.cbrt(1 - T / self.T_crit)
+
+    def __build(self) -> NoReturn:
+        """
+        Helper function to generate the splines of the saturation curve
+
+        Returns
+        -------
+        NoReturn
+
+        Raises
+        ------
+        ValueError
+            the saturation curve could not be calculated
+        """
+
+        # the last node lies just below the critical point, where the saturated states can still be calculated
+        tau = np.linspace(self.__tau(self.T_min), 1e-2, self.N)
+        T = self.T_crit * (1 - tau ** 3)
+
+        sat = self.engine.calc_batch("TQ", T[np.newaxis, :], np.array([[0.0], [1.0]]))
+
+        valid = ~np.any(np.isnan(sat.P) | np.isnan(sat.H) | np.isnan(sat.S), axis=0)
+        if sum(valid) < 4:
+            msg = "\nThe saturation curve could not be calculated"
+            raise ValueError(msg)
+
+        T, tau = T[valid], tau[valid]
+        P = sat.P[0][valid]
+
+        # Clausius-Clapeyron: dlnP/d(1/T) = -T^2/P dP/dT = -T (h_vap - h_liq) / (P (v_vap - v_liq))
+        slope = -T * (sat.H[1][valid] - sat.H[0][valid]) / (P * (1 / sat.D[1][valid] - 1 / sat.D[0][valid]))
+
+        # the splines require increasing abscissae
+        self.splines = {"lnP": CubicHermiteSpline(1 / T[::-1], np.log(P[::-1]), slope[::-1]),
+                        "invT": CubicHermiteSpline(np.log(P), 1 / T, 1 / slope),
+                        "h_liq": PchipInterpolator(tau[::-1], sat.H[0][valid][::-1]),
+                        "h_vap": PchipInterpolator(tau[::-1], sat.H[1][valid][::-1]),
+                        "s_liq": PchipInterpolator(tau[::-1], sat.S[0][valid][::-1]),
+                        "s_vap": PchipInterpolator(tau[::-1], sat.S[1][valid][::-1])}
+
+        self.T_max = T[-1]
+        self.p_max = P[-1]
+        self.p_min = P[0]
+
+        # the breakpoints and polynomial coefficients of each interval, for evaluating single values
+        self.__scalar_splines = {name: (spline.x.tolist(), spline.c.T.tolist()) for name, spline in self.splines.items()}
+
+    def __evaluate(self, spline: str, x: float | np.ndarray, inside: bool | np.ndarray) -> float | np.ndarray:
+        """
+        Helper function to evaluate a spline. Values outside of the saturation curve are returned as NaN
+
+        Parameters
+        ----------
+        spline: str
+            the name of the spline
+        x: float | np.ndarray
+            the spline coordinate
+        inside: bool | np.ndarray
+            flags indicating whether the values lie on the saturation curve
+
+        Returns
+        -------
+        float | np.ndarray
+        """
+
+        if self.splines is None:
+            self.__build()
+
+        if np.ndim(x) == 0:
+            if not inside:
+                return np.nan
+
+            # evaluating the polynomial directly is much faster than calling the spline for a single value
+            breaks, coefficients = self.__scalar_splines[spline]
+            i = min(max(bisect_right(breaks, x) - 1, 0), len(coefficients) - 1)
+
+            dx = float(x) - breaks[i]
+            c3, c2, c1, c0 = coefficients[i]
+
+            return ((c3 * dx + c2) * dx + c1) * dx + c0
+
+        return np.where(inside, self.splines[spline](x), np.nan)
+
+    def __inside_T(self, T: float | np.ndarray) -> bool | np.ndarray:
+        """
+        Helper function to check whether temperatures lie on the saturation curve
+
+        Parameters
+        ----------
+        T: float | np.ndarray
+            the temperature, in K
+
+        Returns
+        -------
+        bool | np.ndarray
+        """
+
+        if self.splines is None:
+            self.__build()
+
+        return (T >= self.T_min) & (T <= self.T_max)
+
+    def Psat(self, T: float | np.ndarray) -> float | np.ndarray:
+        """
+        calculates the saturation pressure
+
+        Parameters
+        ----------
+        T: float | np.ndarray
+            the temperature, in K
+
+        Returns
+        -------
+        float | np.ndarray
+            the saturation pressure, in Pa. NaN outside of the saturation curve
+        """
+
+        T = float(T) if np.ndim(T) == 0 else np.asarray(T, dtype=float)
+
+        lnP = self.__evaluate("lnP", 1 / T, self.__inside_T(T))
+
+        return math.exp(lnP) if np.ndim(lnP) == 0 else np.exp(lnP)
+
+    def Tsat(self, P: float | np.ndarray) -> float | np.ndarray:
+        """
+        calculates the saturation temperature
+
+        Parameters
+        ----------
+        P: float | np.ndarray
+            the pressure, in Pa
+
+        Returns
+        -------
+        float | np.ndarray
+            the saturation temperature, in K. NaN outside of the saturation curve
+        """
+
+        if self.splines is None:
+            self.__build()
+
+        if np.ndim(P) == 0:
+            P = float(P)
+            if not self.p_min <= P <= self.p_max:
+                return np.nan
+
+            return 1 / self.__evaluate("invT", math.log(P), True)
+
+        P = np.asarray(P, dtype=float)
+        inside = (P >= self.p_min) & (P <= self.p_max)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return 1 / self.__evaluate("invT", np.log(P), inside)
+
+    def h_liq(self, T: float | np.ndarray) -> float | np.ndarray:
+        """
+        calculates the specific enthalpy of the saturated liquid
+
+        Parameters
+        ----------
+        T: float | np.ndarray
+            the temperature, in K
+
+        Returns
+        -------
+        float | np.ndarray
+            the specific enthalpy, in J/kg. NaN outside of the saturation curve
+        """
+
+        T = float(T) if np.ndim(T) == 0 else np.asarray(T, dtype=float)
+
+        return self.__evaluate("h_liq", self.__tau(T), self.__inside_T(T))
+
+    def h_vap(self, T: float | np.ndarray) -> float | np.ndarray:
+        """
+        calculates the specific enthalpy of the saturated vapour
+
+        Parameters
+        ----------
+        T: float | np.ndarray
+            the temperature, in K
+
+        Returns
+        -------
+        float | np.ndarray
+            the specific enthalpy, in J/kg. NaN outside of the saturation curve
+        """
+
+        T = float(T) if np.ndim(T) == 0 else np.asarray(T, dtype=float)
+
+        return self.__evaluate("h_vap", self.__tau(T), self.__inside_T(T))
+
+    def s_liq(self, T: float | np.ndarray) -> float | np.ndarray:
+        """
+        calculates the specific entropy of the saturated liquid
+
+        Parameters
+        ----------
+        T: float | np.ndarray
+            the temperature, in K
+
+        Returns
+        -------
+        float | np.ndarray
+            the specific entropy, in J/kg/K. NaN outside of the saturation curve
+        """
+
+        T = float(T) if np.ndim(T) == 0 else np.asarray(T, dtype=float)
+
+        return self.__evaluate("s_liq", self.__tau(T), self.__inside_T(T))
+
+    def s_vap(self, T: float | np.ndarray) -> float | np.ndarray:
+        """
+        calculates the specific entropy of the saturated vapour
+
+        Parameters
+        ----------
+        T: float | np.ndarray
+            the temperature, in K
+
+        Returns
+        -------
+        float | np.ndarray
+            the specific entropy, in J/kg/K. NaN outside of the saturation curve
+        """
+
+        T = float(T) if np.ndim(T) == 0 else np.asarray(T, dtype=float)
+
+        return self.__evaluate("s_vap", self.__tau(T), self.__inside_T(T))
+
+    def phase(self, P: float, H: float) -> str:
+        """
+        classifies the phase region of a state
+
+        Parameters
+        ----------
+        P: float
+            the pressure, in Pa
+        H: float
+            the specific enthalpy, in J/kg
+
+        Returns
+        -------
+        str
+            "liquid", "twophase", "vapour" or "supercritical". "unknown" below the saturation curve
+        """
+
+        if P >= self.p_crit:
+            return "supercritical"
+
+        T = self.Tsat(P)
+        if np.isnan(T):
+            return "supercritical" if P > self.p_min else "unknown"
+
+        if H < self.h_liq(T):
+            return "liquid"
+        elif H > self.h_vap(T):
+            return "vapour"
+        else:
+            return "twophase"
+
+
+class SaturationCurves:
+    """
+    This class is a process-wide registry of the saturation curves of pure fluids
+
+    Attributes
+    ----------
+    maxsize: int
+        the maximum number of saturation curves kept in the registry
+    curves: OrderedDict[tuple, SaturationCurve]
+        the saturation curve of each fluid definition
+    hits: int
+        the number of saturation curves retrieved from the registry
+    misses: int
+        the number of saturation curves that had to be created
+    """
+
+    def __init__(self, maxsize: Optional[int]=64) -> NoReturn:
+        """
+        instantiates the SaturationCurves registry
+
+        Parameters
+        ----------
+        maxsize: Optional[int]
+            the maximum number of saturation curves kept in the registry
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.maxsize = maxsize
+        self.curves = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, create_func: Callable[[], SaturationCurve]) -> SaturationCurve:
+        """
+        retrieves the saturation curve of a fluid definition, creating it on first use
+
+        Parameters
+        ----------
+        key: tuple
+            the registry key, e.g. the backend and component names
+        create_func: Callable[[], SaturationCurve]
+            function returning the saturation curve
+
+        Returns
+        -------
+        SaturationCurve
+        """
+
+        if key in self.curves:
+            self.hits += 1
+            self.curves.move_to_end(key)
+
+            return self.curves[key]
+
+        self.misses += 1
+
+        curve = create_func()
+        self.curves[key] = curve
+
+        if len(self.curves) > self.maxsize:
+            self.curves.popitem(last=False)
+
+        return curve
+
+    def clear(self) -> NoReturn:
+        """
+        removes all saturation curves from the registry and resets the counters
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.curves.clear()
+
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        returns the registry statistics
+
+        Returns
+        -------
+        dict[str, int]
+        """
+
+        return {"size": len(self.curves), "hits": self.hits, "misses": self.misses}
+
+
+saturation_curves = SaturationCurves()
@@ -132,7 +132,7 @@ class CoolPropProperties:
                     volume += mass_fracs[i] / calc.rhomass()
 
             # update the fluid properties in the properties dictionary
-            total_mass = sum([phase.mass[i] for i in phase.mass])
+            total_mass = phase.mass.total()
             props["P"] = P
             props["T"] = T
             props["h"] = enthalpy / 1e3
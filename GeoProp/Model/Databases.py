@@ -3,7 +3,9 @@ from .Phases import PhaseType
 # from . import Phases.PhaseType as PhaseType
 
 from enum import Enum
-from typing import Dict
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+import numpy as np
 
 class Comp(Enum):
     """
@@ -1843,6 +1845,13 @@ class Comp(Enum):
     Rf = Species("Rf", None, ["Rf"], 0.261000000, +0, PhaseType.ELEMENT)
     Lr = Species("Lr", None, ["Lr"], 0.262000000, +0, PhaseType.ELEMENT)
 
+    @property
+    def id(self) -> int:
+        """
+        the integer id of the species in the species table
+        """
+        return self._value_.id
+
 
 class LookUp:
     """
@@ -3600,6 +3609,127 @@ class LookUp:
         return self
 
 
+class SpeciesTable:
+    """
+    The SpeciesTable class stores the species of the Comp class as columns, indexed by an integer species id. The Comp
+    class remains the interface to the species, this class provides the arrays and lookups for the calculations.
+
+    Attributes
+    ----------
+    comps : List[Comp]
+        the Comp object of each species id
+    names : List[str]
+        the Reaktoro name of each species
+    thermofunNames : List[str]
+        the ThermoFun name of each species, i.e. with "(aq)" replaced by "@"
+    Mr : np.ndarray
+        the molecular mass of each species in kg/mol
+    charge : np.ndarray
+        the molecular charge of each species
+    phaseTypes : List[PhaseType]
+        the phase types, in the order of their phase codes
+    phase : np.ndarray
+        the phase code of each species
+    elements : List[str]
+        the element names, in the order of the columns of the incidence matrix
+    incidence : np.ndarray
+        the element incidence matrix, i.e. incidence[i, j] is True if species i contains element j
+    elementSets : List[FrozenSet[str]]
+        the elements of each species
+    idByName : Dict[str, int]
+        the species id of each Comp name
+    idByReaktoroName : Dict[str, int]
+        the species id of each Reaktoro species name
+    idByCoolPropName : Dict[str, int]
+        the species id of each CoolProp species name
+    """
+
+    def __init__(self):
+        """
+        Creates the species table from the Comp class, and numbers the species
+        """
+        self.comps = list(Comp)
+
+        for i, comp in enumerate(self.comps):
+            comp.value.id = i
+
+        self.names = [comp.value.alias["RKT"] for comp in self.comps]
+        self.thermofunNames = [name.replace("(aq)", "@") if name is not None else None for name in self.names]
+
+        self.Mr = np.array([comp.value.Mr for comp in self.comps], dtype=float)
+        self.charge = np.array([comp.value.charge for comp in self.comps], dtype=float)
+
+        self.phaseTypes = list(PhaseType)
+        self.phase = np.array([self.phaseTypes.index(comp.value.phase) for comp in self.comps], dtype=int)
+
+        self.elementSets = [frozenset(comp.value.elements) for comp in self.comps]
+        self.elements = sorted(set().union(*self.elementSets))
+
+        elementIds = {element: j for j, element in enumerate(self.elements)}
+        self.incidence = np.zeros((len(self.comps), len(self.elements)), dtype=bool)
+        for i, elements in enumerate(self.elementSets):
+            self.incidence[i, [elementIds[element] for element in elements]] = True
+
+        self.idByName = {comp.name: i for i, comp in enumerate(self.comps)}
+
+        # the LookUp dictionaries define which species a name refers to, if several species share a name
+        self.idByReaktoroName = {name: comp.id for name, comp in LookUp.reaktoroToComp.items()}
+        self.idByCoolPropName = {name: comp.id for name, comp in LookUp.coolpropToComp.items()}
+
+    def ids(self, comps: Iterable[Comp]) -> np.ndarray:
+        """
+        Translate Comp objects into species ids
+
+        Parameters
+        ----------
+        comps : Iterable[Comp]
+            the Comp objects
+
+        Returns
+        -------
+        np.ndarray
+            the species ids
+        """
+        return np.array([comp.value.id for comp in comps], dtype=int)
+
+    def withReaktoroNames(self, names: Iterable[str]) -> List[Comp]:
+        """
+        Translate Reaktoro species names into Comp objects
+
+        Parameters
+        ----------
+        names : Iterable[str]
+            the Reaktoro species names
+
+        Returns
+        -------
+        List[Comp]
+            the Comp objects of the Reaktoro species
+        """
+        return [self.comps[self.idByReaktoroName[name]] for name in names]
+
+    def elementsOf(self, ids: np.ndarray) -> Set[str]:
+        """
+        Determine the elements of a set of species
+
+        Parameters
+        ----------
+        ids : np.ndarray
+            the species ids
+
+        Returns
+        -------
+        Set[str]
+            the elements contained in any of the species
+        """
+        present = np.any(self.incidence[ids], axis=0)
+
+        return {self.elements[j] for j in np.flatnonzero(present)}
+
+
+species_table = SpeciesTable()
+
+
 # this is for generating the LookUp Dictionary
 # test = LookUp().generate()
 #
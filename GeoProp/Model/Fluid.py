@@ -1,5 +1,5 @@
 from .Phases import *
-from .Databases import Comp
+from .Databases import Comp, species_table
 from .ErrorHandling import Error, InputError
 
 import copy
@@ -22,6 +22,14 @@ class Fluid:
     # TODO something to scale the fluid (i.e. based on mass or volume)
 
     """
+
+    # the name of the phase attribute holding the components of each native phase
+    nativePhases = {PhaseType.AQUEOUS: "aqueous",
+                    PhaseType.LIQUID: "liquid",
+                    PhaseType.GASEOUS: "gaseous",
+                    PhaseType.MINERAL: "mineral",
+                    PhaseType.ELEMENT: "element"}
+
     def __init__(self, components: Optional[Union[List[Comp], Comp]] = None, composition: Optional[Union[List[float], float]] = None, CompInMole: Optional[bool]=False):
         """
         Initialises a Fluid object from components and composition (optional)
@@ -144,7 +152,7 @@ class Fluid:
 
         raise Error("\n\nThe component's native phase is not recognised. Component:{}".format(component))
 
-    def addComponents(self, components: List[Comp], composition: List[float], CompInMole: bool) -> NoReturn:
+    def addComponents(self, components: List[Comp], composition: List[float], CompInMole: Optional[bool]=False) -> NoReturn:
         """
         add components to the Fluid
 
@@ -172,9 +180,50 @@ class Fluid:
         if len(components) != len(composition):
             raise InputError("\n\nThe number of components and compositions provided is not the same")
 
-        # add each component to the fluid
-        for i in range(len(components)):
-            self.addComponent(components[i], composition[i], CompInMole, update=False)
+        # determine the species id, mass and moles of each component, grouped by native phase in the order in which the
+        # phases first occur
+        ids = []
+        mass = []
+        moles = []
+        groups = {}
+        for j, (component, comp_value) in enumerate(zip(components, composition)):
+
+            # check that the component exists within the database and that the composition is a number
+            if type(component) != Comp:
+                message = "\n\nThe component '{}' does not exist in the database\n".format(component)
+                raise InputError(message)
+
+            if type(comp_value) not in [int, float, np.float64]:
+                message = "\n\nThe composition of component '{}' is incorrectly formatted (int or float expected)\n".format(component)
+                raise InputError(message)
+
+            species = component.value
+
+            if not CompInMole:
+                mass.append(float(comp_value))
+                moles.append(comp_value / species.Mr)
+            else:
+                moles.append(float(comp_value))
+                mass.append(comp_value * species.Mr)
+
+            ids.append(species.id)
+            groups.setdefault(species.phase, []).append(j)
+
+        # add the components to the total phase
+        self.total.add_components(components, ids, mass, moles, update=False)
+
+        # add the components to their native phases
+        for phaseType, selection in groups.items():
+            if phaseType not in self.nativePhases:
+                raise Error("\n\nThe component's native phase is not recognised. Component:{}".format(components[selection[0]]))
+
+            phase = getattr(self, self.nativePhases[phaseType])
+            if len(selection) == len(components):
+                phase.add_components(components, ids, mass, moles, update=False)
+            else:
+                phase.add_components([components[j] for j in selection], [ids[j] for j in selection],
+                                     [mass[j] for j in selection], [moles[j] for j in selection], update=False)
+            self.total.phases[phaseType] = phase
 
         # re-calculate the component mass and mole fractions
         self.total.update()
@@ -183,6 +232,37 @@ class Fluid:
         self.gaseous.update()
         self.mineral.update()
 
+    def setComponents(self, components: List[Comp], composition: List[float], CompInMole: Optional[bool]=False) -> NoReturn:
+        """
+        replaces the components of the Fluid in place, i.e. without creating new phases
+
+        Parameters
+        ----------
+        components : List[Comp]
+            the components of the Fluid
+        composition : List[float]
+            the composition of the components in kg
+        CompInMole (opt): bool
+            flag to indicate if the composition is in mass or mole
+
+        Returns
+        -------
+        NoReturn
+
+        Raises
+        ------
+        InputError
+            if the number of components and composition is inconsistent
+
+        """
+
+        # empty all phases
+        for phase in [self.total, self.aqueous, self.liquid, self.gaseous, self.mineral, self.element]:
+            phase.clear()
+        self.total.phases.clear()
+
+        self.addComponents(components, composition, CompInMole)
+
     def promotePhaseToFluid(self, phaseType: PhaseType):
         """
         create a Fluid object for a given Phase
@@ -206,7 +286,7 @@ class Fluid:
             phase = self.total.phases[phaseType]
 
         components = [i for i in phase.components]
-        composition = [phase.mass[i] * 1.0 for i in components]
+        composition = phase.mass.values()
         props = phase.props.copy()
 
         # create the new fluid from the components and composition
@@ -252,7 +332,7 @@ class Fluid:
             phase = self.total.phases[phaseType]  # retrieve the current phase
             phases[phaseType] = phase  # store the current phase - this will be needed for the properties later
             components = components + [i for i in phase.components]
-            composition = composition + [phase.mass[i] for i in phase.components]
+            composition = composition + phase.mass.values()
 
         # create the new fluid from the components and composition
         newFluid = Fluid(components=components, composition=composition)
@@ -294,7 +374,7 @@ class Fluid:
                 comp_not_calculated = comp_not_calculated + phase.props["NotCalculated"]
 
         # calculate the total mass
-        total_mass = sum([self.total.mass[i] for i in self.total.mass])
+        total_mass = self.total.mass.total()
 
         # check if the total mass from the composition is consistent with the mass of the components in phases
         if (total_mass - mass) / total_mass > 1e-3:
@@ -392,8 +472,10 @@ class Fluid:
             Fluid: Fluid
         """
         # get all components and their composition that are above the mole cut-off
-        components = [comp for comp in self.total.components if self.total.moles[comp] > moleLimit]
-        composition = [self.total.mass[comp] for comp in components]
+        keep = self.total.moles.vector > moleLimit
+
+        components = [comp for comp, kept in zip(self.total.components, keep.tolist()) if kept]
+        composition = self.total.mass.vector[keep].tolist()
 
         if in_place:
             # make changes to the fluid itself
@@ -420,8 +502,11 @@ class Fluid:
             Fluid: Fluid
         """
         # get all components and their composition not in the specified phase
-        components = [comp for comp in self.total.components if comp.value.phase != phaseType]
-        composition = [self.total.mass[comp] for comp in components]
+        ids = np.array(self.total.ids, dtype=int)
+        keep = species_table.phase[ids] != species_table.phaseTypes.index(phaseType)
+
+        components = [comp for comp, kept in zip(self.total.components, keep.tolist()) if kept]
+        composition = self.total.mass.vector[keep].tolist()
 
         if in_place:
             # updates the fluid itself
@@ -455,19 +540,16 @@ class Fluid:
 
     def normaliseComposition(self):
 
-        components = [i for i in self.total.components]
-        mass_corr = 1 / sum([self.total.mass[i] for i in components])
+        mass_corr = 1 / self.total.mass.total()
 
-        self.total.mass = {i:self.total.mass[i]*mass_corr for i in components}
-        self.total.moles = {i:self.total.moles[i]*mass_corr for i in components}
+        self.total.scale(mass_corr)
 
         if self.total.props_calculated:
             self.total.props.m *= mass_corr
 
         for phaseType in self.total.phases:
             phase = self.total.phases[phaseType]
-            phase.mass = {i:phase.mass[i] * mass_corr for i in phase.components}
-            phase.moles = {i:phase.moles[i] * mass_corr for i in phase.components}
+            phase.scale(mass_corr)
 
             if self.total.props_calculated:
                 phase.props.m *= mass_corr
\ No newline at end of file
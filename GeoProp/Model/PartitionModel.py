@@ -62,7 +62,7 @@ class Partition:
         self.options = options
         self.partitionModel = options.model
 
-    def calc(self, fluid: Fluid, P: float, T: float) -> Fluid:
+    def calc(self, fluid: Fluid, P: float, T: float, out: Optional[Fluid] = None) -> Fluid:
         """
         executes the partition calculation witht he selected partition model
 
@@ -74,6 +74,8 @@ class Partition:
             the pressure in Pa
         T : Union[int, float]
             the temperature in K
+        out : Optional[Fluid]
+            a Fluid to be overwritten with the partitioned fluid, instead of creating a new one
 
         Returns
         -------
@@ -95,4 +97,4 @@ class Partition:
         else:
             options = self.options.UserEntered
 
-        return self.partitionModel.value.calc(fluid, P, T, options)
+        return self.partitionModel.value.calc(fluid, P, T, options, out=out)
@@ -1,6 +1,8 @@
 from enum import Enum
 from typing import List, Union, Dict, Tuple, NoReturn, Optional
 
+import numpy as np
+
 
 class PhaseType(Enum):
     """
@@ -107,6 +109,84 @@ class PhaseProperties:
 
         return PhaseProperties(newProps)
 
+# the amounts of a phase without components, shared as they are replaced rather than modified when components are added
+_empty = np.zeros(0)
+_empty.flags.writeable = False
+
+
+class SpeciesVector:
+    """
+        The SpeciesVector class stores an amount of each component of a phase, e.g. its mass or moles, in a compact
+        NumPy vector in the order of the components. It can be used like a dictionary keyed on the components of the
+        phase.
+
+        Attributes
+        ----------
+        components: List[Comp]
+            the components of the phase
+        index: Dict[int, int]
+            the position of each species id in the components
+        vector: np.ndarray
+            the amount of each component
+
+    """
+
+    __slots__ = ("components", "index", "vector")
+
+    def __init__(self, components: List, index: Dict[int, int]):
+        """
+            Initialises the SpeciesVector object. The component list and index are shared with the phase (rather than
+            referencing the phase itself), so that phases are freed as soon as they are no longer used
+
+            Parameters
+            ----------
+            components: List[Comp]
+                the components of the phase
+            index: Dict[int, int]
+                the position of each species id in the components
+
+        """
+        self.components = components
+        self.index = index
+        self.vector = _empty
+
+    def __getitem__(self, comp) -> float:
+        return float(self.vector[self.index[comp.value.id]])
+
+    def __setitem__(self, comp, value: float) -> NoReturn:
+        self.vector[self.index[comp.value.id]] = value
+
+    def __contains__(self, comp) -> bool:
+        species = getattr(comp, "value", None)
+
+        return hasattr(species, "id") and species.id in self.index
+
+    def __iter__(self):
+        return iter(self.components)
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    def keys(self) -> List:
+        return list(self.components)
+
+    def values(self) -> List[float]:
+        return self.vector.tolist()
+
+    def items(self) -> List[Tuple]:
+        return list(zip(self.components, self.values()))
+
+    def total(self) -> float:
+        """
+            Sums the amounts of all components of the phase
+
+            Returns
+            -------
+            float
+        """
+        return float(self.vector.sum())
+
+
 class Phase:
     """
         The Phase class summarises components, compositions and properties of a phase
@@ -117,11 +197,15 @@ class Phase:
             the type of the phase
         components: List[Comp]
             the components of the phase
+        ids: List[int]
+            the species ids of the components
+        index: Dict[int, int]
+            the position of each species id in the components
         elements: Set
             the elements of the phase
-        mass: Dict
+        mass: SpeciesVector
             the mass of each component in kg
-        moles: Dict
+        moles: SpeciesVector
             the moles of each component in mol
         massfrac: List
             the mass fraction of each component
@@ -143,10 +227,12 @@ class Phase:
         """
         self.phase = PhaseType.NONE
         self.components = []
+        self.ids = []
+        self.index = {}
         self.elements = {}
 
-        self.mass = {}
-        self.moles = {}
+        self.mass = SpeciesVector(self.components, self.index)
+        self.moles = SpeciesVector(self.components, self.index)
 
         self.massfrac = []
         self.molefrac = []
@@ -200,21 +286,68 @@ class Phase:
             NoReturn
         """
 
-        # checks if component already exists in the phase
-        if comp in self.components:
-            # add the mass and moles to
-            self.mass[comp] += mass
-            self.moles[comp] += moles
-        else:
-            self.components.append(comp)
-            self.mass[comp] = mass
-            self.moles[comp] = moles
+        self.add_components([comp], [comp.value.id], [mass], [moles], update=update)
+
+    def add_components(self, comps: List, ids: List[int], mass: np.ndarray, moles: np.ndarray, update: Optional[bool] =True) -> NoReturn:
+        """
+            Adds several components to the phase at once
+
+            Parameters
+            ----------
+            comps: List[Comp]
+                The components to be added to the phase
+            ids: List[int]
+                The species ids of the components
+            mass: np.ndarray
+                The masses of the components to be added
+            moles: np.ndarray
+                The moles of the components to be added
+            update: Optional[bool]
+                Flag to determine whether the mass and mole fractions should be recalculated
 
-            # update the list of elements
-            if len(self.elements) > 0:
-                self.elements.update(comp.value.elements)
+            Returns
+            -------
+            NoReturn
+        """
+
+        # the position of each component, new components are appended in the order in which they are first given
+        positions = []
+        n_old = len(self.ids)
+        for comp, i in zip(comps, ids):
+            position = self.index.get(i)
+
+            if position is None:
+                position = len(self.ids)
+
+                self.components.append(comp)
+                self.ids.append(i)
+                self.index[i] = position
+
+                # update the list of elements
+                if len(self.elements) > 0:
+                    self.elements.update(comp.value.elements)
+                else:
+                    self.elements = set(comp.value.elements)
+
+            positions.append(position)
+
+        n_new = len(self.ids) - n_old
+        if n_new == len(positions):
+            # only new components, appended in the order given
+            if n_old == 0:
+                self.mass.vector = np.array(mass, dtype=float)
+                self.moles.vector = np.array(moles, dtype=float)
             else:
-                self.elements = {i for i in comp.value.elements}
+                self.mass.vector = np.concatenate((self.mass.vector, mass))
+                self.moles.vector = np.concatenate((self.moles.vector, moles))
+        else:
+            if n_new > 0:
+                self.mass.vector = np.concatenate((self.mass.vector, np.zeros(n_new)))
+                self.moles.vector = np.concatenate((self.moles.vector, np.zeros(n_new)))
+
+            # the same component may be given several times
+            np.add.at(self.mass.vector, positions, mass)
+            np.add.at(self.moles.vector, positions, moles)
 
         # resets the flag for the mass and mole fractions being up to date
         self.up_to_date = False
@@ -223,6 +356,48 @@ class Phase:
         if update:
             self.update()
 
+    def clear(self) -> NoReturn:
+        """
+            Removes all components from the phase, reusing the existing containers
+
+            Returns
+            -------
+            NoReturn
+        """
+
+        self.components.clear()
+        self.ids.clear()
+        self.index.clear()
+        self.elements = {}
+
+        self.mass.vector = _empty
+        self.moles.vector = _empty
+
+        self.massfrac = []
+        self.molefrac = []
+        self.up_to_date = True
+
+        self.props = PhaseProperties({"P": 0.0, "T": 0.0, "h": 0.0, "s": 0.0, "rho": 0.0, "m": 0.0})
+        self.props_calculated = False
+
+    def scale(self, factor: float) -> NoReturn:
+        """
+            Scales the mass and moles of all components in the phase, the mass and mole fractions are unchanged
+
+            Parameters
+            ----------
+            factor: float
+                the scaling factor
+
+            Returns
+            -------
+            NoReturn
+        """
+
+        if self.ids:
+            self.mass.vector *= factor
+            self.moles.vector *= factor
+
     def update(self) -> NoReturn:
         """
             Recalculates the mass and mole fractions of all components in the phase
@@ -236,13 +411,15 @@ class Phase:
         if self.up_to_date:
             return
 
-        # calculates the total mass and number of moles
-        total_mass = sum(self.mass.values())
-        total_moles = sum(self.moles.values())
-
         # calculates the mass and mole fractions of each species
-        self.massfrac = [self.mass[self.components[i]] / (total_mass + 1e-15) for i in range(len(self.components))]
-        self.molefrac = [self.moles[self.components[i]] / (total_moles +1e-15) for i in range(len(self.components))]
+        mass = self.mass.vector.tolist()
+        moles = self.moles.vector.tolist()
+
+        total_mass = sum(mass) + 1e-15
+        total_moles = sum(moles) + 1e-15
+
+        self.massfrac = [i / total_mass for i in mass]
+        self.molefrac = [i / total_moles for i in moles]
 
         # resets the phase properties
         self.props_calculated = False
@@ -1,9 +1,10 @@
 from .Phases import PhaseType
-from .Databases import LookUp
+from .Databases import LookUp, species_table
 from .ErrorHandling import Error
 from .Fluid import Fluid
 
 import reaktoro as rkt
+from collections import OrderedDict
 from enum import Enum
 from typing import List, Union, Dict, Tuple, NoReturn, Optional
 import time
@@ -130,7 +131,7 @@ def initFromSpecies(fluid: Fluid, options) -> Tuple[rkt.GaseousPhase, rkt.Aqueou
             charge += i.value.charge * fluid.total.moles[i]
         aqueous_str = aqueous_str[:-1]
 
-        charge *= 1/sum([fluid.aqueous.moles[i] for i in fluid.aqueous.moles])
+        charge *= 1/fluid.aqueous.moles.total()
 
         # raise error if the specific charge difference exceeds a threshold
         if abs(charge) > 1e-3:
@@ -197,6 +198,8 @@ class ReaktoroPartitionOptions:
             flag to decide whether to output a debug of the reaktoro partitioning
         debugFileName: str
             the file location of where the reaktoro debug file will be written
+        reuseSystem: bool
+            flag to decide whether the chemical system and equilibrium solver are cached and warm started between calls
 
         Raises
         ------
@@ -275,6 +278,210 @@ class ReaktoroPartitionOptions:
         self.debug = False  # create file of reaktoro results
         self.debugFileName = "ReaktoroResults.txt"
 
+        self.reuseSystem = True  # cache the chemical system and warm start the equilibrium solver
+
+
+class ReaktoroSystem:
+    """
+        The ReaktoroSystem class holds a chemical system together with its equilibrium solver and the last equilibrium
+        state, which is used as the initial guess of the next equilibration
+
+        Attributes
+        ----------
+        system: rkt.ChemicalSystem
+            the chemical system
+        solver: rkt.EquilibriumSolver
+            the equilibrium solver of the chemical system
+        elements: str
+            string array of all elements used
+        composition: tuple | None
+            the species masses of the fluid the last equilibrium state was calculated for
+        state: rkt.ChemicalState | None
+            the last equilibrium state
+    """
+
+    def __init__(self, system: rkt.ChemicalSystem, elements: str):
+        """
+            initialises the ReaktoroSystem
+
+            Parameters
+            ----------
+            system: rkt.ChemicalSystem
+                the chemical system
+            elements: str
+                string array of all elements used
+        """
+
+        self.system = system
+        self.solver = rkt.EquilibriumSolver(system)
+        self.elements = elements
+
+        self.composition = None
+        self.state = None
+
+
+class ReaktoroSystemCache:
+    """
+        The ReaktoroSystemCache class is a process-wide registry of chemical systems, so that the Reaktoro database,
+        the phases and the chemical system are only constructed once for each set of species and options
+
+        Attributes
+        ----------
+        maxsize: int
+            the maximum number of chemical systems kept in the registry
+        systems: OrderedDict[tuple, ReaktoroSystem]
+            the cached chemical systems
+        databases: Dict[str, rkt.SupcrtDatabase]
+            the loaded Reaktoro databases
+        hits: int
+            the number of chemical systems retrieved from the registry
+        misses: int
+            the number of chemical systems that had to be constructed
+    """
+
+    def __init__(self, maxsize: Optional[int] = 32):
+        """
+            initialises the ReaktoroSystemCache
+
+            Parameters
+            ----------
+            maxsize: Optional[int]
+                the maximum number of chemical systems kept in the registry
+        """
+
+        self.maxsize = maxsize
+        self.systems = OrderedDict()
+        self.databases = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(fluid: Fluid, options: ReaktoroPartitionOptions) -> tuple:
+        """
+            creates the registry key from the species of each phase and the partitioning options
+
+            Parameters
+            ----------
+            fluid: Fluid
+                the fluid to be partitioned
+            options: ReaktoroPartitionOptions
+                the partitioning options
+
+            Returns
+            -------
+            tuple
+        """
+
+        if options.speciesMode == ReaktoroPartitionOptions.SpeciesMode.ALL:
+            species = tuple(fluid.total.elements)
+        else:
+            species = (tuple(i.name for i in fluid.aqueous.components),
+                       tuple(i.name for i in fluid.gaseous.components),
+                       tuple(i.name for i in fluid.mineral.components))
+
+        return (options.database.name,
+                options.speciesMode.name,
+                options.aqueousActivityModel.name,
+                options.aqueousCO2ActivityModel.name,
+                options.gaseousActivityModel.name,
+                options.mineralActivityModel.name,
+                species)
+
+    def get(self, fluid: Fluid, options: ReaktoroPartitionOptions) -> ReaktoroSystem:
+        """
+            retrieves the chemical system for a fluid, constructing it on first use
+
+            Parameters
+            ----------
+            fluid: Fluid
+                the fluid to be partitioned
+            options: ReaktoroPartitionOptions
+                the partitioning options
+
+            Returns
+            -------
+            ReaktoroSystem
+        """
+
+        key = self.key(fluid, options)
+
+        if key in self.systems:
+            self.hits += 1
+            self.systems.move_to_end(key)
+
+            return self.systems[key]
+
+        self.misses += 1
+
+        system, elements = self.create(fluid, options)
+        self.systems[key] = ReaktoroSystem(system, elements)
+
+        if len(self.systems) > self.maxsize:
+            self.systems.popitem(last=False)
+
+        return self.systems[key]
+
+    def create(self, fluid: Fluid, options: ReaktoroPartitionOptions) -> Tuple[rkt.ChemicalSystem, str]:
+        """
+            constructs the chemical system for a fluid
+
+            Parameters
+            ----------
+            fluid: Fluid
+                the fluid to be partitioned
+            options: ReaktoroPartitionOptions
+                the partitioning options
+
+            Returns
+            -------
+            system: rkt.ChemicalSystem
+                the chemical system
+            elements: str
+                string array of all elements used
+        """
+
+        # initialise the reaktoro database to be used
+        if options.database.value not in self.databases:
+            self.databases[options.database.value] = rkt.SupcrtDatabase(options.database.value)
+        db = self.databases[options.database.value]
+
+        # generates the aqueous, gaseous and mineral phases
+        aqueous, gaseous, mineral, elements = options.speciesMode(fluid, options)
+
+        # creates the chemical system
+        try:
+            system = rkt.ChemicalSystem(db, aqueous, gaseous, mineral)
+        except:
+            # TODO - this is a bit of a hack and obviously only works if there is only mineral phase missing
+            system = rkt.ChemicalSystem(db, aqueous, gaseous)
+
+        return system, elements
+
+    def clear(self) -> NoReturn:
+        """
+            removes all chemical systems from the registry and resets the counters
+        """
+
+        self.systems.clear()
+
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+            returns the registry statistics
+
+            Returns
+            -------
+            Dict[str, int]
+        """
+
+        return {"size": len(self.systems), "hits": self.hits, "misses": self.misses}
+
+
+reaktoro_systems = ReaktoroSystemCache()
+
 
 class ReaktoroPartition:
     """
@@ -284,7 +491,7 @@ class ReaktoroPartition:
     """
 
     @staticmethod
-    def calc(fluid: Fluid, P: float, T: float, options: ReaktoroPartitionOptions) -> Fluid:
+    def calc(fluid: Fluid, P: float, T: float, options: ReaktoroPartitionOptions, out: Optional[Fluid] = None) -> Fluid:
         """
             calculates the fluid partition using Reaktoro
 
@@ -298,6 +505,8 @@ class ReaktoroPartition:
                 the temperature in K
             options: ReaktoroPartitionOptions
                 the options to be used for the partition calculations
+            out: Optional[Fluid]
+                a Fluid to be overwritten with the partitioned fluid, instead of creating a new one
 
             Returns
             -------
@@ -309,43 +518,61 @@ class ReaktoroPartition:
                 if the equilibration is not successful (provided this check has not been disabled)
         """
 
-        # initialise the reaktoro database to be used
-        db = rkt.SupcrtDatabase(options.database.value)
+        if options.reuseSystem:
+            cached = reaktoro_systems.get(fluid, options)
+            system = cached.system
+            elements = cached.elements
+        else:
+            cached = None
+            system, elements = reaktoro_systems.create(fluid, options)
 
-        # generates the aqueous, gaseous and mineral phases
-        aqueous, gaseous, mineral, elements = options.speciesMode(fluid, options)
+        composition = tuple(fluid.total.mass[comp] for comp in fluid.total.components)
 
-        # creates the chemical system
-        try:
-            system = rkt.ChemicalSystem(db, aqueous, gaseous, mineral)
-        except:
-            # TODO - this is a bit of a hack and obviously only works if there is only mineral phase missing
-            system = rkt.ChemicalSystem(db, aqueous, gaseous)
+        # warm start from the last equilibrium state of the same fluid (the element amounts are unchanged)
+        state = None
+        if cached is not None and cached.state is not None and cached.composition == composition:
+            state = cached.state
+            state.setTemperature(T, "K")
+            state.setPressure(P, "Pa")
 
-        # initialise a material class
-        mix = rkt.Material(system)
+            res = cached.solver.solve(state)
 
-        # set the composition of each species
-        for i in range(len(fluid.total.components)):
-            comp = fluid.total.components[i]
-            mix.add(comp.value.alias["RKT"], fluid.total.mass[comp], "kg")
+            if not res.optima.succeeded:
+                state = None
 
-        # add a little bit of some commonly troublesome species (not very clean but it works)
-        if options.speciesMode == ReaktoroPartitionOptions.SpeciesMode.ALL:
-            # this is a total fudge....
-            if "O" in elements:
-                mix.add("O2(aq)", 1e-15, "kg")
-            if "H" in elements:
-                mix.add("H2(aq)", 1e-15, "kg")
+        if state is None:
+            # initialise a material class
+            mix = rkt.Material(system)
+
+            # set the composition of each species
+            for comp in fluid.total.components:
+                mix.add(species_table.names[comp.id], fluid.total.mass[comp], "kg")
 
-        # equilibrate the fluid
-        state = mix.equilibrate(T, "K", P, "Pa")
-        res = mix.result()
+            # add a little bit of some commonly troublesome species (not very clean but it works)
+            if options.speciesMode == ReaktoroPartitionOptions.SpeciesMode.ALL:
+                # this is a total fudge....
+                if "O" in elements:
+                    mix.add("O2(aq)", 1e-15, "kg")
+                if "H" in elements:
+                    mix.add("H2(aq)", 1e-15, "kg")
+
+            # equilibrate the fluid
+            state = mix.equilibrate(T, "K", P, "Pa")
+            res = mix.result()
 
         # check if the equilibration converged
         if options.strictSucess:
             assert res.optima.succeeded
 
+        # keep the equilibrium state as the initial guess for the next call
+        if cached is not None:
+            if res.optima.succeeded:
+                cached.state = state
+                cached.composition = composition
+            else:
+                cached.state = None
+                cached.composition = None
+
         # print a debug file for the equilibration
         if options.debug:
             state.output(options.debugFileName)
@@ -373,12 +600,14 @@ class ReaktoroPartition:
             # species[key] = [LookUp().withReaktoroName(i.name()) for i in phase.species().data()]
             # masses[key] = [state.speciesMass(i.name())[0] for i in phase.species().data()]
 
+            names = [i.name() for i in phase.species().data()]
+
             if key not in species:
-                species[key] = [LookUp().withReaktoroName(i.name()) for i in phase.species().data()]
-                masses[key] = [state.speciesMass(i.name())[0] for i in phase.species().data()]
+                species[key] = species_table.withReaktoroNames(names)
+                masses[key] = [state.speciesMass(name)[0] for name in names]
             else:
-                species[key] += [LookUp().withReaktoroName(i.name()) for i in phase.species().data()]
-                masses[key] += [state.speciesMass(i.name())[0] for i in phase.species().data()]
+                species[key] += species_table.withReaktoroNames(names)
+                masses[key] += [state.speciesMass(name)[0] for name in names]
 
         # populate the components and composition array for fluid creation
         components = []
@@ -388,5 +617,10 @@ class ReaktoroPartition:
                 components.append(species[i][j])
                 composition.append(masses[i][j])
 
+        # overwrite the output fluid
+        if out is not None:
+            out.setComponents(components, composition)
+            return out
+
         # create a new fluid
         return Fluid(components=components, composition=composition)
\ No newline at end of file
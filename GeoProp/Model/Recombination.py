@@ -35,8 +35,8 @@ class Recombination:
         fluid1.normaliseComposition()
         fluid2.normaliseComposition()
 
-        total_moles1 = sum([fluid1.total.moles[i] for i in fluid1.total.components])
-        total_moles2 = sum([fluid2.total.moles[i] for i in fluid2.total.components])
+        total_moles1 = fluid1.total.moles.total()
+        total_moles2 = fluid2.total.moles.total()
 
         MassRatio = MoleRatio / (total_moles2 / total_moles1)
 
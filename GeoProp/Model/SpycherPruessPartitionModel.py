@@ -5,9 +5,116 @@ from .ErrorHandling import CalculationError
 
 import CoolProp as cp
 import math
+import numpy as np
 from operator import itemgetter
 
 
+class WaterSaturationPressure:
+    """
+        The WaterSaturationPressure class is a cached cubic Hermite spline of the saturation pressure of water, used
+        instead of evaluating a CoolProp AbstractState for every call. Temperatures outside the spline range are
+        evaluated with CoolProp.
+
+        Attributes
+        ----------
+        Tmin: float
+            the minimum temperature of the spline
+        Tmax: float
+            the maximum temperature of the spline
+        dT: float
+            the temperature step between the spline nodes
+        Ts: np.ndarray | None
+            the temperatures of the spline nodes
+        lnPs: np.ndarray | None
+            the natural logarithm of the saturation pressure at the spline nodes
+        dlnPs: np.ndarray | None
+            the temperature derivative of lnPs at the spline nodes
+    """
+
+    Tmin = 273.16  # degK
+    Tmax = 640.0  # degK
+    dT = 1.0
+
+    def __init__(self):
+        """
+            initialises the WaterSaturationPressure spline, the spline nodes are only calculated on first use
+        """
+
+        self.Ts = None
+        self.lnPs = None
+        self.dlnPs = None
+
+    def build(self):
+        """
+            calculates the spline nodes using CoolProp
+        """
+
+        n = int((self.Tmax - self.Tmin) / self.dT) + 1
+        Ts = self.Tmin + self.dT * np.arange(n)
+
+        lnPs = np.empty(n)
+        dlnPs = np.empty(n)
+
+        water = cp.AbstractState("?", "Water")
+        for i, T in enumerate(Ts):
+            water.update(cp.QT_INPUTS, 0.0, T)
+            lnPs[i] = math.log(water.p())
+            dlnPs[i] = water.first_saturation_deriv(cp.iP, cp.iT) / water.p()
+
+        self.Ts = Ts
+        self.lnPs = lnPs
+        self.dlnPs = dlnPs
+
+    def __call__(self, T):
+        """
+            calculates the saturation pressure of water
+
+            Parameters
+            ----------
+            T: float | np.ndarray
+                the temperature
+
+            Returns
+            -------
+            float | np.ndarray
+        """
+
+        if self.Ts is None:
+            self.build()
+
+        Ts = np.asarray(T, dtype=float)
+
+        # locate the spline interval and evaluate the cubic Hermite basis functions
+        i = np.clip(((Ts - self.Tmin) // self.dT).astype(int), 0, len(self.Ts) - 2)
+        t = (Ts - self.Ts[i]) / self.dT
+
+        h00 = (1 + 2 * t) * (1 - t) * (1 - t)
+        h10 = t * (1 - t) * (1 - t)
+        h01 = t * t * (3 - 2 * t)
+        h11 = t * t * (t - 1)
+
+        lnP = h00 * self.lnPs[i] + h10 * self.dT * self.dlnPs[i] + h01 * self.lnPs[i + 1] + h11 * self.dT * self.dlnPs[i + 1]
+        Psat = np.exp(lnP)
+
+        # fall back to CoolProp outside of the spline range
+        outside = (Ts < self.Ts[0]) | (Ts > self.Ts[-1])
+        if np.any(outside):
+            water = cp.AbstractState("?", "Water")
+            Psat = np.array(Psat, dtype=float).ravel()
+            for j, T_ in zip(np.flatnonzero(outside), Ts[outside]):
+                water.update(cp.QT_INPUTS, 0.5, T_)
+                Psat[j] = water.p()
+            Psat = Psat.reshape(Ts.shape)
+
+        if Psat.ndim == 0:
+            return float(Psat)
+
+        return Psat
+
+
+water_Psat = WaterSaturationPressure()
+
+
 class SpycherPruss2009:
     """
         The SpycherPruss2009 class contains the Spycher Pruss 2009 model for the mutual solubilities of H2O and CO2
@@ -601,9 +708,7 @@ class SpycherPruss2009:
             return self.interpolate(self.Pref_H2O, self.Tmax_low, self.Tmin_high, T)
 
         else:
-            water = cp.AbstractState("?", "Water")
-            water.update(cp.QT_INPUTS, 0.5, T)
-            return water.p() * 1e-5
+            return water_Psat(T) * 1e-5
 
     def K_CO2(self, T, P):
         """
@@ -837,6 +942,300 @@ class SpycherPruss2009:
 
         return yH2O, xCO2, xSalt
 
+    @staticmethod
+    def K_CO2_H2O_high(T):
+        """
+            calculates the BICs for a CO2 - H2O interaction with the high temperature model
+
+            Parameters
+            ----------
+            T: float | np.ndarray
+                the temperature
+
+            Returns
+            -------
+            float | np.ndarray
+        """
+
+        return 0.4228 - 7.422e-4 * T
+
+    @staticmethod
+    def K_H2O_CO2_high(T):
+        """
+            calculates the BICs for a H2O - CO2 interaction with the high temperature model
+
+            Parameters
+            ----------
+            T: float | np.ndarray
+                the temperature
+
+            Returns
+            -------
+            float | np.ndarray
+        """
+
+        return 1.427e-2 - 4.037e-4 * T
+
+    def blend(self, T, low, high, Tcutoff=None):
+        """
+            evaluates a temperature dependent parameter for arrays of temperatures, i.e. the low temperature model,
+            the high temperature model or the linear interpolation between both (see SpycherPruss2009.interpolate)
+
+            Parameters
+            ----------
+            T: np.ndarray
+                the temperatures
+            low:
+                the low temperature model, a function of temperature
+            high:
+                the high temperature model, a function of temperature
+            Tcutoff: float
+                the maximum temperature of the low temperature model, defaults to Tmax_low
+
+            Returns
+            -------
+            np.ndarray
+        """
+
+        if Tcutoff is None:
+            Tcutoff = self.Tmax_low
+
+        ratio = (self.Tmin_high - T) / (self.Tmin_high - self.Tmax_low)
+        transition = low(self.Tmax_low) * ratio + (1 - ratio) * high(self.Tmin_high)
+
+        return np.where(T <= Tcutoff, low(T), np.where(T < self.Tmin_high, transition, high(T)))
+
+    def batch_parameters(self, T):
+        """
+            calculates all temperature dependent model parameters for arrays of temperatures
+
+            Parameters
+            ----------
+            T: np.ndarray
+                the temperatures
+
+            Returns
+            -------
+            dict
+        """
+
+        Tcutoff = 100 + 273.15
+
+        def log_K0_H2O_low(t):
+            Tc = t - 273.15
+            return -2.209 + 3.097e-2 * Tc - 1.098e-4 * Tc * Tc + 2.048e-7 * Tc * Tc * Tc
+
+        def log_K0_H2O_high(t):
+            Tc = t - 273.15
+            return -2.1077 + 2.8127e-2 * Tc - 8.4298e-5 * Tc * Tc + 1.4969e-7 * Tc * Tc * Tc - 1.1812e-10 * Tc * Tc * Tc * Tc
+
+        def log_K0_CO2_low(t):
+            Tc = t - 273.15
+            return 1.189 + 1.304e-2 * Tc - 5.446e-5 * Tc * Tc
+
+        def log_K0_CO2_high(t):
+            Tc = t - 273.15
+            return 1.668 + 3.992e-3 * Tc - 1.156e-5 * Tc * Tc + 1.593e-9 * Tc * Tc * Tc
+
+        def Pref_CO2_high(t):
+            Tc = t - 273.15
+            return -1.9906e-1 + 2.0471e-3 * Tc + 1.0152e-4 * Tc * Tc - 1.4234e-6 * Tc * Tc * Tc + 1.4168e-8 * Tc * Tc * Tc * Tc
+
+        params = {
+            "aCO2": self.blend(T, lambda t: 7.54e7 - 4.13e4 * t, lambda t: 8.008e7 - 4.984e4 * t),
+            "aH2O": self.blend(T, lambda t: 0.0, lambda t: 1.337e8 - 1.4e4 * t),
+            "KCO2_H2O": self.blend(T, lambda t: 0.0, self.K_CO2_H2O_high),
+            "KH2O_CO2": self.blend(T, lambda t: 0.0, self.K_H2O_CO2_high),
+            "bCO2": self.blend(T, lambda t: 27.8, lambda t: 28.25),
+            "bH2O": self.blend(T, lambda t: 18.18, lambda t: 15.70),
+            "K0_H2O": np.power(10, self.blend(T, log_K0_H2O_low, log_K0_H2O_high)),
+            "K0_CO2": np.power(10, self.blend(T, log_K0_CO2_low, log_K0_CO2_high)),
+            "V_CO2": self.blend(T, lambda t: 32.6, lambda t: 32.6 + 3.413e-2 * (t - 373.15)),
+            "V_H2O": self.blend(T, lambda t: 18.1, lambda t: 18.1 + 3.137e-2 * (t - 373.15)),
+            "Pref_CO2": self.blend(T, lambda t: 1.0, Pref_CO2_high, Tcutoff),
+            "Pref_H2O": self.blend(T, lambda t: 1.0, lambda t: water_Psat(t) * 1e-5, Tcutoff),
+            "A_m": self.blend(T, lambda t: 0.0, lambda t: -3.084e-2 * (t - 373.15) + 1.927e-5 * (t - 373.15) * (t - 373.15)),
+            "lambda": self.lambda_(T),
+            "xi": self.xi_(T),
+        }
+
+        return params
+
+    def fugacity_coefficients_batch(self, T, P, yCO2, yH2O, params):
+        """
+        calculates the fugacity coefficients of CO2 and H2O for arrays of states
+
+        Parameters
+        ----------
+        T: np.ndarray
+            the temperatures
+        P: np.ndarray
+            the pressures
+        yCO2: np.ndarray
+            the gas phase mole fractions of CO2
+        yH2O: np.ndarray
+            the gas phase mole fractions of H2O
+        params: dict
+            the temperature dependent model parameters, see SpycherPruss2009.batch_parameters
+
+        Returns
+        -------
+        np.ndarray, np.ndarray
+
+        """
+
+        Pbar = P * 1e-5
+
+        aCO2 = params["aCO2"]
+        aH2O = params["aH2O"]
+        KCO2_H2O = params["KCO2_H2O"]
+        KH2O_CO2 = params["KH2O_CO2"]
+
+        # the CO2 - H2O interaction parameters (see SpycherPruss2009.a_CO2_H2O)
+        sqrt_a = np.sqrt(aCO2 * aH2O)
+
+        def aCO2_H2O_high(t):
+            return sqrt_a * (1 - (self.K_CO2_H2O_high(t) * yCO2 + self.K_H2O_CO2_high(t) * yH2O))
+
+        def aH2O_CO2_high(t):
+            return sqrt_a * (1 - (self.K_H2O_CO2_high(t) * yH2O + self.K_CO2_H2O_high(t) * yCO2))
+
+        aCO2_H2O = self.blend(T, lambda t: 7.89e7, aCO2_H2O_high)
+        aH2O_CO2 = self.blend(T, lambda t: 7.89e7, aH2O_CO2_high)
+
+        amix = self.a_mix(aCO2, aH2O, aCO2_H2O, aH2O_CO2, yCO2, yH2O)
+        bCO2 = params["bCO2"]
+        bH2O = params["bH2O"]
+        bmix = self.b_mix(bCO2, bH2O, yCO2, yH2O)
+
+        T05 = np.sqrt(T)
+        T15 = T05 * T
+
+        a2 = -self.R * T / Pbar
+        a1 = -(self.R * T * bmix / Pbar - amix / (Pbar * T05) + bmix * bmix)
+        a0 = -amix * bmix / (Pbar * T05)
+
+        # the largest root of the cubic equation (see RootFinder.CubicSolver)
+        p = (3 * a1 - a2 * a2) / 3
+        q = (2 * a2 * a2 * a2 - 9 * a2 * a1 + 27 * a0) / 27
+        R = q * q / 4 + p * p * p / 27
+
+        with np.errstate(invalid="ignore"):
+            m = 2 * np.sqrt(-p / 3)
+            theta = np.arccos(np.clip(3 * q / (p * m), -1, 1)) / 3
+            V_trig = m * np.cos(theta) - a2 / 3
+            V_card = np.cbrt(-q / 2 + np.sqrt(R)) + np.cbrt(-q / 2 - np.sqrt(R)) - a2 / 3
+
+        V = np.where(R <= 0, V_trig, V_card)
+
+        aux1 = (Pbar * V / (self.R * T) - 1) / bmix
+        aux2 = -np.log(Pbar * (V - bmix) / (self.R * T))
+        aux3 = -(yH2O * yH2O * yCO2 * (KH2O_CO2 - KCO2_H2O) + yCO2 * yCO2 * yH2O * (KCO2_H2O - KH2O_CO2)) * sqrt_a
+        aux4 = (amix / (bmix * self.R * T15)) * np.log(V / (V + bmix))
+
+        c1 = (yH2O * (aH2O_CO2 + aCO2_H2O) + 2 * yCO2 * aCO2)
+        c2 = yCO2 * yH2O * (KCO2_H2O - KH2O_CO2) * sqrt_a
+        c3 = ((c1 + aux3 + c2) / amix - bCO2 / bmix)
+
+        ln_phi_CO2 = bCO2 * aux1 + aux2 + c3 * aux4
+
+        h1 = (yCO2 * (aCO2_H2O + aH2O_CO2) + 2 * yH2O * aH2O)
+        h2 = yH2O * yCO2 * (KH2O_CO2 - KCO2_H2O) * sqrt_a
+        h3 = ((h1 + aux3 + h2) / amix - bH2O / bmix)
+
+        ln_phi_H2O = bH2O * aux1 + aux2 + h3 * aux4
+
+        return np.exp(ln_phi_CO2), np.exp(ln_phi_H2O)
+
+    def calc_batch(self, T, P, ion_molalities):
+        """
+        calculates the mutual solubilities of CO2 and H2O for arrays of states. The temperatures, pressures and
+        molalities are broadcast against each other, states outside the model bounds are returned as NaN.
+
+        Parameters
+        ----------
+        T: np.ndarray
+            the temperatures
+        P: np.ndarray
+            the pressures
+        ion_molalities: dict
+            the molalities of ionic species, either floats or arrays
+
+        Returns
+        -------
+        np.ndarray, np.ndarray, np.ndarray
+
+        """
+
+        mNa, mK, mCa, mMg, mCl, mSO4 = itemgetter("Na", "K", "Ca", "Mg", "Cl", "SO4")(ion_molalities)
+
+        T, P, mNa, mK, mCa, mMg, mCl, mSO4 = np.broadcast_arrays(*[np.asarray(i, dtype=float) for i in (T, P, mNa, mK, mCa, mMg, mCl, mSO4)])
+
+        valid = (T >= self.Tmin_low) & (T <= self.Tmax_high) & (P >= self.Pmin) & (P <= self.Pmax)
+
+        # evaluate the valid states only, as a flat array
+        T = T[valid]
+        P = P[valid]
+        mNa, mK, mCa, mMg, mCl, mSO4 = (i[valid] for i in (mNa, mK, mCa, mMg, mCl, mSO4))
+
+        Pbar = P * 1e-5
+        params = self.batch_parameters(T)
+
+        KCO2 = params["K0_CO2"] * np.exp((Pbar - params["Pref_CO2"]) * params["V_CO2"] / (self.R * T))
+        KH2O = params["K0_H2O"] * np.exp((Pbar - params["Pref_H2O"]) * params["V_H2O"] / (self.R * T))
+
+        lamb = params["lambda"]
+        xi = params["xi"]
+
+        aux1 = 1 + (mNa + mK + mCa + mMg + mCl + mSO4) / 55.508
+        aux2 = 2 * lamb * (mNa + mK + 2 * mCa + 2 * mMg)
+        aux3 = xi * mCl * (mNa + mK + mCa + mMg)
+        gammaCO2corr = aux1 * np.exp(aux2 + aux3 - 0.07 * mSO4)
+
+        mSalt = mNa + mK + mCa + mMg + mCl + mSO4
+
+        # the high temperature model is iterated, the low temperature model is solved in a single iteration
+        high = T > self.Tmin_high
+        yH2O = np.where(high, params["Pref_H2O"] / Pbar, 0.0)
+        xCO2 = np.where(high, 0.009, 0.0)
+        xSalt = np.zeros_like(T)
+
+        max_iter = 10 if np.any(high) else 1
+
+        xH2O = 1 - xCO2 - xSalt
+        for i in range(max_iter):
+            update = high | (i == 0)
+
+            mCO2 = xCO2 * 55.508 / xH2O
+            xSalt = np.where(update, mSalt / (55.508 + mSalt + mCO2), xSalt)
+
+            yCO2 = 1 - yH2O
+            xH2O = np.where(update, 1 - xCO2 - xSalt, xH2O)
+
+            phiCO2, phiH2O = self.fugacity_coefficients_batch(T, P, yCO2, yH2O, params)
+
+            Am = params["A_m"]
+            gammaCO2 = np.exp(2 * Am * xCO2 * xH2O * xH2O)
+            gammaH2O = np.exp((Am - 2 * Am * xH2O) * xCO2 * xCO2)
+
+            A = KH2O * gammaH2O / (phiH2O * Pbar)
+            B = phiCO2 * Pbar / (55.508 * gammaCO2 * gammaCO2corr * KCO2)
+
+            yH2O_new = (1 - B) * 55.508 / ((1 / A - B) * (mSalt + 55.508) + mSalt * B)
+            xCO2_new = B * (1 - yH2O_new)
+
+            yH2O = np.where(update, yH2O_new, yH2O)
+            xCO2 = np.where(update, xCO2_new, xCO2)
+
+        # scatter the results back to the shape of the inputs
+        results = []
+        for values in (yH2O, xCO2, xSalt):
+            result = np.full(valid.shape, np.nan)
+            result[valid] = values
+            results.append(result)
+
+        return tuple(results)
+
 
 class SpycherPrussPartition:
     """
@@ -851,7 +1250,7 @@ class SpycherPrussPartition:
     Tmax = SpycherPruss2009.Tmax_high
 
     @staticmethod
-    def calc(fluid, P, T, options):
+    def calc(fluid, P, T, options, out=None):
         """
         orchestrates the partition calculation using SpycherPruss 2009
 
@@ -865,6 +1264,8 @@ class SpycherPrussPartition:
             the temperature
         options: None
             the calculation options - dummy input, not used
+        out: Fluid
+            a Fluid to be overwritten with the partitioned fluid, instead of creating a new one
 
         Returns
         -------
@@ -881,7 +1282,7 @@ class SpycherPrussPartition:
         molality = {"Na": 0.0, "K": 0.0, "Ca": 0.0, "Mg": 0.0, "Cl": 0.0, "SO4": 0.0}
 
         for comp in targetComps:
-            if comp in fluid.total.components:
+            if comp in fluid.total.mass:
                 if comp in [Comp.WATER, Comp.STEAM]:
                     moles["H2O"] += fluid.total.moles[comp]
                 elif comp == Comp.Na_plus:
@@ -905,9 +1306,7 @@ class SpycherPrussPartition:
         zH2O = moles["H2O"] / sum([moles[i] for i in moles])
         zCO2 = moles["CO2"] / sum([moles[i] for i in moles])
 
-        water = cp.AbstractState("?", "Water")
-        water.update(cp.QT_INPUTS, 0.5, T)
-        Psat = water.p()
+        Psat = water_Psat(T)
 
         if P > Psat:
             yH2O, xCO2, xsalts = SpycherPruss2009().calc(T, P, molality)
@@ -923,22 +1322,22 @@ class SpycherPrussPartition:
             alpha = 1.1  # all the water has boiled off
 
         components = [Comp.Na_plus, Comp.K_plus, Comp.Ca_plus2, Comp.Mg_plus2, Comp.Cl_minus, Comp.SO4_minus2]
-        composition = [fluid.total.mass[i] if i in fluid.total.components else 0.0 for i in components]
+        composition = [fluid.total.mass[i] if i in fluid.total.mass else 0.0 for i in components]
 
         mass_H2O = 0.0
-        if Comp.WATER in fluid.total.components:
+        if Comp.WATER in fluid.total.mass:
             mass_H2O += fluid.total.mass[Comp.WATER]
 
-        if Comp.STEAM in fluid.total.components:
+        if Comp.STEAM in fluid.total.mass:
             mass_H2O += fluid.total.mass[Comp.STEAM]
 
         mass_CO2 = 0.0
-        if Comp.CO2_aq in fluid.total.components:
+        if Comp.CO2_aq in fluid.total.mass:
             mass_CO2 += fluid.total.mass[Comp.CO2_aq]
 
-        if Comp.CARBONDIOXIDE in fluid.total.components:
+        if Comp.CARBONDIOXIDE in fluid.total.mass:
             mass_CO2 += fluid.total.mass[Comp.CARBONDIOXIDE]
-        if Comp.CO3_minus2 in fluid.total.components:
+        if Comp.CO3_minus2 in fluid.total.mass:
             mass_CO2 += fluid.total.mass[Comp.CO3_minus2] * 44 / 60
 
         if alpha is None:
@@ -956,7 +1355,7 @@ class SpycherPrussPartition:
         else:
             # two phase mixtures
             components += [Comp.WATER, Comp.STEAM, Comp.CO2_aq, Comp.CARBONDIOXIDE]
-            n_tot = sum([fluid.total.moles[i] for i in fluid.total.components])
+            n_tot = fluid.total.moles.total()
 
             m_WAT = n_tot * (1 - alpha) * xH2O * MrH2O
             m_STEAM = n_tot * alpha * yH2O * MrH2O
@@ -965,5 +1364,10 @@ class SpycherPrussPartition:
 
             composition += [m_WAT, m_STEAM, m_CO2aq, m_CO2g]
 
+        # overwrite the output fluid
+        if out is not None:
+            out.setComponents(components, composition)
+            return out
+
         # create a new fluid
         return Fluid(components=components, composition=composition)
\ No newline at end of file
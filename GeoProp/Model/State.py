@@ -9,6 +9,19 @@ import time
 class State:
     """
     a class to orchestrate the calculations to equilibrate a state and find the fluid properties
+
+    Attributes
+    ----------
+    part_options: PartitionModelOptions
+        the calculation options to be used for the partition calculations
+    prop_options: PropertyModelOptions
+        the calculation options to be used for the property calculations
+    partition: Partition
+        the partition model used for all calculations of this State
+    property_model: PropertyModel
+        the property model used for all calculations of this State
+    scratch: Fluid
+        a Fluid that is overwritten by the intermediate calculations of the iterative solvers
     """
 
     def __init__(self, part_options=None, prop_options=None):
@@ -33,7 +46,23 @@ class State:
         else:
             self.prop_options = prop_options
 
-    def calc_PT(self, fluid, P, T):
+        self.partition = Partition(options=self.part_options)
+        self.property_model = PropertyModel(options=self.prop_options)
+
+        self.scratch = Fluid()
+
+    def _update_models(self):
+        """
+        re-creates the partition and property models if the calculation options have been changed
+        """
+
+        if self.partition.options is not self.part_options or self.partition.partitionModel != self.part_options.model:
+            self.partition = Partition(options=self.part_options)
+
+        if self.property_model.options is not self.prop_options:
+            self.property_model = PropertyModel(options=self.prop_options)
+
+    def calc_PT(self, fluid, P, T, out=None):
         """
         calculates the state of the fluid given an input of pressure and temperature
 
@@ -45,6 +74,8 @@ class State:
             the pressure
         T: float
             the temperature
+        out: Fluid
+            a Fluid to be overwritten with the result, instead of creating a new one
 
         Returns
         -------
@@ -52,9 +83,11 @@ class State:
 
         """
 
-        fluid = Partition(options=self.part_options).calc(fluid, P, T)
+        self._update_models()
+
+        fluid = self.partition.calc(fluid, P, T, out=out)
 
-        fluid = PropertyModel(options=self.prop_options).calc(fluid, P, T)
+        fluid = self.property_model.calc(fluid, P, T)
 
         return fluid
 
@@ -82,7 +115,7 @@ class State:
         a = False
 
         def ph_search_t(target, t, p):
-            temp_fluid = self.calc_PT(fluid, p, t)
+            temp_fluid = self.calc_PT(fluid, p, t, out=self.scratch)
 
             if a:
                 print(temp_fluid.gaseous)
@@ -127,7 +160,7 @@ class State:
 
         def ps_search_t(target, t, p):
 
-            temp_fluid = self.calc_PT(fluid, p, t)
+            temp_fluid = self.calc_PT(fluid, p, t, out=self.scratch)
             s_mass = temp_fluid.total.props["s"]
 
             return target - s_mass
@@ -168,10 +201,10 @@ class State:
 
         def px_search_t(target, t, p):
 
-            temp_fluid = self.calc_PT(fluid, p, t)
+            temp_fluid = self.calc_PT(fluid, p, t, out=self.scratch)
 
-            n_vap = sum([temp_fluid.gaseous.moles[i] for i in temp_fluid.gaseous.components])
-            n_tot = sum([temp_fluid.total.moles[i] for i in temp_fluid.total.components])
+            n_vap = temp_fluid.gaseous.moles.total()
+            n_tot = temp_fluid.total.moles.total()
 
             x = n_vap / n_tot
 
@@ -1,9 +1,10 @@
-from .Databases import Comp
+from .Databases import Comp, species_table
 from .Phases import Phase
 from .Constants import *
 
 from enum import Enum
 import os
+import threading
 import thermohubclient
 import thermofun as fun
 import CoolProp as cp
@@ -85,16 +86,99 @@ class ThermoFunPropertyOptions:
         # initialise the ThermoFun database
         database = self.databaseHomeDir + "\\" + self.database.value
 
-        # initialise the ThermoFun calculation engineer
-        self.engine = fun.ThermoEngine(database)
+        # retrieve the ThermoFun calculation engine, the database is only loaded once per process
+        self.engine = thermo_engines.get(database)
+
+
+class ThermoEngines:
+    """
+        The ThermoEngines class is a process-wide registry of the ThermoFun calculation engines, keyed on the database
+        file. Loading a database takes much longer than any property calculation, so every database is only loaded on
+        first use. Parallel workers forked after a database was loaded inherit its engine.
+
+        Attributes
+        ----------
+        engines: Dict[str, fun.ThermoEngine]
+            the ThermoFun calculation engine of each database file
+        hits: int
+            the number of engines retrieved from the registry
+        misses: int
+            the number of databases that had to be loaded
+    """
+
+    def __init__(self):
+        """
+            initialises the ThermoEngines registry
+        """
+        self.engines = {}
+
+        self.hits = 0
+        self.misses = 0
+
+        self.__lock = threading.Lock()
+
+    def get(self, database: str):
+        """
+            retrieves the ThermoFun calculation engine of a database, loading the database on first use
+
+            Parameters
+            ----------
+            database: str
+                the path of the ThermoFun database file
+
+            Returns
+            -------
+            engine: fun.ThermoEngine
+        """
+        database = os.path.abspath(database)
+
+        with self.__lock:
+            if database in self.engines:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.engines[database] = fun.ThermoEngine(database)
+
+            return self.engines[database]
+
+    def clear(self) -> NoReturn:
+        """
+            removes all engines from the registry and resets the counters
+        """
+        with self.__lock:
+            self.engines.clear()
+
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+            returns the registry statistics
+
+            Returns
+            -------
+            stats: Dict[str, int]
+        """
+        return {"size": len(self.engines), "hits": self.hits, "misses": self.misses}
+
+
+thermo_engines = ThermoEngines()
 
 
 
 class ThermoFunProperties:
     """
         The ThermoFunProperties class orchestrates the property calculations using ThermoFun
+
+        Attributes
+        ----------
+        reference_states: Dict[Tuple[str, str], Tuple[float, float]]
+            the enthalpy and entropy of each species at the reference conditions, keyed on the source (database or
+            CoolProp) and the species name. These do not change and are only evaluated once per process
     """
 
+    reference_states = {}
+
     @staticmethod
     def calc(phase: Phase, P: float, T: float, options: ThermoFunPropertyOptions) -> Dict:
         """
@@ -136,10 +220,13 @@ class ThermoFunProperties:
                 # calculate the properties of water using CoolProp
                 calc = cp.AbstractState("?", comp.value.alias["CP"])
 
-                # calculate the enthalpy and entropy at the reference conditions
-                calc.update(cp.PT_INPUTS, Pref, Tref)
-                h0 = calc.hmass()
-                s0 = calc.smass()
+                # retrieve the enthalpy and entropy at the reference conditions
+                key = ("CoolProp", comp.value.alias["CP"])
+                if key not in ThermoFunProperties.reference_states:
+                    calc.update(cp.PT_INPUTS, Pref, Tref)
+                    ThermoFunProperties.reference_states[key] = (calc.hmass(), calc.smass())
+
+                h0, s0 = ThermoFunProperties.reference_states[key]
 
                 calc.update(cp.PQ_INPUTS, P, 0)
                 Tsat = calc.T()
@@ -182,15 +269,20 @@ class ThermoFunProperties:
                # calculate the properties of the aqueous species
                 try:
 
-                    th_name = comp.value.alias["RKT"]
-                    if "(aq)" in th_name:
-                        th_name = th_name.replace("(aq)", "@")
+                    th_name = species_table.thermofunNames[comp.id]
 
                     properties = engine.thermoPropertiesSubstance(T, P, th_name)
-                    properties0 = engine.thermoPropertiesSubstance(Tref, Pref, th_name)
 
-                    enthalpy += phase.moles[comp] * (properties.enthalpy.val - properties0.enthalpy.val) / 1e3  # the units of enthalpy are J/mol
-                    entropy += phase.moles[comp] * (properties.entropy.val - properties0.entropy.val) / 1e3  # the units of entropy are J/mol
+                    # retrieve the enthalpy and entropy at the reference conditions
+                    key = (options.database.value, th_name)
+                    if key not in ThermoFunProperties.reference_states:
+                        properties0 = engine.thermoPropertiesSubstance(Tref, Pref, th_name)
+                        ThermoFunProperties.reference_states[key] = (properties0.enthalpy.val, properties0.entropy.val)
+
+                    h0, s0 = ThermoFunProperties.reference_states[key]
+
+                    enthalpy += phase.moles[comp] * (properties.enthalpy.val - h0) / 1e3  # the units of enthalpy are J/mol
+                    entropy += phase.moles[comp] * (properties.entropy.val - s0) / 1e3  # the units of entropy are J/mol
                     volume += properties.volume.val * 1e-5 * phase.moles[comp]  # the units of volume are in J/bar
                     # It seems the species volume contribution can be negative... I guess this due to charge effects of the ions??
 
@@ -198,7 +290,7 @@ class ThermoFunProperties:
                     comp_not_calculated.append(comp)
 
         # calculate the total mass of the phase
-        total_mass = sum([phase.mass[i] for i in phase.mass])
+        total_mass = phase.mass.total()
 
         # update the phase properties
         props["P"] = P
@@ -13,6 +13,6 @@ class UserPartitionOptions:
 class UserPartition:
 
     @staticmethod
-    def calc(fluid, P, T, options):
+    def calc(fluid, P, T, options, out=None):
         print("User Partition")
         return copy.deepcopy(fluid)
@@ -7,9 +7,14 @@ Created on Thu Sep 14 18:56:29 2023
 
 # TODO results reporting
 
+import concurrent.futures
 import copy
+import functools
+import hashlib
 import importlib
 import sys
+import threading
+import time
 
 from pymoo.algorithms.soo.nonconvex.ga import GA
 from pymoo.operators.sampling.rnd import FloatRandomSampling
@@ -27,9 +32,17 @@ import itertools
 import json
 
 from . import ORCptimization_problem
+from .results_store import ResultsStore
+from .evaluation_cache import EvaluationCache
 
 
-def OptimizationManager(file_paths, Parallel, Restart, N_cores=[], logging=True):
+def OptimizationManager(file_paths, Parallel, Restart, N_cores=[], logging=True, cache=False, N_cases=1):
+    # concurrent cases are only evaluated in separate worker processes, as the fluid property registries and the
+    # warm-start contexts of the input functions are not shared safely between threads
+    if N_cases > 1 and not Parallel:
+        msg = "running {} sensitivity cases concurrently requires Parallel! Aborted Optimization!!".format(N_cases)
+        raise ValueError(msg)
+
     for file in file_paths:
         if not os.path.exists(file):
             msg = "the specified filepath \"{}\" does not exist! Aborted Optimization!!".format(file)
@@ -83,30 +96,63 @@ def OptimizationManager(file_paths, Parallel, Restart, N_cores=[], logging=True)
             os.mkdir(file + '/inputs')
 
         # resets the sensitivity results for this sensitivity
-        open(file + "/sensitivity_results.txt", "w").close()
         open(file + "/sensitivity_results.json", "w").close()
 
+        store = ResultsStore(file + "/results.npz")
+        if not Restart:
+            store.clear()
+
+        # the evaluations are kept across runs, unless the input function is changed
+        if cache:
+            with open(input_function.__file__, "rb") as source:
+                namespace = hashlib.sha256(source.read()).hexdigest()
+            evaluation_cache = EvaluationCache(file + "/evaluations.sqlite", namespace=namespace)
+        else:
+            evaluation_cache = None
+
         CaseResults = ["" for case in CaseParameters]
 
-        for i, case in enumerate(CaseParameters):
+        # the sensitivity cases share the results store, which is written by one case at a time
+        store_lock = threading.Lock()
+
+        # one pool of workers is used for all sensitivity cases. The workers load the input script, fluids and
+        # saturation curves once, rather than for every case
+        if Parallel and __name__ == "ORCptimization.ORCptimization_manager":
+            if not N_cores:
+                N_cores = multiprocessing.cpu_count()
+
+            warm_up_queue = multiprocessing.Queue()
+            pool = multiprocessing.Pool(N_cores, initializer=init_worker, initargs=(file, CaseParameters, warm_up_queue))
+
+            for _ in range(N_cores):
+                pid, warm_up_time = warm_up_queue.get()
+                print("worker {} warm-up: {:.2f} s".format(pid, warm_up_time))
+
+            runner = StarmapParallelization(pool.starmap)
+            PostProcessing = functools.partial(run_postprocessing, pool)
+        else:
+            pool = None
+            runner = None
+            PostProcessing = input_function.PostProcessing
+
+        def run_case(i, case, problem):
             ####### generate checkpoint name
             checkpoint_name = file + '/checkpoint/Checkpoint_{}.npy'.format(i)
-            history_name = file + '/results/History_{}.npy'.format(i)
             inputs_name = file + "/inputs/Inputs_{}.npy".format(i)
 
             if Restart:
 
+                # the decision variables of the last population
                 if os.path.exists(checkpoint_name):
-                    pop_init = np.load(checkpoint_name, allow_pickle=True)
-                else:
-                    continue
-                if os.path.exists(history_name):
-                    History = np.load(history_name, allow_pickle=True)
+                    try:
+                        pop_init = load_checkpoint(checkpoint_name)
+                    except ValueError as error:
+                        print("Case {} skipped: {}".format(i, error))
+                        return
                 else:
-                    continue
+                    return
             else:
                 pop_init = FloatRandomSampling()
-                History = np.empty(0)
 
             # for pop in pop_init:
             #     pop.F *= 10
@@ -132,74 +178,36 @@ def OptimizationManager(file_paths, Parallel, Restart, N_cores=[], logging=True)
             # termination = get_termination("n_gen", N_gen)
             termination = CustomTerminator(0.01, N_gen)  # set to 0.005 when resunning the techno-economic optimisation
 
-            if Parallel and __name__ == "ORCptimization.ORCptimization_manager":
-                pool = multiprocessing.Pool(N_cores)
-                runner = StarmapParallelization(pool.starmap)
-
-                problem = ORCptimization_problem.ORCptimization_Problem(ObjectiveFunc, case, file,
-                                                                        elementwise_runner=runner)
-            else:
-                problem = ORCptimization_problem.ORCptimization_Problem(ObjectiveFunc, case, file)
-
             res = minimize(problem, algorithm, termination, save_history=True, seed=Seed_init, verbose=True, return_least_infeasible=False)
 
             try:
                 X = res.X
                 W_net_best = -res.F
 
-                extra_res = input_function.PostProcessing(X, CaseParameters[i])
+                extra_res = get_postprocessing(PostProcessing, X, CaseParameters[i], evaluation_cache)
 
                 fmin, fmax, favg = get_convergence_data(res.history)
 
-                if logging:
-                    History = np.append(History, res.history)
-                    np.save(checkpoint_name, History[-1].pop)
-                    np.save(history_name, History)
-
-                if SensitivityParameters and logging:
-                    np.save(inputs_name, case_ids[i])
-
-                with open(file + "/sensitivity_results.txt", "a") as res_file:
-                    results = ""
-
-                    if i == 0:
-                        header = ""
-                        for key in CaseParameters[0]:
-                            header += key + ";"
-                        header += "ObjFunc;"
-                        for j in range(n_Vars):
-                            header += "Var {};".format(j)
-                        for x_res in extra_res:
-                            header += x_res + ";"
-                        header += "fmin;fmax;favg;"
-                        header += "\n"
-
-                        results += header
-
-                    for key in CaseParameters[i]:
-                        results += str(CaseParameters[i][key]) + ";"
-                    for res in W_net_best:
-                        results += str(res) + ";"
-                    for x_var in X:
-                        results += str(x_var) + ";"
-                    for x_res in extra_res:
-                        results += str(extra_res[x_res]) + ";"
-
-                    results += str(fmin) + ";"
-                    results += str(fmax) + ";"
-                    results += str(favg) + ";"
-
-                    results += "\n"
-                    res_file.write(results)
-
                 CaseResults[i] = {key: CaseParameters[i][key] for key in CaseParameters[i]} | \
                                {"ObjFunc": list(W_net_best)} | \
                                {"Var {}".format(j): X[j] for j in range(n_Vars)} | \
                                extra_res | \
                                {"fmin": fmin, "fmax": fmax, "favg": favg}
 
-                with open(file + "/sensitivity_results.json", "w") as res_file:
-                    json.dump(CaseResults, res_file)
+                with store_lock:
+                    if logging:
+                        np.save(checkpoint_name, res.history[-1].pop.get("X"))
+                        # a restarted run counts its generations from 1 again, they follow the stored generations
+                        generations = store.read("individuals", ["generation"], where={"case": i})["generation"]
+                        offset = int(np.max(generations)) if len(generations) else 0
+
+                        store.append("individuals", get_individuals(res.history, i, offset))
+
+                    if SensitivityParameters and logging:
+                        np.save(inputs_name, case_ids[i])
+
+                    # every (re)started run of a case appends a row, the last row of a case holds its latest results
+                    store.append_rows("cases", [{"case": i} | CaseResults[i]])
 
                 print('Optimization Successful')
 
@@ -207,15 +215,271 @@ def OptimizationManager(file_paths, Parallel, Restart, N_cores=[], logging=True)
 
                 print('Optimization Failed')
 
-            if Parallel and __name__ == "ORCptimization.ORCptimization_manager":
-                pool.close()
+        # the problems are created up front, as they (re)load the input script
+        problems = [ORCptimization_problem.ORCptimization_Problem(ObjectiveFunc, case, file, cache=evaluation_cache,
+                                                                  elementwise_runner=runner) if runner else
+                    ORCptimization_problem.ORCptimization_Problem(ObjectiveFunc, case, file, cache=evaluation_cache)
+                    for case in CaseParameters]
+
+        if N_cases > 1 and pool is not None:
+            # the cases run concurrently, each submitting its individuals and post-processing to the shared pool
+            with concurrent.futures.ThreadPoolExecutor(N_cases) as executor:
+                for future in [executor.submit(run_case, i, case, problems[i]) for i, case in enumerate(CaseParameters)]:
+                    future.result()
+        else:
+            for i, case in enumerate(CaseParameters):
+                run_case(i, case, problems[i])
 
+        if pool is not None:
+            pool.close()
+            pool.join()
 
+        with open(file + "/sensitivity_results.json", "w") as res_file:
+            json.dump(CaseResults, res_file)
 
         while file in sys.path:
             sys.path.remove(file)
 
 
+def load_checkpoint(checkpoint_name):
+    """
+    loads the decision variables of the last population of a case. Checkpoints written by earlier versions hold the
+    pickled population, these are converted to the decision variables once.
+
+    Parameters
+    ----------
+    checkpoint_name: str
+        the path of the checkpoint
+
+    Returns
+    -------
+    np.ndarray
+        the decision variables of the last population
+
+    Raises
+    ------
+    ValueError
+        the checkpoint cannot be read
+    """
+
+    try:
+        return np.load(checkpoint_name)
+    except ValueError:
+        pass
+
+    try:
+        population = np.load(checkpoint_name, allow_pickle=True)
+        X = np.array([individual.X for individual in population.flat], dtype=float)
+    except (ValueError, OSError, AttributeError, ImportError) as error:
+        msg = "the checkpoint \"{}\" cannot be read ({})".format(checkpoint_name, error)
+        raise ValueError(msg)
+
+    np.save(checkpoint_name, X)
+
+    return X
+
+
+def init_worker(file, CaseParameters, queue):
+    """
+    initialises a parallel worker: loads the input script, and creates the fluids of all sensitivity cases, so that
+    their engines, lookup tables and saturation curves are loaded once per worker. Then evaluates the objective function
+    once, which loads the component plugins. The warm-up time is reported to the main process.
+
+    Parameters
+    ----------
+    file: str
+        the path of the optimisation study
+    CaseParameters: list[dict[str, any]]
+        the parameters of each sensitivity case
+    queue: multiprocessing.Queue
+        the queue receiving the process id and warm-up time, in s
+
+    Returns
+    -------
+    NoReturn
+    """
+
+    start_time = time.time()
+
+    if file not in sys.path:
+        sys.path.append(file)
+
+    try:
+        import input_file
+        import input_function
+
+        from FluidProperties.fluid import Fluid
+
+        fluids = {}
+        for Parameters in CaseParameters:
+            for key in Parameters:
+                if not key.endswith(" comp") or key.replace(" comp", " engine") not in Parameters:
+                    continue
+
+                name = key.removesuffix(" comp")
+                comp = Parameters[key]
+
+                fluids[json.dumps([comp, Parameters[name + " engine"]])] = (comp, {"engine": Parameters[name + " engine"]})
+
+                if Parameters.get(name + " tables", False):
+                    fluids[json.dumps([comp, Parameters[name + " table path"]])] = \
+                        (comp, {"engine": "tables", "filename": Parameters[name + " table path"]})
+
+        for comp, kwargs in fluids.values():
+            try:
+                fluid = Fluid(comp, **kwargs)
+
+                curve = fluid.saturation_curve()
+                if curve is not None:
+                    curve.Tsat(curve.p_crit / 2)
+            except:
+                pass
+
+        X = [(low + high) / 2 for low, high in zip(input_file.Variables_low_bound, input_file.Variables_up_bound)]
+        input_function.Objective_Function(X, copy.deepcopy(CaseParameters[0]))
+    except:
+        pass
+
+    queue.put((os.getpid(), time.time() - start_time))
+
+
+def run_postprocessing(pool, X, Parameters):
+    """
+    runs the post-processing of the best individual on a parallel worker, see get_postprocessing. The variables and
+    parameters modified by the post-processing function are copied back, as if it had run in this process.
+
+    Parameters
+    ----------
+    pool: multiprocessing.Pool
+        the pool of parallel workers
+    X: list[float]
+        the decision variables of the best individual
+    Parameters: dict[str, any]
+        the case parameters
+
+    Returns
+    -------
+    dict[str, any]
+    """
+
+    results, X_post, Parameters_post = pool.apply(_postprocessing, (X, Parameters))
+
+    _set_postprocessed(X, Parameters, X_post, Parameters_post)
+
+    return results
+
+
+def _postprocessing(X, Parameters):
+    # runs in a parallel worker, where the input function is loaded by init_worker
+    import input_function
+
+    results = input_function.PostProcessing(X, Parameters)
+
+    return results, X, Parameters
+
+
+def _set_postprocessed(X, Parameters, X_post, Parameters_post):
+    """
+    overwrites the decision variables and case parameters with their values after the post-processing
+
+    Parameters
+    ----------
+    X: np.ndarray
+        the decision variables
+    Parameters: dict
+        the case parameters
+    X_post: list[float] | np.ndarray
+        the decision variables after the post-processing
+    Parameters_post: dict
+        the case parameters after the post-processing
+
+    Returns
+    -------
+    NoReturn
+    """
+
+    X[:] = X_post
+
+    Parameters.clear()
+    Parameters.update(Parameters_post)
+
+
+def get_postprocessing(PostProcessing, X, Parameters, cache=None):
+    """
+    runs the post-processing of the best individual, or retrieves it from the cache. The post-processing function may
+    modify the variables and parameters (e.g. convert the variables to physical values), which are reported in the
+    case results. The modified values are therefore cached alongside the results and restored on a cache hit.
+
+    Parameters
+    ----------
+    PostProcessing: Callable[[np.ndarray, dict], dict]
+        the post-processing function of the case
+    X: np.ndarray
+        the decision variables
+    Parameters: dict
+        the case parameters
+    cache: Optional[EvaluationCache]
+        the evaluation cache
+
+    Returns
+    -------
+    dict
+    """
+
+    if cache is None:
+        return PostProcessing(X, Parameters)
+
+    # the cache is keyed on the values before the post-processing
+    X_key = copy.deepcopy(X)
+    Parameters_key = copy.deepcopy(Parameters)
+
+    cached = cache.get("postprocessing", Parameters_key, X_key)
+    if cached is not None:
+        _set_postprocessed(X, Parameters, cached["X"], cached["Parameters"])
+        return cached["results"]
+
+    results = PostProcessing(X, Parameters)
+
+    cache.put("postprocessing", Parameters_key, X_key, {"results": results, "X": X, "Parameters": Parameters})
+
+    return results
+
+
+def get_individuals(History, case, offset=0):
+    """
+    collects the decision variables, objectives and constraints of every individual of every generation
+
+    Parameters
+    ----------
+    History: list[Algorithm]
+        the optimisation history
+    case: int
+        the case index
+    offset: Optional[int]
+        the number of generations stored by previous runs of the case, added to the generation numbers
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        the columns of the individuals table of the ResultsStore
+    """
+
+    columns = {"case": [], "generation": [], "X": [], "F": [], "G": []}
+
+    for H in History:
+        X = H.pop.get("X")
+        F = H.pop.get("F")
+        G = H.pop.get("G")
+
+        columns["case"].append(np.full(len(X), case))
+        columns["generation"].append(np.full(len(X), offset + H.n_gen))
+        columns["X"].append(X)
+        columns["F"].append(F)
+        columns["G"].append(G if G is not None else np.empty((len(X), 0)))
+
+    return {key: np.concatenate(values) for key, values in columns.items()}
+
+
 def get_convergence_data(History):
 
     best = []
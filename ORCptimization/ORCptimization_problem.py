@@ -4,7 +4,7 @@ import sys
 
 class ORCptimization_Problem(ElementwiseProblem):
 
-    def __init__(self, Function, Parameters, input_file_path, **kwargs):
+    def __init__(self, Function, Parameters, input_file_path, cache=None, **kwargs):
         sys.path.append(input_file_path)
         import input_file
         # this is needed when multiple optimization are queued. Otherwise it may skip reloading the inputscript
@@ -15,6 +15,10 @@ class ORCptimization_Problem(ElementwiseProblem):
         self.Function = Function
         self.Parameters = Parameters
 
+        ####### optional EvaluationCache of the objectives and constraints
+
+        self.cache = cache
+
         ####### setting here the number of variables, objectives and constraints
 
         super().__init__(n_var=input_file.N_var,
@@ -27,7 +31,19 @@ class ORCptimization_Problem(ElementwiseProblem):
             sys.path.remove(input_file)
 
     def _evaluate(self, x, out, *args, **kwargs):
+        if self.cache is not None:
+            cached = self.cache.get("objective", self.Parameters, x)
+            if cached is not None:
+                out["F"], out["G"] = cached
+                return
+
+            # the objective function may modify the variables
+            X = x.copy()
+
         out["F"], out["G"] = self.Function(x, self.Parameters)
+
+        if self.cache is not None:
+            self.cache.put("objective", self.Parameters, X, [out["F"], out["G"]])
         
            
         
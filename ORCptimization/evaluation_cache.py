@@ -0,0 +1,283 @@
+import hashlib
+import json
+import multiprocessing.util
+import os
+import sqlite3
+import threading
+from typing import NoReturn, Optional
+
+import numpy as np
+
+
+# the database connection, lock and counters of each database in each process. They are shared by all EvaluationCache
+# instances of the process, as the parallel workers receive a new copy of the cache with every batch of individuals
+_processes = {}
+_processes_lock = threading.Lock()
+
+
+def _close(key: tuple[str, int]) -> NoReturn:
+    """
+    closes the database connection of a process, run when the process exits
+
+    Parameters
+    ----------
+    key: tuple[str, int]
+        the path of the database and the process id
+
+    Returns
+    -------
+    NoReturn
+    """
+
+    process = _processes.pop(key, None)
+
+    # a forked process inherits the connections of its parent, which must not be closed by the child
+    if process is not None and process["connection"] is not None and key[1] == os.getpid():
+        process["connection"].close()
+
+
+class EvaluationCache:
+    """
+    This class is a persistent, on-disk memo of the evaluations of an optimisation study, e.g. the objectives and
+    constraints of an individual or the post-processing results of the best individual. It is kept in an SQLite
+    database, so that it can be shared by parallel workers, sensitivity cases and restarts.
+
+    An evaluation is identified by its kind, the case parameters and the decision variables rounded to a number of
+    significant digits. The values are stored as JSON.
+
+    Attributes
+    ----------
+    path: str
+        the path of the SQLite database
+    namespace: str
+        an identifier of the evaluated functions, e.g. a hash of their source. Evaluations in other namespaces are not
+        retrieved
+    digits: int
+        the number of significant digits of the decision variables
+    hits: int
+        the number of evaluations retrieved from the cache by this process
+    misses: int
+        the number of evaluations not found in the cache by this process
+
+    The database connection and the counters are kept once per process (rather than per instance), so that the copies
+    of the cache sent to a parallel worker share them. The connection is closed when the process exits.
+    """
+
+    def __init__(self, path: str, namespace: Optional[str]="", digits: Optional[int]=10) -> NoReturn:
+        """
+        instantiates the EvaluationCache. The database is created on first use
+
+        Parameters
+        ----------
+        path: str
+            the path of the SQLite database
+        namespace: Optional[str]
+            an identifier of the evaluated functions
+        digits: Optional[int]
+            the number of significant digits of the decision variables
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.path = path
+        self.namespace = namespace
+        self.digits = digits
+
+    @property
+    def hits(self) -> int:
+        return self.__process()["hits"]
+
+    @property
+    def misses(self) -> int:
+        return self.__process()["misses"]
+
+    def __process(self) -> dict[str, any]:
+        """
+        Helper function to retrieve the connection, lock and counters of this process
+
+        Returns
+        -------
+        dict[str, any]
+        """
+
+        key = (self.path, os.getpid())
+
+        with _processes_lock:
+            process = _processes.get(key)
+
+            if process is None:
+                # the connection is shared by the threads of a process
+                process = {"connection": None, "lock": threading.Lock(), "hits": 0, "misses": 0}
+                _processes[key] = process
+
+                multiprocessing.util.Finalize(None, _close, args=(key,), exitpriority=0)
+
+        return process
+
+    def __connect(self, process: dict[str, any]) -> sqlite3.Connection:
+        """
+        Helper function to open the database connection of this process, the lock of the process must be held
+
+        Parameters
+        ----------
+        process: dict[str, any]
+            the connection, lock and counters of this process
+
+        Returns
+        -------
+        sqlite3.Connection
+        """
+
+        if process["connection"] is None:
+            connection = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS evaluations (key TEXT PRIMARY KEY, value TEXT)")
+            connection.commit()
+
+            process["connection"] = connection
+
+        return process["connection"]
+
+    @staticmethod
+    def __to_json(value: any) -> any:
+        """
+        Helper function to convert NumPy values for the JSON encoder
+
+        Parameters
+        ----------
+        value: any
+            the value which cannot be serialised by the JSON encoder
+
+        Returns
+        -------
+        any
+        """
+
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        elif isinstance(value, np.generic):
+            return value.item()
+
+        msg = "\nThe value {} cannot be cached".format(repr(value))
+        raise TypeError(msg)
+
+    def key(self, kind: str, parameters: dict[str, any], X: list[float] | np.ndarray) -> str:
+        """
+        creates the cache key of an evaluation
+
+        Parameters
+        ----------
+        kind: str
+            the kind of evaluation, e.g. "objective" or "postprocessing"
+        parameters: dict[str, any]
+            the case parameters
+        X: list[float] | np.ndarray
+            the decision variables
+
+        Returns
+        -------
+        str
+        """
+
+        X = [float("{:.{}g}".format(float(x), self.digits)) for x in X]
+
+        definition = json.dumps([self.namespace, kind, parameters, X], sort_keys=True, default=self.__to_json)
+
+        return hashlib.sha256(definition.encode()).hexdigest()
+
+    def get(self, kind: str, parameters: dict[str, any], X: list[float] | np.ndarray) -> any:
+        """
+        retrieves an evaluation from the cache
+
+        Parameters
+        ----------
+        kind: str
+            the kind of evaluation, e.g. "objective" or "postprocessing"
+        parameters: dict[str, any]
+            the case parameters
+        X: list[float] | np.ndarray
+            the decision variables
+
+        Returns
+        -------
+        any
+            None if the evaluation is not in the cache
+        """
+
+        key = self.key(kind, parameters, X)
+
+        process = self.__process()
+        with process["lock"]:
+            row = self.__connect(process).execute("SELECT value FROM evaluations WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                process["misses"] += 1
+                return None
+
+            process["hits"] += 1
+
+        return json.loads(row[0])
+
+    def put(self, kind: str, parameters: dict[str, any], X: list[float] | np.ndarray, value: any) -> NoReturn:
+        """
+        stores an evaluation in the cache
+
+        Parameters
+        ----------
+        kind: str
+            the kind of evaluation, e.g. "objective" or "postprocessing"
+        parameters: dict[str, any]
+            the case parameters
+        X: list[float] | np.ndarray
+            the decision variables
+        value: any
+            the result of the evaluation, which must be JSON serialisable
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        key = self.key(kind, parameters, X)
+        value = json.dumps(value, default=self.__to_json)
+
+        process = self.__process()
+        with process["lock"]:
+            connection = self.__connect(process)
+            connection.execute("INSERT OR REPLACE INTO evaluations (key, value) VALUES (?, ?)", (key, value))
+            connection.commit()
+
+    def clear(self) -> NoReturn:
+        """
+        removes all evaluations from the cache and resets the counters
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        process = self.__process()
+        with process["lock"]:
+            connection = self.__connect(process)
+            connection.execute("DELETE FROM evaluations")
+            connection.commit()
+
+            process["hits"] = 0
+            process["misses"] = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        returns the cache statistics of this process
+
+        Returns
+        -------
+        dict[str, int]
+        """
+
+        process = self.__process()
+        with process["lock"]:
+            size = self.__connect(process).execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+            return {"size": size, "hits": process["hits"], "misses": process["misses"]}
@@ -0,0 +1,331 @@
+import json
+import os
+import zipfile
+from typing import Callable, NoReturn, Optional
+
+import numpy as np
+
+
+class ResultsStore:
+    """
+    This class is an append-only, columnar store for the results of an optimisation study. The results are kept in a
+    single .npz file, which can also be read with np.load. Every append adds one chunk of rows to a table, i.e. one
+    .npy entry per column named "<table>/<chunk>/<column>", so that earlier results are never rewritten.
+
+    Numeric and string columns are stored as arrays (sequences of equal length as 2D arrays). All other values, e.g.
+    nested lists and dictionaries, are stored as JSON strings in a column named "<column>.json". No values are
+    pickled.
+
+    Attributes
+    ----------
+    path: str
+        the path of the .npz file
+    index: dict[str, dict[int, dict[str, str]]]
+        the entry name of every column of every chunk of every table
+    """
+
+    def __init__(self, path: str) -> NoReturn:
+        """
+        instantiates the ResultsStore. The file is created on the first append
+
+        Parameters
+        ----------
+        path: str
+            the path of the .npz file
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.path = path
+
+        self.index = {}
+        if os.path.exists(self.path):
+            with zipfile.ZipFile(self.path, "r") as file:
+                for name in file.namelist():
+                    self.__add_to_index(name[:-len(".npy")])
+
+    def __add_to_index(self, key: str) -> NoReturn:
+        """
+        Helper function to add an entry to the index
+
+        Parameters
+        ----------
+        key: str
+            the entry name, without the .npy extension
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        table, chunk, column = key.split("/", 2)
+
+        self.index.setdefault(table, {}).setdefault(int(chunk), {})[column] = key
+
+    @staticmethod
+    def __to_json(value: any) -> any:
+        """
+        Helper function to convert NumPy values for the JSON encoder
+
+        Parameters
+        ----------
+        value: any
+            the value which cannot be serialised by the JSON encoder
+
+        Returns
+        -------
+        any
+        """
+
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        elif isinstance(value, np.generic):
+            return value.item()
+
+        msg = "\nThe value {} cannot be stored".format(repr(value))
+        raise TypeError(msg)
+
+    def __encode(self, values: list[any]) -> tuple[np.ndarray, bool]:
+        """
+        Helper function to convert the values of a column to an array
+
+        Parameters
+        ----------
+        values: list[any]
+            the values of the column
+
+        Returns
+        -------
+        tuple[np.ndarray, bool]
+            the array, and a flag indicating whether the values are JSON encoded
+        """
+
+        try:
+            array = np.asarray(values)
+        except ValueError:  # sequences of different lengths
+            array = None
+
+        if array is not None:
+            if array.dtype.kind in "biuf":
+                return array, False
+
+            if array.dtype.kind == "U" and array.ndim == 1 and all(isinstance(value, str) for value in values):
+                return array, False
+
+        return np.array([json.dumps(value, default=self.__to_json) for value in values]), True
+
+    def append(self, table: str, columns: dict[str, list[any] | np.ndarray]) -> NoReturn:
+        """
+        appends rows to a table
+
+        Parameters
+        ----------
+        table: str
+            the table name
+        columns: dict[str, list[any] | np.ndarray]
+            the values of each column, all columns must have the same number of rows
+
+        Returns
+        -------
+        NoReturn
+
+        Raises
+        ------
+        ValueError
+            the columns have different numbers of rows
+        """
+
+        if len(set(len(values) for values in columns.values())) > 1:
+            msg = "\nThe columns appended to \"{}\" have different numbers of rows".format(table)
+            raise ValueError(msg)
+
+        chunk = max(self.index.get(table, {-1: None})) + 1
+
+        with zipfile.ZipFile(self.path, "a") as file:
+            for column, values in columns.items():
+                array, is_json = self.__encode(values)
+
+                key = "{}/{:06d}/{}".format(table, chunk, column + ".json" if is_json else column)
+                with file.open(key + ".npy", "w", force_zip64=True) as entry:
+                    np.lib.format.write_array(entry, array, allow_pickle=False)
+
+                self.__add_to_index(key)
+
+    def append_rows(self, table: str, rows: list[dict[str, any]]) -> NoReturn:
+        """
+        appends rows to a table. Missing values are stored as None
+
+        Parameters
+        ----------
+        table: str
+            the table name
+        rows: list[dict[str, any]]
+            the values of each row
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        columns = {}
+        for row in rows:
+            for column in row:
+                columns.setdefault(column, None)
+
+        self.append(table, {column: [row.get(column) for row in rows] for column in columns})
+
+    def tables(self) -> list[str]:
+        """
+        returns the names of all tables
+
+        Returns
+        -------
+        list[str]
+        """
+
+        return list(self.index)
+
+    def columns(self, table: str) -> list[str]:
+        """
+        returns the names of all columns of a table
+
+        Parameters
+        ----------
+        table: str
+            the table name
+
+        Returns
+        -------
+        list[str]
+        """
+
+        columns = {}
+        for chunk in self.index.get(table, {}).values():
+            for column in chunk:
+                columns.setdefault(column.removesuffix(".json"), None)
+
+        return list(columns)
+
+    def read(self,
+             table: str,
+             columns: Optional[list[str] | None]=None,
+             where: Optional[dict[str, any | Callable[[np.ndarray | list], np.ndarray]] | None]=None
+             ) -> dict[str, np.ndarray | list]:
+        """
+        reads columns of a table. Only the entries of the requested and filtered columns are loaded
+
+        Parameters
+        ----------
+        table: str
+            the table name
+        columns: Optional[list[str] | None]
+            the columns to be read, all columns if None
+        where: Optional[dict[str, any | Callable[[np.ndarray | list], np.ndarray]] | None]
+            the row filters: either the required value of a column, or a function returning the boolean mask of the
+            rows to keep from the values of a column
+
+        Returns
+        -------
+        dict[str, np.ndarray | list]
+            the values of each column. Columns with JSON encoded values, or with arrays of different shapes, are
+            returned as lists
+        """
+
+        if columns is None:
+            columns = self.columns(table)
+
+        where = {} if where is None else where
+
+        values = {column: [] for column in columns}
+
+        if table not in self.index:
+            return values
+
+        with np.load(self.path) as data:
+
+            def load(chunk, column, rows):
+                if column in chunk:
+                    return data[chunk[column]][rows]
+                elif column + ".json" in chunk:
+                    return [json.loads(value) for value in data[chunk[column + ".json"]][rows]]
+                else:
+                    return [None] * n_rows if isinstance(rows, slice) else [None] * int(np.sum(rows))
+
+            for i in sorted(self.index[table]):
+                chunk = self.index[table][i]
+                n_rows = len(data[next(iter(chunk.values()))])
+
+                rows = slice(None)
+                if where:
+                    mask = np.ones(n_rows, dtype=bool)
+                    for column, condition in where.items():
+                        filter_values = load(chunk, column, slice(None))
+
+                        if callable(condition):
+                            mask &= np.asarray(condition(filter_values), dtype=bool)
+                        else:
+                            mask &= np.array([np.array_equal(value, condition) for value in filter_values], dtype=bool)
+
+                    if not np.any(mask):
+                        continue
+
+                    rows = mask
+
+                for column in columns:
+                    values[column].append(load(chunk, column, rows))
+
+        for column, chunks in values.items():
+            if all(isinstance(chunk, np.ndarray) for chunk in chunks) and len(set(chunk.shape[1:] for chunk in chunks)) <= 1:
+                values[column] = np.concatenate(chunks) if chunks else np.empty(0)
+            else:
+                values[column] = [value.tolist() if isinstance(value, np.ndarray) else
+                                  value.item() if isinstance(value, np.generic) else value
+                                  for chunk in chunks for value in chunk]
+
+        return values
+
+    def records(self,
+                table: str,
+                columns: Optional[list[str] | None]=None,
+                where: Optional[dict[str, any | Callable[[np.ndarray | list], np.ndarray]] | None]=None
+                ) -> list[dict[str, any]]:
+        """
+        reads rows of a table, see read
+
+        Parameters
+        ----------
+        table: str
+            the table name
+        columns: Optional[list[str] | None]
+            the columns to be read, all columns if None
+        where: Optional[dict[str, any | Callable[[np.ndarray | list], np.ndarray]] | None]
+            the row filters
+
+        Returns
+        -------
+        list[dict[str, any]]
+            the values of each row as Python objects
+        """
+
+        values = self.read(table, columns=columns, where=where)
+
+        n_rows = len(next(iter(values.values()))) if values else 0
+
+        return [{column: values[column][i].tolist() if isinstance(values[column], np.ndarray) else values[column][i]
+                 for column in values} for i in range(n_rows)]
+
+    def clear(self) -> NoReturn:
+        """
+        removes all results
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        self.index = {}
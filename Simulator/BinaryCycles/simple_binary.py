@@ -1,6 +1,7 @@
 from ..cycle import BinaryCycle
 import Simulator
 import matplotlib.pyplot as plt
+import numpy as np
 from scipy.optimize import root_scalar
 from FluidProperties import Tref
 
@@ -38,9 +39,13 @@ class ORC(BinaryCycle):
         self.turbine = Simulator.turbine(0.85)
 
     def _calc_Tevap(self, stream, P, Tmax):
-        temp_stream = stream.copy()
-        temp_stream.update("PQ", P, 0)
-        Tevap = temp_stream.properties.T
+        curve = stream.fluid.saturation_curve()
+        Tevap = curve.Tsat(P) if curve is not None else np.nan
+
+        if np.isnan(Tevap):
+            temp_stream = stream.copy()
+            temp_stream.update("PQ", P, 0)
+            Tevap = temp_stream.properties.T
 
         if Tmax < Tevap + self.deltaT_superheat:
             msg = "The maximum temperature, {:.2f} K, is below the working fluid's mininimum superheated temperature, {:.2f} K".format(
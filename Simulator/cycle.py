@@ -1,10 +1,150 @@
 import numpy as np
 from FluidProperties import Tref
 
-from scipy.optimize import root_scalar
 import matplotlib.pyplot as plt
 
 
+class WarmStart:
+    """
+    This class is the warm-start context of a cycle calculation. It carries the working fluid to geofluid mass ratio of
+    the last converged evaluation, so that the next evaluation of a neighbouring design point (e.g. the next individual
+    of a genetic algorithm) can seed its search bracket from it. A context can be shared by several Cycle instances.
+
+    Attributes
+    ----------
+    width: float
+        the relative half-width of the mass ratio bracket seeded from the last converged evaluation
+    key: tuple | None
+        the definition of the last converged cycle, i.e. fluids and configuration
+    MassRatio: float | None
+        the last converged working fluid to geofluid mass ratio
+    reference_calls: int | None
+        the number of engine calls of the last evaluation that was not warm-started
+    hits: int
+        the number of evaluations solved within the seeded bracket
+    misses: int
+        the number of warm-started evaluations that fell back to the full search
+    saved_calls: int
+        the number of engine calls saved by warm-starting, relative to reference_calls. Misses count negatively.
+    """
+
+    def __init__(self, width=0.0025):
+        """
+        instantiates the WarmStart context
+
+        Parameters
+        ----------
+        width: Optional[float]
+            the relative half-width of the seeded mass ratio bracket
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.width = width
+
+        self.clear()
+
+    def clear(self):
+        """
+        removes the stored evaluation and resets the counters
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.key = None
+        self.MassRatio = None
+
+        self.reference_calls = None
+        self.hits = 0
+        self.misses = 0
+        self.saved_calls = 0
+
+    def bracket(self, key):
+        """
+        returns the mass ratio bracket seeded from the last converged evaluation
+
+        Parameters
+        ----------
+        key: tuple
+            the definition of the cycle to be calculated
+
+        Returns
+        -------
+        tuple[float, float] | None
+            None if there is no converged evaluation of the same cycle definition
+        """
+
+        if self.MassRatio is None or key != self.key:
+            return None
+
+        return self.MassRatio * (1 - self.width), self.MassRatio * (1 + self.width)
+
+    def store(self, key, MassRatio):
+        """
+        stores a converged evaluation
+
+        Parameters
+        ----------
+        key: tuple
+            the definition of the calculated cycle
+        MassRatio: float
+            the converged working fluid to geofluid mass ratio
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.key = key
+        self.MassRatio = MassRatio
+
+    def record(self, calls, seeded, converged):
+        """
+        records the engine calls of an evaluation
+
+        Parameters
+        ----------
+        calls: int
+            the number of engine calls of the evaluation
+        seeded: bool
+            whether the evaluation was warm-started
+        converged: bool
+            whether the warm-started evaluation converged within the seeded bracket
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        if not seeded:
+            self.reference_calls = calls
+            return
+
+        if converged:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        if self.reference_calls is not None:
+            self.saved_calls += self.reference_calls - calls
+
+    def stats(self):
+        """
+        returns the warm-start statistics
+
+        Returns
+        -------
+        dict[str, int]
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "reference_calls": self.reference_calls,
+                "saved_calls": self.saved_calls}
+
+
 class Cycle:
 
     def __init__(self):
@@ -30,6 +170,11 @@ class Cycle:
         self.coolant_in = None
         self.coolant_out = None
 
+        self.warm_start = None
+
+        # the parameters of the last economic evaluation, see calc_economics
+        self.economics_parameters = {"discount_rate": 0.1, "price": 0.4, "duration": 20, "tax": 0.2, "operating": 0.05}
+
     def set_ambient_conditions(self, P=None, T=None):
 
         if P is not None:
@@ -60,9 +205,47 @@ class Cycle:
         self.coolant = stream.copy()
         self.coolant.update("PT", self.P_ambient, self.T_ambient)
 
+    def set_warm_start(self, context=None):
+        """
+        enables warm-starting of the cycle calculation from the last converged evaluation in the context
+
+        Parameters
+        ----------
+        context: Optional[WarmStart]
+            the warm-start context, which may be shared between cycles. A new context is created if None
+
+        Returns
+        -------
+        WarmStart
+        """
+
+        if context is None:
+            context = WarmStart()
+
+        self.warm_start = context
+
+        return context
+
     def calc(self, *args, **kwargs):
         pass
 
+    def _rescale(self, m):
+        """
+        rescales the calculated cycle to a geofluid mass rate and updates its performance and cost, without evaluating
+        the economics. Cycles that do not separate the two fall back to update_mass_rate.
+
+        Parameters
+        ----------
+        m: float
+            the geofluid mass rate, in kg/s
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.update_mass_rate(m)
+
     def second_law_efficiency(self):
         if self.geofluid_in is None or self.geofluid_out is None or self.net_power == 0.0:
             msg = "Cannot calculate the second law efficiency as the system has not yet been calculated"
@@ -106,31 +289,157 @@ class Cycle:
 
     def calc_economics(self, discount_rate=0.1, price=0.4, duration=20, tax=0.2, operating=0.05):
 
-        def price_search(price):
+        self.economics_parameters = {"discount_rate": discount_rate, "price": price, "duration": duration, "tax": tax,
+                                     "operating": operating}
 
-            NPV = self.calc_NPV(price, discount_rate=discount_rate, duration=duration, tax=tax, operating=operating)
+        results = self._calc_economics(self.net_power, self.cost, **self.economics_parameters)
 
-            finalNPV = NPV[-1]
-            return finalNPV
+        self.__set_economics(results, 0)
 
-        res = root_scalar(price_search, method="secant", x0=price, x1=price*2)
-        self.LCOE = res.root*1e3  # €$/MWh
+    def __set_economics(self, results, i):
+        """
+        sets the economics of the cycle from the economics of one of the plants evaluated by _calc_economics
 
-        def discount_search(discount):
-            NPV = self.calc_NPV(price, discount_rate=discount, duration=duration, tax=tax, operating=operating)
+        Parameters
+        ----------
+        results: dict[str, np.ndarray]
+            the economics evaluated by _calc_economics
+        i: int
+            the index of the plant
 
-            final_NPV = NPV[-1]
-            return final_NPV
+        Returns
+        -------
+        NoReturn
+        """
 
-        # res = root_scalar(discount_search, method="brentq", bracket=[0, 10])
-        res = root_scalar(discount_search, method="secant", x0=discount_rate, x1=discount_rate*2)
-        self.IRR = res.root  # %
+        self.LCOE = float(results["LCOE"][i])  # €$/MWh
+        self.IRR = float(results["IRR"][i])  # %
 
-        self.NPV_profile = self.calc_NPV(price, discount_rate=discount_rate, duration=duration, tax=tax, operating=operating)
+        self.NPV_profile = results["NPV_profile"][i].tolist()
         self.NPV = self.NPV_profile[-1]
 
         self.ROI = (self.NPV - self.cost) / self.cost
 
+    @staticmethod
+    def _calc_economics(net_power, cost, discount_rate=0.1, price=0.4, duration=20, tax=0.2, operating=0.05,
+                        inflation=0.03):
+        """
+        evaluates the economics of one or more plants in closed form, equivalent to the cash flows of calc_NPV
+
+        Parameters
+        ----------
+        net_power: float | np.ndarray
+            the net power of each plant, in W
+        cost: float | np.ndarray
+            the cost of each plant, in M€$
+        discount_rate: Optional[float]
+            the discount rate
+        price: Optional[float]
+            the electricity price, in €$/kWh
+        duration: Optional[int]
+            the lifetime of the plant, in years
+        tax: Optional[float]
+            the tax rate on the profits
+        operating: Optional[float]
+            the yearly operating costs as fraction of the plant cost
+        inflation: Optional[float]
+            the yearly inflation of the operating costs
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            the LCOE (in €$/MWh), IRR, NPV, NPV_profile (one row per plant) and ROI of each plant
+        """
+
+        net_power = np.atleast_1d(np.asarray(net_power, dtype=float))
+        cost = np.atleast_1d(np.asarray(cost, dtype=float))
+
+        years = np.arange(1, duration + 1)
+        income = np.abs(net_power * 365 * 24 / 1000)[:, np.newaxis] * 1e-6  # income per unit price
+        operating_costs = operating * cost[:, np.newaxis] * (1 + inflation) ** years
+
+        def discount(rate):
+            return (1 + rate[:, np.newaxis]) ** -years
+
+        # the NPV is linear in the price, so the break-even price follows directly
+        value_of_money = discount(np.full(len(cost), discount_rate))
+        with np.errstate(divide="ignore"):
+            LCOE = (cost + (1 - tax) * np.sum(operating_costs * value_of_money, axis=1)) / \
+                   ((1 - tax) * np.sum(income * value_of_money, axis=1))
+
+        profits_after_tax = (1 - tax) * (income * price - operating_costs)
+
+        NPV_profile = np.hstack([-cost[:, np.newaxis],
+                                 -cost[:, np.newaxis] + np.cumsum(profits_after_tax * value_of_money, axis=1)])
+        NPV = NPV_profile[:, -1]
+
+        # Newton iterations for the discount rate at which the NPV vanishes, for all plants at once
+        IRR = np.full(len(cost), float(discount_rate))
+        converged = np.zeros(len(cost), dtype=bool)
+        with np.errstate(all="ignore"):
+            for i in range(100):
+                value_of_money = discount(IRR)
+                f = -cost + np.sum(profits_after_tax * value_of_money, axis=1)
+                dfdr = -np.sum(years * profits_after_tax * value_of_money, axis=1) / (1 + IRR)
+
+                step = np.where(converged, 0.0, f / dfdr)
+                IRR = IRR - step
+
+                converged |= np.isfinite(IRR) & (np.abs(step) <= 1e-12 * np.maximum(1, np.abs(IRR)))
+                if np.all(converged | ~np.isfinite(IRR)):
+                    break
+
+        IRR = np.where(converged & (IRR > -1), IRR, np.nan)
+
+        ROI = (NPV - cost) / cost
+
+        return {"LCOE": LCOE * 1e3, "IRR": IRR, "NPV": NPV, "NPV_profile": NPV_profile, "ROI": ROI}
+
+    def scale_to(self, mass_rates):
+        """
+        rescales the calculated cycle to several geofluid mass rates and evaluates the economics of all plant sizes at
+        once. Only the performance and cost are updated for each size, the economics are evaluated in a single pass
+        for all sizes, with the parameters of the last calc_economics of the cycle. The cycle is returned to its
+        current mass rate afterwards.
+
+        Parameters
+        ----------
+        mass_rates: np.ndarray
+            the geofluid mass rates, in kg/s
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            the mass rate, net power, primary equipment cost, cost, LCOE, IRR, NPV, NPV_profile and ROI of each size
+        """
+
+        m0 = self.geofluid.m * 1.0
+
+        mass_rates = np.atleast_1d(np.asarray(mass_rates, dtype=float))
+
+        # the current mass rate is appended, so that the cycle is returned to it and its economics are evaluated in
+        # the same pass
+        sizes = np.append(mass_rates, m0)
+        net_power = np.empty(len(sizes))
+        primary_equipment_cost = np.empty(len(sizes))
+        cost = np.empty(len(sizes))
+
+        for i, m in enumerate(sizes):
+            self._rescale(m)
+
+            net_power[i] = self.net_power
+            primary_equipment_cost[i] = self.primary_equipment_cost
+            cost[i] = self.cost
+
+        results = self._calc_economics(net_power, cost, **self.economics_parameters)
+        self.__set_economics(results, -1)
+
+        results = {key: values[:-1] for key, values in results.items()}
+        results.update({"m": mass_rates, "net_power": net_power[:-1],
+                        "primary_equipment_cost": primary_equipment_cost[:-1], "cost": cost[:-1]})
+
+        return results
+
     def plot_Eloss(self):
 
         def sortFunc(e):
@@ -200,20 +509,21 @@ class BinaryCycle(Cycle):
 
         N = 25
         wfluid = fluid.copy()
-        Tcrit = wfluid.fluid.state.state.state.T_critical()
-        ts1 = np.linspace(self.T_ambient, Tcrit-0.1, N)
+        curve = wfluid.fluid.saturation_curve()
 
-        ts = np.zeros(N*2)
-        ss = np.zeros(N*2)
+        if curve is not None:
+            ts1 = np.linspace(self.T_ambient, curve.T_crit-0.1, N)
+
+            s_liq, s_vap = curve.s_liq(ts1), curve.s_vap(ts1)
+        else:
+            Tcrit = wfluid.fluid.state.state.state.T_critical()
+            ts1 = np.linspace(self.T_ambient, Tcrit-0.1, N)
 
-        for i, t in enumerate(ts1):
-            wfluid.update("TQ", t, 0)
-            ss[i] = wfluid.properties.S
-            ts[i] = t
+            envelope = wfluid.fluid.update_many("TQ", ts1[np.newaxis, :], np.array([[0.0], [1.0]]))
+            s_liq, s_vap = envelope.S[0], envelope.S[1]
 
-            wfluid.update("TQ", t, 1)
-            ss[-i-1] = wfluid.properties.S
-            ts[-i-1] = t
+        ts = np.concatenate((ts1, ts1[::-1]))
+        ss = np.concatenate((s_liq, s_vap[::-1]))
 
         return ss, ts
 
@@ -3,6 +3,7 @@ import numpy as np
 from FluidProperties import engines
 from FluidProperties.fluid import Fluid
 from FluidProperties import Pref, Tref
+from propertyengine_plugins.lookup_engine import LookUpTable
 
 
 class TESTS:
@@ -27,6 +28,11 @@ class TESTS:
         self.fail_counter += mixtures.fail_counter
         self.pass_counter += mixtures.pass_counter
 
+        tables = TESTING_LOOKUP_TABLES()
+        self.test_counter += tables.test_counter
+        self.fail_counter += tables.fail_counter
+        self.pass_counter += tables.pass_counter
+
         print("\nTest Summary ALL:\n - Tests: {}\n - Pass: {}\n - Fail: {}".format(self.test_counter, self.pass_counter,
                                                                                self.fail_counter))
 
@@ -74,6 +80,13 @@ class TESTING_PURE_FLUIDS:
         self.test_results_comparison("D")
         self.test_results_comparison("V")
 
+        print("\n##### BATCH CALCULATION #####\n")
+        pres = np.linspace(1e5, 1e6, 10)
+        temp = np.linspace(300, 450, 10)
+
+        for fluid in self.test_fluids:
+            self.test_batch_calculation(fluid, "PT", pres, temp)
+
         print("\n##### PURE FLUID CREATION - CARBONDIOXIDE #####\n")
         self.reset_test_fluids()
 
@@ -176,6 +189,28 @@ class TESTING_PURE_FLUIDS:
             self.fail_counter += 1
             print("FAILED - {} calculation with \"{}\" engine with components {} and composition {} for {}: {:.2e} and {}: {:.2e} failed unexpectedly".format(InputSpec, fluid.engine, fluid.components, fluid.composition, InputSpec[0], Input1, InputSpec[1], Input2))
 
+    def test_batch_calculation(self, fluid, InputSpec, Inputs1, Inputs2, tol=0.001):
+        self.test_counter += 1
+
+        try:
+            batch = fluid.update_many(InputSpec, Inputs1, Inputs2)
+
+            max_diff = 0.0
+            for i, Input1 in enumerate(Inputs1):
+                fluid.update(InputSpec, Input1, Inputs2[i])
+
+                for prop in ["H", "S", "T", "P", "D", "Q"]:
+                    max_diff = max(max_diff, abs((batch[prop][i] - fluid.properties[prop]) / (fluid.properties[prop] + 1e-20)))
+
+            if max_diff < tol:
+                self.pass_counter += 1
+                print("PASS - batch {} calculation with \"{}\" engine is consistent with the single state calculations".format(InputSpec, fluid.engine))
+            else:
+                self.fail_counter += 1
+                print("FAILED - batch {} calculation with \"{}\" engine deviates by {:.2e} from the single state calculations".format(InputSpec, fluid.engine, max_diff))
+        except:
+            self.fail_counter += 1
+            print("FAILED - batch {} calculation with \"{}\" engine failed unexpectedly".format(InputSpec, fluid.engine))
 
 
 class TESTING_MIXTURE_FLUIDS:
@@ -299,5 +334,92 @@ class TESTING_MIXTURE_FLUIDS:
             print(mat, "\n")
 
 
+class TESTING_LOOKUP_TABLES:
+
+    def __init__(self):
+
+        self.test_counter = 0
+        self.fail_counter = 0
+        self.pass_counter = 0
+
+        self.fluid = Fluid(["water", 0.95, "carbondioxide", 0.05], engine="coolprop")
+
+        print("\n##### SINGLE COMPOSITION LOOK UP TABLE #####\n")
+        self.test_single_composition_table()
+
+        print("\n##### ADAPTIVE LOOK UP TABLE #####\n")
+        self.test_adaptive_table()
+
+        print("\nTest Summary LOOK UP TABLES:\n - Tests: {}\n - Pass: {}\n - Fail: {}".format(self.test_counter, self.pass_counter,
+                                                                               self.fail_counter))
+
+    def test_single_composition_table(self, tol=0.01):
+        self.test_counter += 1
+
+        try:
+            table = LookUpTable(self.fluid.components, self.fluid.composition)
+            table.set_composition(z=np.array([0.95]))
+            table.set_Input1(min=1e5, max=1e6, N=5, log=True)
+            table.set_Input2(min=300, max=360, N=13)
+            table.generateTable(self.fluid)
+
+            pres = np.array([2e5, 5e5])
+            temp = np.array([350.0, 320.0])
+
+            batch = table.calc_batch("PT", pres, temp)
+            exact = self.fluid.update_many("PT", pres, temp)
+
+            table.calc("PH", pres[0], batch.H[0])
+
+            max_diff = max(abs((batch.H - exact.H) / exact.H).max(), abs((table.state_properties.T - temp[0]) / temp[0]))
+
+            if max_diff < tol:
+                self.pass_counter += 1
+                print("PASS - single composition LookUpTable is consistent with the \"{}\" engine".format(self.fluid.engine))
+            else:
+                self.fail_counter += 1
+                print("FAILED - single composition LookUpTable deviates by {:.2e} from the \"{}\" engine".format(max_diff, self.fluid.engine))
+        except:
+            self.fail_counter += 1
+            print("FAILED - single composition LookUpTable failed unexpectedly")
+
+    def test_adaptive_table(self, tolerance=5e-3, properties=("T", "Q")):
+        self.test_counter += 1
+
+        water = Fluid(["water", 1.0], engine="coolprop")
+
+        def pure_water_table(N1, N2):
+            table = LookUpTable(water.components, water.composition, InputSpec="PH")
+            table.set_composition(z=np.array([1.0]))
+            table.set_Input1(min=1e5, max=1e6, N=N1, log=True)
+            table.set_Input2(min=1e5, max=3.2e6, N=N2)
+            return table
+
+        try:
+            adaptive = pure_water_table(5, 9).generateAdaptiveTable(water, tolerance=tolerance, properties=properties,
+                                                                    max_iter=3, samples=400)
+
+            # double the uniform grid until it is at least as accurate as the adaptive grid
+            N1, N2 = 5, 9
+            while True:
+                table = pure_water_table(N1, N2)
+                table.generateTable(water)
+                uniform = table.interpolation_error(water, properties=properties, samples=400)
+
+                if all(uniform[prop]["max_relative_error"] <= adaptive[prop]["max_relative_error"] for prop in properties):
+                    break
+                N1, N2 = 2 * N1 - 1, 2 * N2 - 1
+
+            if adaptive["points"] < uniform["points"]:
+                self.pass_counter += 1
+                print("PASS - adaptive LookUpTable uses {} points, a uniform LookUpTable as accurate uses {} points".format(adaptive["points"], uniform["points"]))
+            else:
+                self.fail_counter += 1
+                print("FAILED - adaptive LookUpTable uses {} points, a uniform LookUpTable as accurate uses {} points".format(adaptive["points"], uniform["points"]))
+        except:
+            self.fail_counter += 1
+            print("FAILED - adaptive LookUpTable failed unexpectedly")
+
+
 if __name__ == "__main__":
     TESTS()
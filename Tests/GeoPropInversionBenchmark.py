@@ -0,0 +1,53 @@
+"""
+Benchmark of the GeoProp pressure-enthalpy calculations
+
+Compares the number of partition and property calculations per pressure-enthalpy calculation along the nodes of a
+heat exchanger (evaluated twice, as in successive iterations of a cycle), when the root searches start from the most
+recent solutions of the engine, against the previous behaviour of starting every search from a fixed temperature.
+"""
+import time
+import numpy as np
+
+from FluidProperties.fluid import Fluid
+
+
+def run(brine, ps, hs, seeded):
+    engine = brine.state.state
+    engine.solution_cache.clear()
+
+    start_time = time.time_ns()
+
+    for _ in range(2):
+        for p, h in zip(ps, hs):
+            if not seeded:
+                engine.solution_cache.solutions.clear()
+
+            brine.update("PH", p, h)
+
+    run_time = (time.time_ns() - start_time) * 1e-9
+
+    return run_time, engine.solution_cache.stats()["specs"]["PH"]
+
+
+if __name__ == "__main__":
+
+    N_nodes = 25
+
+    zH2O = 0.95
+    brine = Fluid(["water", zH2O, "carbondioxide", 1 - zH2O], engine="geoprop")
+
+    # the nodes of a heat exchanger cooling the brine, with a small pressure drop
+    ps = np.linspace(20e5, 19e5, N_nodes)
+    Ts = np.linspace(450, 340, N_nodes)
+
+    hs = []
+    for p, T in zip(ps, Ts):
+        brine.update("PT", p, T)
+        hs.append(brine.properties.H)
+
+    for name, seeded in [("before (fixed initial guess)", False), ("after (seeded from recent solutions)", True)]:
+
+        run_time, stats = run(brine, ps, hs, seeded)
+
+        print("{:40}| {:6.2f} s | iterations per PH calculation: {:5.2f} | fallbacks: {}".format(
+            name, run_time, stats["iterations_per_inversion"], stats["fallbacks"]))
@@ -0,0 +1,65 @@
+"""
+Benchmark of the GeoProp State calculations
+
+Compares the number of calc_PT and calc_Ph calls per second of the State, which keeps its partition and property
+models (and a scratch Fluid for the iterative solvers) for its whole lifetime, against the previous behaviour of
+constructing new partition and property models for every calculation.
+"""
+import time
+import numpy as np
+
+from GeoProp.Model.Databases import Comp
+from GeoProp.Model.Fluid import Fluid
+from GeoProp.Model.PartitionModel import Partition, PartitionModelOptions
+from GeoProp.Model.PropertyModel import PropertyModel, PropertyModelOptions
+from GeoProp.Model.State import State
+
+
+class PerCallState(State):
+    """
+    State which re-creates the partition and property models on every calculation (previous behaviour)
+    """
+
+    def calc_PT(self, fluid, P, T, out=None):
+        fluid = Partition(options=self.part_options).calc(fluid, P, T)
+
+        fluid = PropertyModel(options=self.prop_options).calc(fluid, P, T)
+
+        return fluid
+
+
+def calls_per_second(func, inputs):
+    start_time = time.time_ns()
+
+    for args in inputs:
+        func(*args)
+
+    run_time = time.time_ns() - start_time
+
+    return len(inputs) / (run_time * 1e-9)
+
+
+if __name__ == "__main__":
+
+    N_points = 50
+
+    part_opts = PartitionModelOptions()
+    part_opts.model = PartitionModelOptions.PartitionModels.SPYCHERPRUSS
+    prop_opts = PropertyModelOptions()
+
+    brine = Fluid([Comp.WATER, Comp.CARBONDIOXIDE], [0.95, 0.05])
+
+    P = 20e5
+    Ts = np.linspace(320, 450, N_points)
+
+    # target enthalpies for the P-h calculations
+    reference = State(part_options=part_opts, prop_options=prop_opts)
+    hs = [reference.calc_PT(brine, P, T).total.props["h"] for T in Ts]
+
+    for name, state in [("before (per call models)", PerCallState(part_options=part_opts, prop_options=prop_opts)),
+                        ("after (long-lived models)", State(part_options=part_opts, prop_options=prop_opts))]:
+
+        rate_PT = calls_per_second(state.calc_PT, [(brine, P, T) for T in Ts])
+        rate_Ph = calls_per_second(state.calc_Ph, [(brine, P, h) for h in hs])
+
+        print("{:30}| calc_PT: {:10.1f} calls/s | calc_Ph: {:10.1f} calls/s".format(name, rate_PT, rate_Ph))
@@ -0,0 +1,64 @@
+"""
+Benchmark of the import time of FluidProperties
+
+Compares importing FluidProperties, which registers the plugins of engines.json without importing them, against the
+previous behaviour of importing every plugin (and its dependencies, e.g. GeoProp, ThermoFun, Reaktoro or matplotlib)
+up front. Every import is timed in a fresh interpreter, as a worker process or a short run would see it.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+HEAVY_MODULES = ["CoolProp", "GeoProp.Model.Databases", "thermofun", "reaktoro", "matplotlib.pyplot"]
+
+LAZY = """
+import time
+start_time = time.perf_counter()
+import FluidProperties
+run_time = time.perf_counter() - start_time
+"""
+
+EAGER = """
+import importlib, time
+start_time = time.perf_counter()
+import FluidProperties
+for plugin in {plugins}:
+    importlib.import_module(plugin)
+run_time = time.perf_counter() - start_time
+"""
+
+REPORT = """
+import json, sys
+print(json.dumps([run_time, [name for name in {modules} if name in sys.modules]]))
+"""
+
+
+def import_time(script):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = os.environ | {"PYTHONPATH": root}
+
+    output = subprocess.run([sys.executable, "-c", script + REPORT.format(modules=HEAVY_MODULES)], cwd=root, env=env,
+                            capture_output=True, text=True, check=True).stdout
+
+    return json.loads(output.splitlines()[-1])
+
+
+if __name__ == "__main__":
+
+    N_runs = 5
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(root, "FluidProperties") + "\\engines.json") as file:
+        plugins = json.load(file)["plugins"]
+
+    for name, script in [("before (all plugins imported)", EAGER.format(plugins=plugins)),
+                         ("after (plugins imported on first use)", LAZY)]:
+
+        results = [import_time(script) for _ in range(N_runs)]
+        run_times = [run_time for run_time, modules in results]
+
+        print("{:40}| import: {:6.2f} s (min {:6.2f} s) | loaded: {}".format(name, np.median(run_times),
+                                                                            min(run_times), ", ".join(results[0][1])))
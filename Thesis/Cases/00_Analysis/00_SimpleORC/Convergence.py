@@ -1,16 +1,35 @@
 import json
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 import tikzplotlib
 from CoolProp.CoolProp import PropsSI
-
-with open("../../00_SimpleORC_ConvergencePlot/sensitivity_results.json", "r") as file:
-    results = json.load(file)
-
-fmin = np.array(results[0]["fmin"])
-fmax = np.array(results[0]["fmax"])
-favg = np.array(results[0]["favg"])
-gens = [i for i, f in enumerate(fmin)]
+from ORCptimization.results_store import ResultsStore
+
+study = "../../00_SimpleORC_ConvergencePlot/"
+
+if os.path.exists(study + "results.npz"):
+    store = ResultsStore(study + "results.npz")
+    individuals = store.read("individuals", columns=["generation", "F"], where={"case": 0})
+else:
+    individuals = {"generation": []}
+
+if len(individuals["generation"]):
+    gens = np.unique(individuals["generation"])
+    F = [individuals["F"][individuals["generation"] == gen, 0] for gen in gens]
+
+    fmin = np.array([min(f) for f in F])
+    fmax = np.array([max(f) for f in F])
+    favg = np.array([np.mean(f) for f in F])
+else:
+    # studies run before the results store only hold the convergence data of the sensitivity results
+    with open(study + "sensitivity_results.json", "r") as file:
+        results = json.load(file)
+
+    fmin = np.array(results[0]["fmin"])
+    fmax = np.array(results[0]["fmax"])
+    favg = np.array(results[0]["favg"])
+    gens = [i for i, f in enumerate(fmin)]
 fbest = min(fmin)
 
 
@@ -29,6 +29,7 @@ SensitivityParams = {
 
 Parameters = {
 "is Cycle regenerated"     : False,
+"Warm start"               : False,
 # "Hot fluid comp"           : ["water", 0.95, "carbondioxide", 0.05],
 # "Hot fluid engine"         : "geoprop",
 # "Hot fluid table path"     : "../propertyengine_plugins/LookUpTables/SuperDuperTable",
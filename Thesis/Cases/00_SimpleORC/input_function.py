@@ -10,6 +10,10 @@ Created on Thu Sep 28 14:38:12 2023
 from Thesis.PowerPlants.simple_binary_superheater import ORC as simpleORC
 from FluidProperties.fluid import Fluid
 from Simulator.streams import MaterialStream
+from Simulator.cycle import WarmStart
+
+# warm-start context shared by the cycles evaluated in this process, see Parameters["Warm start"]
+warm_start = WarmStart()
 
     
 #### optimization of a simple cycle
@@ -39,6 +43,9 @@ def init_cycle(Variables, Parameters):
     Cycle.condenser.deltaP_cold = Parameters["Condenser dP"]
     Cycle.coolingpump.eta_isentropic = Parameters["Cooling Pump IsenEff"]
 
+    if Parameters.get("Warm start", False):
+        Cycle.set_warm_start(warm_start)
+
     hot_fluid = Fluid(Parameters["Hot fluid comp"], engine=Parameters["Hot fluid engine"])
     hot_fluid_stream = MaterialStream(hot_fluid, m=Parameters["Hot fluid mass flow"])
     hot_fluid_stream.update(Parameters["Hot fluid input spec"], Parameters["Hot fluid input1"], Parameters["Hot fluid input2"])
@@ -88,23 +95,15 @@ def PostProcessing(Variables, Parameters):
 
     cycle.calc(*variables_)
 
-    M_profile = []
-    W_profile = []
-    PC_profile = []
-    C_profile = []
-    NPV_profile = []
-    LCOE_profile = []
-
     Parameters["TestMassRates"].append(Parameters["Hot fluid mass flow"])
-    for m in Parameters["TestMassRates"]:
-        cycle.update_mass_rate(m)
-
-        M_profile.append(m * 1)
-        W_profile.append(cycle.net_power * 1)
-        PC_profile.append(cycle.primary_equipment_cost * 1)
-        C_profile.append(cycle.cost * 1)
-        NPV_profile.append(cycle.NPV * 1)
-        LCOE_profile.append(cycle.LCOE * 1)
+    scaled = cycle.scale_to(Parameters["TestMassRates"])
+
+    M_profile = scaled["m"].tolist()
+    W_profile = scaled["net_power"].tolist()
+    PC_profile = scaled["primary_equipment_cost"].tolist()
+    C_profile = scaled["cost"].tolist()
+    NPV_profile = scaled["NPV"].tolist()
+    LCOE_profile = scaled["LCOE"].tolist()
 
 
     TQ_plot = cycle.plot_TQ(False)
@@ -1,8 +1,10 @@
+import math
 import Simulator
 from Simulator.cycle import BinaryCycle
 import matplotlib.pyplot as plt
 from scipy.optimize import root_scalar, minimize_scalar, minimize, Bounds
 from FluidProperties import Tref
+from FluidProperties.PVT import AbstractState
 
 """
 
@@ -44,9 +46,13 @@ class ORC(BinaryCycle):
         self.drilling_costs = 0
 
     def _calc_Tevap(self, P):
-        temp_stream = self.wfluid.copy()
-        temp_stream.update("PQ", P, 0)
-        Tevap = temp_stream.properties.T
+        curve = self.wfluid.fluid.saturation_curve()
+        Tevap = curve.Tsat(P) if curve is not None else math.nan
+
+        if math.isnan(Tevap):
+            temp_stream = self.wfluid.copy()
+            temp_stream.update("PQ", P, 0)
+            Tevap = temp_stream.properties.T
 
         if self.Tmax < Tevap + self.deltaT_superheat:
             msg = "The maximum temperature, {:.2f} K, is below the working fluid's mininimum superheated temperature, {:.2f} K".format(
@@ -140,6 +146,46 @@ class ORC(BinaryCycle):
                                   Outlet_hot=WF_pump_in)
         WF_stream, self.coolant_out = self.condenser.calc()
 
+    def __warm_start_key(self):
+        wf = self.wfluid.fluid
+        gf = self.geofluid.fluid
+
+        return (tuple(wf.components), tuple(wf.composition), tuple(gf.components), tuple(gf.composition),
+                self.geofluid.properties.P, self.geofluid.properties.H, self.recuperated)
+
+    def __search_PHE(self, R_search, cons_sup, cons_evap, cons_preh, geofluid, WF_preh_in, WF_turb_in):
+
+        dTs = [self.preheater.deltaT_pinch, self.evaporator.deltaT_pinch, self.superheater.deltaT_pinch]
+        max_dT = max(dTs)
+        self.temp_HX.deltaP_cold = self.preheater.deltaP_cold + self.evaporator.deltaP_cold + self.superheater.deltaP_cold
+        self.temp_HX.deltaP_hot = self.preheater.deltaP_hot + self.evaporator.deltaP_hot + self.superheater.deltaP_hot
+
+        # calculate Rmax
+        self.temp_HX.deltaT_pinch = min(dTs)
+        self.temp_HX.set_inputs(MassRatio=-1, Inlet_hot=geofluid, Inlet_cold=WF_preh_in, Outlet_cold=WF_turb_in)
+        temp_GF_out, temp_WF_out = self.temp_HX.calc()
+        Rmax = self.temp_HX.MassRatio
+
+        self.temp_HX.deltaT_pinch = max(dTs)
+        self.temp_HX.set_inputs(MassRatio=-1, Inlet_hot=geofluid, Inlet_cold=WF_preh_in, Outlet_cold=WF_turb_in)
+        temp_GF_out, temp_WF_out = self.temp_HX.calc()
+        Rmin = self.temp_HX.MassRatio
+
+        error = 1
+        iter = 0
+        while error > 0 and iter < 25:
+            R_search(Rmin)
+
+            if cons_sup(0) > 0 and cons_evap(0) > 0 and cons_preh(0) > 0:
+                error = -1
+            else:
+                Rmax = Rmin
+                Rmin *= 0.99
+
+            iter += 1
+
+        return minimize_scalar(R_search, method="bounded", bounds=[Rmin, Rmax], options={"xatol": 1e-4, "maxiter": 25})
+
     def __calc_PHE(self, WF_preh_in, WF_evap_in, WF_sup_in, WF_turb_in):
 
         def R_search(R):
@@ -185,6 +231,26 @@ class ORC(BinaryCycle):
         def cons_preh(x):
             return self.preheater.min_deltaT - self.preheater.deltaT_pinch
 
+        def warm_search(Rlo, Rhi):
+            # the optimum lies close to the largest feasible mass ratio, which must be within the seeded bracket
+            try:
+                R_search(Rhi)
+                if cons_sup(0) > 0 and cons_evap(0) > 0 and cons_preh(0) > 0:
+                    return None
+
+                R_search(Rlo)
+                if not (cons_sup(0) > 0 and cons_evap(0) > 0 and cons_preh(0) > 0):
+                    return None
+
+                result = minimize_scalar(R_search, method="bounded", bounds=[Rlo, Rhi], options={"xatol": 1e-4, "maxiter": 25})
+            except ValueError:
+                return None
+
+            if Rhi - result.x < 10 * 1e-4:
+                return None
+
+            return result
+
         # switch the geofluid to the interpolation fluid
         geofluid = self.geofluid.copy()
         if self.interpolation:
@@ -195,36 +261,19 @@ class ORC(BinaryCycle):
 
             geofluid = temp_geo
 
-        dTs = [self.preheater.deltaT_pinch, self.evaporator.deltaT_pinch, self.superheater.deltaT_pinch]
-        max_dT = max(dTs)
-        self.temp_HX.deltaP_cold = self.preheater.deltaP_cold + self.evaporator.deltaP_cold + self.superheater.deltaP_cold
-        self.temp_HX.deltaP_hot = self.preheater.deltaP_hot + self.evaporator.deltaP_hot + self.superheater.deltaP_hot
+        engine_calls = AbstractState.engine_calls
+        key = self.__warm_start_key()
 
-        # calculate Rmax
-        self.temp_HX.deltaT_pinch = min(dTs)
-        self.temp_HX.set_inputs(MassRatio=-1, Inlet_hot=geofluid, Inlet_cold=WF_preh_in, Outlet_cold=WF_turb_in)
-        temp_GF_out, temp_WF_out = self.temp_HX.calc()
-        Rmax = self.temp_HX.MassRatio
+        bracket = self.warm_start.bracket(key) if self.warm_start is not None else None
+        result = warm_search(*bracket) if bracket is not None else None
+        converged = result is not None
 
-        self.temp_HX.deltaT_pinch = max(dTs)
-        self.temp_HX.set_inputs(MassRatio=-1, Inlet_hot=geofluid, Inlet_cold=WF_preh_in, Outlet_cold=WF_turb_in)
-        temp_GF_out, temp_WF_out = self.temp_HX.calc()
-        Rmin = self.temp_HX.MassRatio
+        if not converged:
+            result = self.__search_PHE(R_search, cons_sup, cons_evap, cons_preh, geofluid, WF_preh_in, WF_turb_in)
 
-        error = 1
-        iter = 0
-        while error > 0 and iter < 25:
-            R_search(Rmin)
-
-            if cons_sup(0) > 0 and cons_evap(0) > 0 and cons_preh(0) > 0:
-                error = -1
-            else:
-                Rmax = Rmin
-                Rmin *= 0.99
-
-            iter += 1
-
-        result = minimize_scalar(R_search, method="bounded", bounds=[Rmin, Rmax], options={"xatol": 1e-4, "maxiter": 25})
+        if self.warm_start is not None:
+            self.warm_start.record(AbstractState.engine_calls - engine_calls, bracket is not None, converged)
+            self.warm_start.store(key, result.x)
 
         GF_out = self.preheater.outlet[0].copy()
 
@@ -237,6 +286,12 @@ class ORC(BinaryCycle):
 
     def update_mass_rate(self, m):
 
+        self._rescale(m)
+
+        self.calc_economics()
+
+    def _rescale(self, m):
+
         self.geofluid._update_quantity(m)
         self.geofluid_in._update_quantity(m)
         self.geofluid_out._update_quantity(m)
@@ -261,8 +316,6 @@ class ORC(BinaryCycle):
         self.__calc_performance()
         self.__calc_cost()
 
-        self.calc_economics()
-
     def __calc_mass_rates(self):
 
         # updating the component mass rates
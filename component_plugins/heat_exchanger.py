@@ -4,7 +4,7 @@ import numpy as np
 import scipy
 from scipy.optimize import root_scalar
 import matplotlib.pyplot as plt
-from typing import NoReturn, Optional
+from typing import Callable, NoReturn, Optional
 
 import Simulator
 from .base_component import Component
@@ -70,6 +70,8 @@ class heat_exchanger(Component):
         the pressure profile
     Duty_profile: list[np.array, np.array]
         the duty profile
+    profile_states: list[dict[str, np.array] | None, dict[str, np.array] | None]
+        the states (P, H, T, S, Q and D) of the hot and cold profiles from the last sweep through the heat exchanger
     Tambient: float
         the ambient temperature - this serves as a minimum temperature
     Tmaximum: float
@@ -96,6 +98,8 @@ class heat_exchanger(Component):
 
     # TODO the Duty profiled for the hot streams should be reversed? For now it is convenient to check that everything is working
 
+    profile_properties = ["T", "S", "Q", "D"]  # the properties kept for each point of the profiles
+
     def __init__(self,
                  deltaT_pinch: Optional[float]=5.0,
                  deltaP_hot: Optional[float]=1e4,
@@ -153,6 +157,8 @@ class heat_exchanger(Component):
         self.P_profile = [np.empty(1), np.empty(1)]
         self.Duty_profile = [np.empty(1), np.empty(1)]
 
+        self.profile_states = [None, None]
+
         self.min_deltaT = -1
 
         self.Tambient = Tambient
@@ -475,20 +481,63 @@ class heat_exchanger(Component):
 
         self.Duty_profile = [-(H_H - H_H[0]), (H_C - H_C[0]) * self.MassRatio]
 
-        cold = self.stream_in_C.copy()
-        hot = self.stream_in_H.copy()
+        # only the profiles which were interpolated during the pinch search still need to be evaluated
+        for i, stream in enumerate([self.stream_in_H, self.stream_in_C]):
+            states = self.profile_states[i]
 
-        self.S_profile = [np.zeros(self.N), np.zeros(self.N)]
-        self.Q_profile = [np.zeros(self.N), np.zeros(self.N)]
-        for i, p in enumerate(self.P_profile[0]):
-            hot.update("PH", self.P_profile[0][i], self.H_profile[0][i])
-            cold.update("PH", self.P_profile[1][i], self.H_profile[1][i])
+            if states is None or not (np.array_equal(states["P"], self.P_profile[i]) and np.array_equal(states["H"], self.H_profile[i])):
+                self.profile_states[i] = self.__sweep(stream, self.P_profile[i], self.H_profile[i])
 
-            self.S_profile[0][i] = hot.properties.S
-            self.S_profile[1][i] = cold.properties.S
+        self.S_profile = [self.profile_states[0]["S"], self.profile_states[1]["S"]]
+        self.Q_profile = [self.profile_states[0]["Q"], self.profile_states[1]["Q"]]
+        self.D_profile = [self.profile_states[0]["D"], self.profile_states[1]["D"]]
+
+    def __sweep(self, stream: "MaterialStream", P: np.array, H: np.array) -> dict[str, np.array]:
+        """
+        Helper function to evaluate the states along a profile through the heat exchanger. The states are calculated
+        in a single batch, falling back to a state by state calculation if the batch fails for any state (so that the
+        engine's error is raised as before).
+
+        Parameters
+        ----------
+        stream: MaterialStream
+            the hot or cold stream
+        P: np.array
+            the pressure profile
+        H: np.array
+            the specific enthalpy profile
+
+        Returns
+        -------
+        dict[str, np.array]
+            the pressure, specific enthalpy and "profile_properties" of each state
+        """
 
-            self.Q_profile[0][i] = hot.properties.Q
-            self.Q_profile[1][i] = cold.properties.Q
+        states = {"P": P, "H": H}
+
+        try:
+            # on a copy, so that the state of the stream's engine is left unchanged
+            batch = stream.fluid.copy().update_many("PH", P, H)
+
+            if not np.isnan(batch.T).any():
+                for prop in self.profile_properties:
+                    states[prop] = np.asarray(getattr(batch, prop), dtype=float)
+
+                return states
+        except ValueError:
+            pass
+
+        for prop in self.profile_properties:
+            states[prop] = np.zeros(len(P))
+
+        temp = stream.copy()
+        for i, p in enumerate(P):
+            temp.update("PH", p, H[i])
+
+            for prop in self.profile_properties:
+                states[prop][i] = getattr(temp.properties, prop)
+
+        return states
 
     def __calc_R(self) -> NoReturn:
         """
@@ -644,21 +693,15 @@ class heat_exchanger(Component):
         # calculate the profiles
         P_H = np.linspace(self.stream_out_H.properties.P, self.stream_in_H.properties.P, self.N)
         H_H = np.linspace(self.stream_out_H.properties.H, self.stream_in_H.properties.H, self.N)
-        T_H = np.zeros(self.N)
 
-        temp_hot = self.stream_out_H.copy()
-        for i, p in enumerate(P_H):
-            temp_hot.update("PH", p, H_H[i])
-            T_H[i] = temp_hot.properties.T
+        self.profile_states[0] = self.__sweep(self.stream_out_H, P_H, H_H)
+        T_H = self.profile_states[0]["T"]
 
         P_C = np.linspace(self.stream_in_C.properties.P, self.stream_out_C.properties.P, self.N)
         H_C = np.linspace(self.stream_in_C.properties.H, self.stream_out_C.properties.H, self.N)
-        T_C = np.zeros(self.N)
 
-        temp_cold = self.stream_out_C.copy()
-        for i, p in enumerate(P_C):
-            temp_cold.update("PH", p, H_C[i])
-            T_C[i] = temp_cold.properties.T
+        self.profile_states[1] = self.__sweep(self.stream_out_C, P_C, H_C)
+        T_C = self.profile_states[1]["T"]
 
         self.P_profile = [P_H, P_C]
         self.H_profile = [H_H, H_C]
@@ -721,14 +764,10 @@ class heat_exchanger(Component):
 
             return self.__calc_PP2()
 
-        for i, DQ in enumerate(DQ_line):
-            deltaT_pinch_error = ___calc_PP(DQ)
-            if deltaT_pinch_error > 0:  # The error starts with negative sign and as soon as it switches to positive the calculated temperature distribution provides a DTpp which is close (actually already smaller) to the desired value of DTpp.
-
-                solution = root_scalar(___calc_PP, method="brentq", bracket=[DQ_line[i - 1], DQ_line[i]])
-                DQ_pinch = solution.root
+        def ___profile_ends(deltaQ) -> tuple[tuple, tuple]:
+            return (P_out_H, P_in_H, h_in_H - deltaQ, h_in_H), (P_out_C, P_in_C, h_out_C - deltaQ / self.MassRatio, h_out_C)
 
-                break
+        DQ_pinch = self.__solve_PP(___calc_PP, ___profile_ends, DQ_line)
 
     def __calc_Toh_Toc(self) -> NoReturn:
         """
@@ -780,14 +819,10 @@ class heat_exchanger(Component):
 
             return self.__calc_PP2()
 
-        for i, DQ in enumerate(DQ_line):
-            deltaT_pinch_error = ___calc_PP(DQ)
-            if deltaT_pinch_error > 0:  # The error starts with negative sign and as soon as it switches to positive the calculated temperature distribution provides a DTpp which is close (actually already smaller) to the desired value of DTpp.
+        def ___profile_ends(deltaQ) -> tuple[tuple, tuple]:
+            return (P_out_H, P_in_H, h_in_H - deltaQ, h_in_H), (P_out_C, P_in_C, h_in_C, h_in_C + deltaQ / self.MassRatio)
 
-                solution = root_scalar(___calc_PP, method="brentq", bracket=[DQ_line[i - 1], DQ_line[i]])
-                DQ_pinch = solution.root
-
-                break
+        DQ_pinch = self.__solve_PP(___calc_PP, ___profile_ends, DQ_line)
 
     def __calc_R_Toc(self) -> NoReturn:
         """
@@ -815,10 +850,8 @@ class heat_exchanger(Component):
         # the profile is already defined for the hot stream
         self.P_profile[0] = np.linspace(P_out_H, P_in_H, self.N)
         self.H_profile[0] = np.linspace(h_out_H, h_in_H, self.N)
-        self.T_profile[0] = np.zeros(self.N)
-        for i, p in enumerate(self.P_profile[0]):
-            temp_hot_out.update("PH", p, self.H_profile[0][i])
-            self.T_profile[0][i] = temp_hot_out.properties.T
+        self.profile_states[0] = self.__sweep(temp_hot_out, self.P_profile[0], self.H_profile[0])
+        self.T_profile[0] = self.profile_states[0]["T"]
 
         # calculate the maximum enthalpy of the cold stream (i.e. T_out_C = T_in_H)
         temp_cold.update("PT", P_out_C, T_in_H)
@@ -845,14 +878,10 @@ class heat_exchanger(Component):
 
             return self.__calc_PP2()
 
-        for i, DH in enumerate(DH_line):
-            deltaT_pinch_error = ___calc_PP(DH)
-            if deltaT_pinch_error > 0:  # The error starts with negative sign and as soon as it switches to positive the calculated temperature distribution provides a DTpp which is close (actually already smaller) to the desired value of DTpp.
+        def ___profile_ends(deltaH_C) -> tuple[tuple, tuple]:
+            return (P_out_H, P_in_H, h_out_H, h_in_H), (P_out_C, P_in_C, h_in_C, h_in_C + deltaH_C)
 
-                solution = root_scalar(___calc_PP, method="brentq", bracket=[DH_line[i - 1], DH_line[i]])
-                DH = solution.root
-
-                break
+        DH = self.__solve_PP(___calc_PP, ___profile_ends, DH_line)
 
         if DH == 0.0:
             raise ValueError("Heat Exchanger has zero duty")
@@ -884,10 +913,8 @@ class heat_exchanger(Component):
         # the profile is already defined for the cold stream
         self.P_profile[1] = np.linspace(P_in_C, P_out_C, self.N)
         self.H_profile[1] = np.linspace(h_in_C, h_out_C, self.N)
-        self.T_profile[1] = np.zeros(self.N)
-        for i, p in enumerate(self.P_profile[1]):
-            temp_cold_out.update("PH", p, self.H_profile[1][i])
-            self.T_profile[1][i] = temp_cold_out.properties.T
+        self.profile_states[1] = self.__sweep(temp_cold_out, self.P_profile[1], self.H_profile[1])
+        self.T_profile[1] = self.profile_states[1]["T"]
 
         # calculate the maximum enthalpy of the cold stream (i.e. T_out_C = T_in_H)
         temp_hot.update("PT", P_out_H, T_in_C)
@@ -914,14 +941,10 @@ class heat_exchanger(Component):
 
             return error
 
-        for i, DH in enumerate(DH_line):
-            deltaT_pinch_error = ___calc_PP(DH)
-            if deltaT_pinch_error > 0:  # The error starts with negative sign and as soon as it switches to positive the calculated temperature distribution provides a DTpp which is close (actually already smaller) to the desired value of DTpp.
-
-                solution = root_scalar(___calc_PP, method="brentq", bracket=[DH_line[i - 1], DH_line[i]])
-                DH_pinch = solution.root
+        def ___profile_ends(deltaH) -> tuple[tuple, tuple]:
+            return (P_out_H, P_in_H, h_in_H - deltaH, h_in_H), (P_out_C, P_in_C, h_in_C, h_out_C)
 
-                break
+        DH_pinch = self.__solve_PP(___calc_PP, ___profile_ends, DH_line)
 
     def __calc_R_Tic(self) -> NoReturn:
 
@@ -951,10 +974,8 @@ class heat_exchanger(Component):
         temp_hot = self.stream_in_H.copy()
         self.P_profile[0] = np.linspace(P_out_H, P_in_H, self.N)
         self.H_profile[0] = np.linspace(h_out_H, h_in_H, self.N)
-        self.T_profile[0] = np.zeros(self.N)
-        for i, p in enumerate(self.P_profile[0]):
-            temp_hot.update("PH", p, self.H_profile[0][i])
-            self.T_profile[0][i] = temp_hot.properties.T
+        self.profile_states[0] = self.__sweep(temp_hot, self.P_profile[0], self.H_profile[0])
+        self.T_profile[0] = self.profile_states[0]["T"]
 
         # self.Duty_profile = [H_H[0] - H_H, 0]
 
@@ -981,14 +1002,10 @@ class heat_exchanger(Component):
 
             return self.__calc_PP2()
 
-        for i, DH in enumerate(DH_line):
-            deltaT_pinch_error = ___calc_PP(DH)
-            if deltaT_pinch_error > 0:  # The error starts with negative sign and as soon as it switches to positive the calculated temperature distribution provides a DTpp which is close (actually already smaller) to the desired value of DTpp.
-
-                solution = root_scalar(___calc_PP, method="brentq", bracket=[DH_line[i - 1], DH_line[i]])
-                DH_pinch = solution.root
+        def ___profile_ends(deltaH_C) -> tuple[tuple, tuple]:
+            return (P_out_H, P_in_H, h_out_H, h_in_H), (P_out_C, P_in_C, h_out_C - deltaH_C, h_out_C)
 
-                break
+        DH_pinch = self.__solve_PP(___calc_PP, ___profile_ends, DH_line)
 
     def __calc_R_Tih(self) -> NoReturn:
 
@@ -1017,10 +1034,8 @@ class heat_exchanger(Component):
         # the profile is already defined for the cold stream
         self.P_profile[1] = np.linspace(P_in_C, P_out_C, self.N)
         self.H_profile[1] = np.linspace(h_in_C, h_out_C, self.N)
-        self.T_profile[1] = np.zeros(self.N)
-        for i, p in enumerate(self.P_profile[1]):
-            temp_cold_out.update("PH", p, self.H_profile[1][i])
-            self.T_profile[1][i] = temp_cold_out.properties.T
+        self.profile_states[1] = self.__sweep(temp_cold_out, self.P_profile[1], self.H_profile[1])
+        self.T_profile[1] = self.profile_states[1]["T"]
 
         # calculate the maximum enthalpy of the cold stream (i.e. T_out_C = T_in_H)
         temp_hot.update("PT", P_in_C, self.Tmaximum)
@@ -1045,14 +1060,10 @@ class heat_exchanger(Component):
 
             return self.__calc_PP2()
 
-        for i, DH in enumerate(DH_line):
-            deltaT_pinch_error = ___calc_PP(DH)
-            if deltaT_pinch_error > 0:  # The error starts with negative sign and as soon as it switches to positive the calculated temperature distribution provides a DTpp which is close (actually already smaller) to the desired value of DTpp.
-
-                solution = root_scalar(___calc_PP, method="brentq", bracket=[DH_line[i - 1], DH_line[i]])
-                DH_pinch = solution.root
+        def ___profile_ends(deltaH_H) -> tuple[tuple, tuple]:
+            return (P_out_H, P_in_H, h_out_H, h_out_H + deltaH_H), (P_out_C, P_in_C, h_in_C, h_out_C)
 
-                break
+        DH_pinch = self.__solve_PP(___calc_PP, ___profile_ends, DH_line)
 
     def __calc_Tih_Toc(self):
 
@@ -1109,6 +1120,127 @@ class heat_exchanger(Component):
 
         return result
 
+    def __solve_PP(self,
+                   calc_PP: Callable[[float], float],
+                   profile_ends: Callable[[float], tuple[tuple, tuple]],
+                   DQ_line: np.array) -> float:
+        """
+        Helper function to solve for the pinch point temperature approach. Rather than evaluating the full profiles
+        (i.e. updating the streams) for every iteration, the temperature approach of all nodes of the composite T-Q
+        curves is evaluated from the interpolation tables only, and the root of the approach at the limiting node is
+        found for the same bracket as before. The full profiles are then evaluated once at the solution to confirm it.
+        If that fails, the full profiles are scanned along DQ_line and the root is found with brentq, as before.
+
+        Parameters
+        ----------
+        calc_PP: Callable[[float], float]
+            the pinch point error for the free variable, updating the streams and the full profiles
+        profile_ends: Callable[[float], tuple[tuple, tuple]]
+            the pressure and specific enthalpy at the ends of the hot and cold profiles for the free variable, i.e.
+            (P1, P2, h1, h2) for each as passed to __interp_PH_line by __calc_PP2
+        DQ_line: np.array
+            the values of the free variable to be scanned
+
+        Returns
+        -------
+        float
+            the value of the free variable at the pinch point, or the last value of DQ_line if there is none
+        """
+
+        try:
+            errors = [self.__calc_PP_nodes(profile_ends, DQ) for DQ in DQ_line]
+            crossing = [i for i, error in enumerate(errors) if min(error) > 0]
+
+            i = crossing[0] if len(crossing) > 0 else None
+
+            if i is None:
+                j = None
+            elif i > 0:
+                j = i - 1
+            else:
+                # the approach is already positive at the first value, as in the scan below the root is then bracketed
+                # by the last and first values
+                j = len(DQ_line) - 1
+
+            if j is not None and min(errors[j]) < 0:
+
+                # the limiting node may change within the bracket, so the minimum over all nodes is solved for
+                solution = root_scalar(lambda DQ: min(self.__calc_PP_nodes(profile_ends, DQ)), method="brentq", bracket=[DQ_line[j], DQ_line[i]])
+
+                if abs(calc_PP(solution.root)) < 1e-6:
+                    return solution.root
+        except ValueError:
+            # the interpolated approach has no root within the bracket, or a state cannot be calculated
+            pass
+
+        for i, DQ in enumerate(DQ_line):
+            deltaT_pinch_error = calc_PP(DQ)
+            if deltaT_pinch_error > 0:  # The error starts with negative sign and as soon as it switches to positive the calculated temperature distribution provides a DTpp which is close (actually already smaller) to the desired value of DTpp.
+
+                solution = root_scalar(calc_PP, method="brentq", bracket=[DQ_line[i - 1], DQ_line[i]])
+
+                return solution.root
+
+        return DQ
+
+    def __calc_PP_nodes(self, profile_ends: Callable[[float], tuple[tuple, tuple]], DQ: float) -> np.array:
+        """
+        Helper function to calculate the pinch point error of every node of the profiles from the interpolation tables,
+        i.e. without updating the streams
+
+        Parameters
+        ----------
+        profile_ends: Callable[[float], tuple[tuple, tuple]]
+            the pressure and specific enthalpy at the ends of the hot and cold profiles for the free variable
+        DQ: float
+            the value of the free variable
+
+        Returns
+        -------
+        np.array
+        """
+
+        hot, cold = profile_ends(DQ)
+
+        if self._T_PHtable_H is None:
+            T_H = self.T_profile[0]
+        else:
+            T_H = self.__interp_PH_nodes(*hot, self._T_PHtable_H)
+
+        if self._T_PHtable_C is None:
+            T_C = self.T_profile[1]
+        else:
+            T_C = self.__interp_PH_nodes(*cold, self._T_PHtable_C)
+
+        return (T_H - T_C - 0.995*self.deltaT_pinch) / (0.995*self.deltaT_pinch)
+
+    def __interp_PH_nodes(self, P1: float, P2: float, h1: float, h2: float, table: np.array) -> np.array:
+        """
+        Helper function to interpolate the temperature at all nodes of a profile in one call
+
+        Parameters
+        ----------
+        P1: float
+            pressure at point 1, in Pa
+        P2: float
+            pressure at point 2, in Pa
+        h1: float
+            specific enthalpy at point 1, in J/kg
+        h2: float
+            specific enthalpy at point 2, in J/kg
+        table: np.array
+            the interpolation table
+
+        Returns
+        -------
+        np.array
+        """
+
+        P = np.linspace(P1, P2, self.N, endpoint=True)
+        h = np.linspace(h1, h2, self.N, endpoint=True)
+
+        return table.ev(P, h)
+
     def __generate_splines(self,
                           Pmin: float,
                           Pmax: float,
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from typing import NoReturn
 from .base_component import Component
 from Simulator import factory, Tref
@@ -35,6 +36,9 @@ class multistage_compression(Component):
         self.Tmax = 273.15 + 200  # the maximum outlet temperature
         self.T_intercool = 273.15 + 25
 
+        self.stage_cache = OrderedDict()  # stage outlet and intercooled states, see __stage and __intercool
+        self.cache_size = 256
+
         self.delta_h = 0.0
         self.delta_s = 0.0
 
@@ -84,49 +88,31 @@ class multistage_compression(Component):
             the entropy change is negative
 
         """
-        Tout = 1000
-
-        if self.findN:
-            n = 0
-        else:
-            n = self.N-1
 
         P_in = self.inlet.properties.P
         P_out = self.Pout
 
-        while Tout > self.Tmax and n<10:
-            n += 1
-            Ps = np.logspace(math.log10(P_in), math.log10(P_out), n + 1)
-            temp_stream = self.inlet.copy()
-            Q = 0
-            W = 0
-            pwr = 0
-            for i in range(n):
-                self.pump.set_inputs(temp_stream, Ps[i + 1])
-                try:
-                    temp_stream = self.pump.calc()
-                except:
-                    if self.findN:
-                        Tout = self.Tmax + 1
-                        break
-                    else:
-                        msg = "The multistage compression failed to calculate - this is likely because the outlet temperature is too high. Consider additional stages or cooling"
-                        raise ValueError(msg)
-                Tout = temp_stream.properties.T
-                W += self.pump.work
-                pwr += self.pump.power_elec
-
-                if i + 1 != n:
-                    h1 = temp_stream.properties.H
-                    temp_stream.update("PT", temp_stream.properties.P, self.T_intercool)
-                    h2 = temp_stream.properties.H
-                    Q += h1 - h2
-
-            # Tout = temp_stream.properties.T
+        if self.findN:
+            n = self.__find_N(P_in, P_out)
+        else:
+            n = self.N
 
-            if self.findN is False:
+        while True:
+            try:
+                temp_stream, W, pwr, Q = self.__calc_stages(n, P_in, P_out)
+                Tout = temp_stream.properties.T
+            except:
+                if self.findN:
+                    Tout = self.Tmax + 1
+                else:
+                    msg = "The multistage compression failed to calculate - this is likely because the outlet temperature is too high. Consider additional stages or cooling"
+                    raise ValueError(msg)
+
+            if self.findN is False or Tout <= self.Tmax or n >= 10:
                 break
 
+            n += 1
+
         if Tout > self.Tmax:
             msg = "The multistage_compression could not find a solution with less than 10 stages"
             raise ValueError(msg)
@@ -144,6 +130,206 @@ class multistage_compression(Component):
 
         return temp_stream
 
+    def __find_N(self, P_in: float, P_out: float) -> int:
+        """
+        Helper function to find the smallest number of stages for which the outlet temperature of the last stage does
+        not exceed the maximum temperature. The number of stages is extrapolated from the single stage compression,
+        assuming T_out / T_in = (P_out / P_in) ^ m, and corrected by evaluating the last stage only.
+
+        Parameters
+        ----------
+        P_in: float
+            the inlet pressure, in Pa
+        P_out: float
+            the outlet pressure, in Pa
+
+        Returns
+        -------
+        int
+        """
+
+        Tout = self.__calc_Tout(1, P_in, P_out)
+        if Tout <= self.Tmax:
+            return 1
+
+        try:
+            m = math.log(Tout / self.inlet.properties.T) / math.log(P_out / P_in)
+            n = math.ceil(m * math.log(P_out / P_in) / math.log(self.Tmax / self.T_intercool))
+            n = min(max(n, 2), 10)
+        except:
+            n = 2
+
+        # the outlet temperature of the last stage decreases with the number of stages
+        while n < 10 and self.__calc_Tout(n, P_in, P_out) > self.Tmax:
+            n += 1
+
+        while n > 2 and self.__calc_Tout(n - 1, P_in, P_out) <= self.Tmax:
+            n -= 1
+
+        return n
+
+    def __calc_Tout(self, n: int, P_in: float, P_out: float) -> float:
+        """
+        Helper function to calculate the outlet temperature of the last stage. All but the first stage start from the
+        intercooling temperature, so that only the last stage needs to be calculated
+
+        Parameters
+        ----------
+        n: int
+            the number of stages
+        P_in: float
+            the inlet pressure, in Pa
+        P_out: float
+            the outlet pressure, in Pa
+
+        Returns
+        -------
+        float
+            the outlet temperature, in K. Infinite if the stage cannot be calculated
+        """
+
+        Ps = np.logspace(math.log10(P_in), math.log10(P_out), n + 1)
+
+        try:
+            if n == 1:
+                temp_stream = self.inlet
+            else:
+                temp_stream = self.__intercool(self.inlet, Ps[n - 1])
+
+            temp_stream, W, pwr = self.__stage(temp_stream, Ps[n])
+        except:
+            return math.inf
+
+        return temp_stream.properties.T
+
+    def __calc_stages(self, n: int, P_in: float, P_out: float) -> tuple["MaterialStream", float, float, float]:
+        """
+        Helper function to calculate the compression with n intercooled stages
+
+        Parameters
+        ----------
+        n: int
+            the number of stages
+        P_in: float
+            the inlet pressure, in Pa
+        P_out: float
+            the outlet pressure, in Pa
+
+        Returns
+        -------
+        tuple[MaterialStream, float, float, float]
+            the outlet stream, the work, the electrical power and the specific intercooling duty
+        """
+
+        Ps = np.logspace(math.log10(P_in), math.log10(P_out), n + 1)
+
+        temp_stream = self.inlet
+        Q = 0
+        W = 0
+        pwr = 0
+        for i in range(n):
+            if i != 0:
+                h1 = temp_stream.properties.H
+                temp_stream = self.__intercool(temp_stream, Ps[i])
+                h2 = temp_stream.properties.H
+                Q += h1 - h2
+
+            temp_stream, work, power = self.__stage(temp_stream, Ps[i + 1])
+            W += work
+            pwr += power
+
+        return temp_stream, W, pwr, Q
+
+    def __stage(self, stream: "MaterialStream", Pout: float) -> tuple["MaterialStream", float, float]:
+        """
+        Helper function to calculate a single compression stage. The results are cached on the inlet state and the
+        outlet pressure
+
+        Parameters
+        ----------
+        stream: MaterialStream
+            the stage inlet stream
+        Pout: float
+            the stage outlet pressure, in Pa
+
+        Returns
+        -------
+        tuple[MaterialStream, float, float]
+            the outlet stream, the work and the electrical power
+
+        Raises
+        ------
+        ValueError
+            the stage cannot be calculated
+        """
+
+        # the specific enthalpy distinguishes two-phase inlet states
+        key = ("stage", tuple(stream.fluid.composition), stream.m,
+               stream.properties.P, Pout, stream.properties.T, stream.properties.H)
+
+        if key not in self.stage_cache:
+            self.pump.set_inputs(stream, Pout)
+            try:
+                outlet = self.pump.calc()
+                self.__cache(key, (outlet, self.pump.work, self.pump.power_elec))
+            except:
+                self.__cache(key, None)
+
+        result = self.stage_cache[key]
+        if result is None:
+            msg = "\nThe compression stage from {:.2e} Pa to {:.2e} Pa could not be calculated".format(stream.properties.P, Pout)
+            raise ValueError(msg)
+
+        outlet, work, power = result
+
+        return outlet.copy(), work, power
+
+    def __intercool(self, stream: "MaterialStream", P: float) -> "MaterialStream":
+        """
+        Helper function to calculate the intercooled state. The results are cached on the pressure
+
+        Parameters
+        ----------
+        stream: MaterialStream
+            the stream to be cooled
+        P: float
+            the pressure, in Pa
+
+        Returns
+        -------
+        MaterialStream
+        """
+
+        key = ("intercool", tuple(stream.fluid.composition), stream.m, P, self.T_intercool)
+
+        if key not in self.stage_cache:
+            temp_stream = stream.copy()
+            temp_stream.update("PT", P, self.T_intercool)
+            self.__cache(key, temp_stream)
+
+        return self.stage_cache[key].copy()
+
+    def __cache(self, key: tuple, value: any) -> NoReturn:
+        """
+        Helper function to store a result in the stage cache, discarding the oldest result if the cache is full
+
+        Parameters
+        ----------
+        key: tuple
+            the cache key
+        value: any
+            the result
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.stage_cache[key] = value
+
+        if len(self.stage_cache) > self.cache_size:
+            self.stage_cache.popitem(last=False)
+
     def calc_exergy_balance(self):
 
         # TODO pls fix
@@ -334,23 +334,28 @@ class turbine(Component):
 
             return temp_outlet
 
-        delta_dh = abs((self.delta_h_isentropic - self.delta_h) / self.delta_h_isentropic)  # this is just to get a starting point for the iterations
-        dh_prev = self.delta_h * 1.0
-        count = 0
+        wet_outlet = self.__BaumannRule_fixed_point(temp_outlet)
 
-        while delta_dh > 1e-3 and count < 10:
-            eta_corr = (self.inlet.properties.Q + temp_outlet.properties.Q) / 2
-            eta_s = eta_corr * self.eta_isentropic
-            temp_outlet = self.__polytropic_expansion(eta_isen=eta_s)
-
-            delta_dh = abs((dh_prev - self.delta_h) / dh_prev)
+        if wet_outlet is not None:
+            temp_outlet = wet_outlet
+        else:
+            delta_dh = abs((self.delta_h_isentropic - self.delta_h) / self.delta_h_isentropic)  # this is just to get a starting point for the iterations
             dh_prev = self.delta_h * 1.0
+            count = 0
 
-            count += 1
+            while delta_dh > 1e-3 and count < 10:
+                eta_corr = (self.inlet.properties.Q + temp_outlet.properties.Q) / 2
+                eta_s = eta_corr * self.eta_isentropic
+                temp_outlet = self.__polytropic_expansion(eta_isen=eta_s)
 
-        if delta_dh > 1e-3:
-            msg = "The Baumann Rule iterations have not converged on a solution the maximum number of iterations."
-            raise ValueError(msg)
+                delta_dh = abs((dh_prev - self.delta_h) / dh_prev)
+                dh_prev = self.delta_h * 1.0
+
+                count += 1
+
+            if delta_dh > 1e-3:
+                msg = "The Baumann Rule iterations have not converged on a solution the maximum number of iterations."
+                raise ValueError(msg)
 
         self.delta_h_polytropic = dh_polytropic
         self.delta_h_BaumannCorr = temp_outlet.properties.H - self.inlet.properties.H
@@ -360,6 +365,75 @@ class turbine(Component):
 
         return temp_outlet
 
+    def __BaumannRule_fixed_point(self, dry_outlet: "MaterialStream") -> "MaterialStream | None":
+        """
+        Helper function to solve the Baumann Rule for a wet expansion directly. At the outlet pressure the vapour
+        quality is linear in the specific enthalpy, so that the fixed point of
+
+            h_out = h_in + (Q_in + Q_out(h_out)) / 2 * eta_isentropic * delta_h_isentropic
+
+        has a closed-form solution. The saturated enthalpies at the outlet pressure are taken from the saturation curve
+        of the fluid or, if there is none, interpolated between the isentropic and the dry outlet states. The solution
+        is verified with a single state calculation.
+
+        Parameters
+        ----------
+        dry_outlet: MaterialStream
+            the outlet stream of the dry expansion
+
+        Returns
+        -------
+        MaterialStream | None
+            None if the fixed point could not be found or verified
+        """
+
+        h_in = self.inlet.properties.H
+        Q_in = self.inlet.properties.Q
+
+        curve = self.inlet.fluid.saturation_curve()
+        T_sat = curve.Tsat(self.Pout) if curve is not None else math.nan
+
+        # vapour quality along the isobar: Q = Q0 + dQdh * h
+        if not math.isnan(T_sat):
+            h_liq = curve.h_liq(T_sat)
+            h_vap = curve.h_vap(T_sat)
+
+            dQdh = 1 / (h_vap - h_liq)
+            Q0 = -h_liq * dQdh
+        else:
+            h_1, Q_1 = self.outlet_isentropic.properties.H, self.outlet_isentropic.properties.Q
+            h_2, Q_2 = dry_outlet.properties.H, dry_outlet.properties.Q
+
+            if not (0 < Q_1 < 1 and 0 < Q_2 < 1) or h_1 == h_2:
+                return None
+
+            dQdh = (Q_2 - Q_1) / (h_2 - h_1)
+            Q0 = Q_1 - dQdh * h_1
+
+        k = 0.5 * self.eta_isentropic * self.delta_h_isentropic
+        h_out = (h_in + k * (Q_in + Q0)) / (1 - k * dQdh)
+
+        if not 0 <= Q0 + dQdh * h_out <= 1:
+            return None
+
+        temp_outlet = dry_outlet.copy()
+        try:
+            temp_outlet.update("PH", self.Pout, h_out)
+        except ValueError:
+            return None
+
+        h_check = h_in + k * (Q_in + temp_outlet.properties.Q)
+        if abs((h_check - h_out) / (h_out - h_in)) > 1e-3:
+            return None
+
+        delta_s = temp_outlet.properties.S - self.inlet.properties.S
+        if delta_s < 0:
+            return None
+
+        self.delta_s = delta_s
+
+        return temp_outlet
+
     def calc_exergy_balance(self):
 
         self.Ein = self.inlet.m * (self.inlet.properties.H - Tref * self.inlet.properties.S)
@@ -1,5 +1,8 @@
+import copy
 from typing import NoReturn
 
+import numpy as np
+
 
 class Engine:
     """
@@ -9,12 +12,16 @@ class Engine:
     ----------
     properties: list[str]
         the properties this calculation engine can calculate
+    batch_properties: list[str]
+        the properties returned by a batch calculation
     calc_input_pairs: list[str]
         the supported state calculation input pairs
     """
 
     properties = ["H", "S", "P", "T", "D", "V", "Q", "MU"]  # list of all supported properties
 
+    batch_properties = ["H", "S", "T", "P", "D", "Q", "MU"]  # list of all properties returned by calc_batch
+
     calc_inputs = ["P", "T", "H", "S", "Q", "D"]
 
     def __init__(self, components: list[str], composition: list[float]) -> NoReturn:
@@ -53,6 +60,67 @@ class Engine:
         """
         print("calculating something")
 
+    def calc_batch(self, InputSpec: str, Input1: np.ndarray, Input2: np.ndarray, *args: tuple[any], **kwargs: dict[any]) -> "Properties":
+        """
+        Evaluates the properties of the fluid for arrays of state specifications. The inputs are broadcast against
+        each other and the result holds one array per property in "batch_properties", i.e. Properties.H[i] is the
+        enthalpy of the i-th state. States that cannot be calculated are returned as NaN.
+
+        This is the generic implementation, which calls calc for every state. Engines should override it with a
+        native implementation where possible.
+
+        Parameters
+        ----------
+        InputSpec: str
+            The state variables. This should be two letter, e.g. "PH" for a pressure enthalpy calculation
+        Input1: np.ndarray
+            The values corresponding to state variable 1
+        Input2: np.ndarray
+            The values corresponding to state variable 2
+
+        Returns
+        -------
+        Properties
+
+        Raises
+        ------
+        ValueError
+            The combination of state variables is not supported
+        """
+
+        # imported here, as FluidProperties imports the engines
+        from FluidProperties.properties import Properties
+
+        self._check_input_spec(InputSpec)
+
+        inputs1, inputs2 = self._broadcast_inputs(Input1, Input2)
+        results = self._empty_batch(inputs1.shape)
+
+        kwargs["PhaseProps"] = False
+
+        for i in np.ndindex(inputs1.shape):
+            try:
+                self.calc(InputSpec, inputs1[i], inputs2[i], *args, **kwargs)
+            except ValueError:
+                continue
+
+            for prop in self.batch_properties:
+                value = getattr(self.state_properties, prop, None)
+                if value is not None:
+                    results[prop][i] = value
+
+        return Properties(results)
+
+    def saturation_curve(self) -> "SaturationCurve | None":
+        """
+        Retrieves the saturation curve of the fluid, if the engine provides one
+
+        Returns
+        -------
+        SaturationCurve | None
+        """
+        return None
+
     def update_composition(self, composition: list[float]) -> NoReturn:
         """
         Updates the component mole fractions in the underlying state
@@ -67,3 +135,86 @@ class Engine:
         NoReturn
         """
         pass
+
+    def copy(self) -> "Engine":
+        """
+        Creates a copy of the engine for a copy of a fluid. The copy is shallow, so that immutable or pooled data, e.g.
+        the CoolProp backends or the values of a look-up table, is shared, but it gets its own state properties and
+        copies of any nested engines. Engines with further mutable state must override this.
+
+        Returns
+        -------
+        Engine
+        """
+
+        temp_engine = copy.copy(self)
+        if hasattr(self, "state_properties"):
+            temp_engine.state_properties = self.state_properties.copy()
+
+        for name, value in self.__dict__.items():
+            if isinstance(value, Engine):
+                setattr(temp_engine, name, value.copy())
+
+        return temp_engine
+
+    def _check_input_spec(self, InputSpec: str) -> NoReturn:
+        """
+        Helper function to check that the input specification is supported by the engine
+
+        Parameters
+        ----------
+        InputSpec: str
+            The state variables. This should be two letter, e.g. "PH" for a pressure enthalpy calculation
+
+        Returns
+        -------
+        NoReturn
+
+        Raises
+        ------
+        ValueError
+            The combination of state variables is not supported
+        """
+
+        calc_input_pairs = getattr(self, "calc_input_pairs", None)
+
+        if calc_input_pairs is not None and InputSpec not in calc_input_pairs:
+            msg = "\nThe input specification \"{}\" is not supported".format(InputSpec)
+            raise ValueError(msg)
+
+    @staticmethod
+    def _broadcast_inputs(Input1: np.ndarray, Input2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Helper function to convert the batch inputs to float arrays of a common shape
+
+        Parameters
+        ----------
+        Input1: np.ndarray
+            The values corresponding to state variable 1
+        Input2: np.ndarray
+            The values corresponding to state variable 2
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+        """
+
+        inputs1, inputs2 = np.broadcast_arrays(np.asarray(Input1, dtype=float), np.asarray(Input2, dtype=float))
+
+        return inputs1, inputs2
+
+    def _empty_batch(self, shape: tuple[int, ...]) -> dict[str, np.ndarray]:
+        """
+        Helper function to create the columnar container for a batch calculation
+
+        Parameters
+        ----------
+        shape: tuple[int, ...]
+            the shape of the batch
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+        """
+
+        return {prop: np.full(shape, np.nan) for prop in self.batch_properties}
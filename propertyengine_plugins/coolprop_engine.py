@@ -1,12 +1,70 @@
-from typing import NoReturn
+from collections import OrderedDict
+import threading
+from typing import NoReturn, Optional
+
+import numpy as np
 
 from .base_engine import Engine
 
 from FluidProperties.properties import Properties
 from FluidProperties import factory, Tref, Pref
+from FluidProperties.reference import reference_states
+from FluidProperties.saturation import SaturationCurve, saturation_curves
 
 import CoolProp as cp
 
+BACKEND_POOL_SIZE = 256  # maximum number of CoolProp backends kept per thread
+
+_backend_pool = threading.local()
+
+
+def get_backend(comps: str, composition: Optional[list[float] | None]=None, role: Optional[str]="state") -> cp.AbstractState:
+    """
+    Retrieves a CoolProp backend from the thread-local pool, creating it on first use. Backends are keyed on the role,
+    the component string and the mole fractions, so engines for the same fluid share a single backend. This is safe
+    because an engine reads all properties directly after updating the backend.
+
+    Parameters
+    ----------
+    comps: str
+        components in the CoolProp format, e.g. "water&carbondioxide"
+    composition: Optional[list[float] | None]
+        the component mole fractions. If None, the caller is responsible for setting the mole fractions
+    role: Optional[str]
+        the purpose of the backend, e.g. "state", "liquid" or "vapour". Backends of different roles are never shared
+
+    Returns
+    -------
+    cp.AbstractState
+    """
+
+    backends = getattr(_backend_pool, "backends", None)
+    if backends is None:
+        backends = _backend_pool.backends = OrderedDict()
+
+    # the mole fractions of a pure fluid have no effect on the backend
+    if composition is not None and len(composition) > 1:
+        composition = tuple(float(z) for z in composition)
+    else:
+        composition = None
+
+    key = (role, comps, composition)
+
+    if key in backends:
+        backends.move_to_end(key)
+        return backends[key]
+
+    backend = cp.AbstractState("?", comps)
+
+    if composition is not None:
+        backend.set_mole_fractions(list(composition))
+
+    backends[key] = backend
+    if len(backends) > BACKEND_POOL_SIZE:
+        backends.popitem(last=False)
+
+    return backend
+
 
 class CoolPropEngine(Engine):
     """
@@ -68,16 +126,54 @@ class CoolPropEngine(Engine):
         self.composition = composition
         self.comps = comps
 
-        self.state = cp.AbstractState("?", comps)
+        self.state = get_backend(comps, composition)
 
         self.mixtureFlag = (len(components) > 1)
 
-        if self.mixtureFlag:
-            self.state.set_mole_fractions(composition)
-
         self.properties_initialised = False
         self.state_properties = Properties({"P": 0.0})
 
+    def update_composition(self, composition: list[float]) -> NoReturn:
+        """
+        Updates the component mole fractions in the underlying state
+
+        Parameters
+        ----------
+        composition: list[float]
+            the new mole fractions of all components
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.composition = composition
+        self.state = get_backend(self.comps, composition)
+
+        self.properties_initialised = False
+
+    def saturation_curve(self) -> SaturationCurve | None:
+        """
+        Retrieves the saturation curve of a pure fluid from the process-wide registry, creating it on first use. The
+        critical point is available straight away, the splines are only generated when first evaluated.
+
+        Returns
+        -------
+        SaturationCurve | None
+            None for mixtures
+        """
+
+        if self.mixtureFlag:
+            return None
+
+        def create_curve():
+            if not self.properties_initialised:
+                self.__init_props()
+
+            return SaturationCurve(self, self.state.T_critical(), self.state.p_critical(), max(self.state.Tmin(), self.state.Ttriple()))
+
+        return saturation_curves.get(("coolprop", self.comps), create_curve)
+
     def __init_props(self) -> NoReturn:
         """
         Initialises the properties at the reference conditions
@@ -86,12 +182,46 @@ class CoolPropEngine(Engine):
         -------
         NoReturn
         """
-        self.state.update(cp.PT_INPUTS, Pref, Tref)
-        self.h0 = self.state.hmass()
-        self.s0 = self.state.smass()
+        self.h0, self.s0 = self.__reference_state(self.state, self.components, self.composition)
 
         self.properties_initialised = True
 
+    @staticmethod
+    def __reference_state(state: cp.AbstractState, components: list[str], composition: list[float],
+                          cache: Optional[bool]=True) -> tuple[float, float]:
+        """
+        Helper function to retrieve the specific enthalpy and entropy at the reference conditions. These are only
+        evaluated once per fluid definition and then taken from the process-wide reference state registry.
+
+        Parameters
+        ----------
+        state: cp.AbstractState
+            the CoolProp state of the fluid, with the mole fractions already set
+        components: list[str]
+            the component names
+        composition: list[float]
+            the component mole fractions
+        cache: Optional[bool]
+            flag indicating whether the reference state should be kept in the registry. The reference states of
+            mixture phases are not, as their compositions vary continuously and are hardly ever met again
+
+        Returns
+        -------
+        tuple[float, float]
+        """
+
+        def calc_reference():
+            state.update(cp.PT_INPUTS, Pref, Tref)
+
+            return state.hmass(), state.smass()
+
+        if not cache:
+            return calc_reference()
+
+        key = reference_states.key("coolprop", components, composition)
+
+        return reference_states.get(key, calc_reference)
+
     def calc(self, InputSpec: str, Input1: float, Input2: float, *args: tuple[any], **kwargs:dict[any]) -> NoReturn:
         """
         Updates the properties of the fluid for some state specifications
@@ -156,6 +286,85 @@ class CoolPropEngine(Engine):
 
         self.state_properties = self.__get_properties(kwargs["PhaseProps"])
 
+    def calc_batch(self, InputSpec: str, Input1: np.ndarray, Input2: np.ndarray, *args: tuple[any], **kwargs: dict[any]) -> Properties:
+        """
+        Evaluates the properties of the fluid for arrays of state specifications. The CoolProp state is updated in a
+        tight loop and only the "batch_properties" are read back, without assembling a Properties object per state.
+
+        Parameters
+        ----------
+        InputSpec: str
+            The state variables. This should be two letter, e.g. "PH" for a pressure enthalpy calculation
+        Input1: np.ndarray
+            The values corresponding to state variable 1
+        Input2: np.ndarray
+            The values corresponding to state variable 2
+
+        Returns
+        -------
+        Properties
+
+        Raises
+        ------
+        ValueError
+            The combination of state variables is not supported
+        """
+
+        if not self.properties_initialised:
+            self.__init_props()
+
+        self._check_input_spec(InputSpec)
+
+        inputs1, inputs2 = self._broadcast_inputs(Input1, Input2)
+
+        # bring the input pair into the order expected by the helper functions
+        if InputSpec in ["TP", "HP", "SP", "QP", "QT"]:
+            InputSpec = InputSpec[::-1]
+            inputs1, inputs2 = inputs2, inputs1
+
+        if self.mixtureFlag and InputSpec in ["PH", "PS"]:
+            msg = "\nThe {} calculation mode has not yet been implemtented for mixtures".format(InputSpec)
+            raise ValueError(msg)
+
+        match InputSpec:
+            case "PT":
+                calc_state = self.__calc_PT
+            case "PH":
+                calc_state = self.__calc_PH
+            case "PS":
+                calc_state = self.__calc_PS
+            case "PQ":
+                calc_state = self.__calc_PQ
+            case "TQ":
+                calc_state = self.__calc_TQ
+
+        results = self._empty_batch(inputs1.shape)
+        H, S, T, P, D, Q, MU = (results[prop] for prop in ["H", "S", "T", "P", "D", "Q", "MU"])
+
+        for i in np.ndindex(inputs1.shape):
+            try:
+                calc_state(inputs1[i], inputs2[i])
+            except ValueError:
+                continue
+
+            H[i] = self.state.hmass() - self.h0
+            S[i] = self.state.smass() - self.s0
+            T[i] = self.state.T()
+            P[i] = self.state.p()
+            D[i] = self.state.rhomass()
+
+            try:
+                Q[i] = self.__get_Q()
+            except ValueError:
+                pass
+
+            try:
+                MU[i] = self.state.viscosity()
+            except ValueError:
+                pass
+
+        return Properties(results)
+
     def __calc_PT(self, p: float, T: float) -> NoReturn:
         """
         Helper function for performing a state calculation using pressure and temperature
@@ -247,8 +456,9 @@ class CoolPropEngine(Engine):
         if self.mixtureFlag:
             self.state.update(cp.PQ_INPUTS, p, Q)
         else:
-            p_crit = self.state.p_critical()
-            T_crit = self.state.T_critical()
+            curve = self.saturation_curve()
+            p_crit = curve.p_crit
+            T_crit = curve.T_crit
             if p > p_crit:
                 self.state.update(cp.PT_INPUTS, p, T_crit)
             else:
@@ -273,8 +483,9 @@ class CoolPropEngine(Engine):
         if self.mixtureFlag:
             self.state.update(cp.QT_INPUTS, Q, T)
         else:
-            p_crit = self.state.p_critical()
-            T_crit = self.state.T_critical()
+            curve = self.saturation_curve()
+            p_crit = curve.p_crit
+            T_crit = curve.T_crit
             if T > T_crit:
                 self.state.update(cp.PT_INPUTS, T, p_crit)
             else:
@@ -283,11 +494,12 @@ class CoolPropEngine(Engine):
     def __get_LiqProps(self):
 
         try:
-            liquid = cp.AbstractState("?", self.comps)
+            liquid = get_backend(self.comps, role="liquid")
 
-            liquid.set_mole_fractions(self.state.mole_fractions_liquid())
+            composition = self.state.mole_fractions_liquid()
+            liquid.set_mole_fractions(composition)
 
-            liquid.update(cp.PT_INPUTS, Pref, Tref)
+            h0, s0 = self.__reference_state(liquid, self.components, composition, cache=False)
         except:
 
             components = self.components
@@ -303,15 +515,12 @@ class CoolPropEngine(Engine):
             corr = 1 / sum(compo)
             compo = [x * corr for x in compo]
 
-            liquid = cp.AbstractState("?", comps)
+            liquid = get_backend(comps, role="liquid")
 
             if len(compo) > 1:
                 liquid.set_mole_fractions(compo)
 
-            liquid.update(cp.PT_INPUTS, Pref, Tref)
-
-        h0 = liquid.hmass()
-        s0 = liquid.smass()
+            h0, s0 = self.__reference_state(liquid, comps.split("&"), compo, cache=len(compo) < 2)
 
         p = self.state.p() * 1.0
         T = self.state.T() * 1.0
@@ -343,11 +552,12 @@ class CoolPropEngine(Engine):
     def __get_VapProps(self):
 
         try:
-            vapour = cp.AbstractState("?", self.comps)
-            vapour.set_mole_fractions(self.state.mole_fractions_vapor())
+            vapour = get_backend(self.comps, role="vapour")
 
-            vapour.update(cp.PT_INPUTS, Pref, Tref)
+            composition = self.state.mole_fractions_vapor()
+            vapour.set_mole_fractions(composition)
 
+            h0, s0 = self.__reference_state(vapour, self.components, composition, cache=False)
         except:
             components = self.components
             composition = self.state.mole_fractions_vapor()
@@ -362,15 +572,12 @@ class CoolPropEngine(Engine):
             corr = 1 / sum(compo)
             compo = [x * corr for x in compo]
 
-            vapour = cp.AbstractState("?", comps)
+            vapour = get_backend(comps, role="vapour")
 
             if len(compo) > 1:
                 vapour.set_mole_fractions(compo)
 
-            vapour.update(cp.PT_INPUTS, Pref, Tref)
-
-        h0 = vapour.hmass()
-        s0 = vapour.smass()
+            h0, s0 = self.__reference_state(vapour, comps.split("&"), compo, cache=len(compo) < 2)
 
         p = self.state.p() * 1.0
         T = self.state.T() * 1.0
@@ -398,6 +605,55 @@ class CoolPropEngine(Engine):
 
         return Properties(vap_props)
 
+    def __get_Q(self) -> float:
+        """
+        Helper function to retrieve the vapour quality of the current state
+
+        Returns
+        -------
+        float
+
+        Raises
+        ------
+        ValueError
+            calculated phase is not recognised
+        """
+
+        phase = self.state.phase()
+
+        def check_Q(Q_tar):
+
+            if self.mixtureFlag:
+                z = self.state.get_mole_fractions()
+                x = self.state.mole_fractions_liquid()
+                y = self.state.mole_fractions_vapor()
+
+                Q = (z[0] - x[0]) / (y[0] - x[0])
+
+                rho = self.state.rhomass()
+                if rho < 100:
+                    Q = 1.0
+                elif rho > 500:
+                    Q = 0.0
+
+                if abs(Q - Q_tar) > 0.01:
+                    return Q
+
+            return Q_tar
+
+        if phase in [cp.iphase_twophase]:
+            return self.state.Q()
+
+        elif phase in [cp.iphase_supercritical_liquid, cp.iphase_liquid]:
+            return check_Q(0.0)
+
+        elif phase in [cp.iphase_supercritical, cp.iphase_critical_point, cp.iphase_supercritical_gas, cp.iphase_gas]:
+            return check_Q(1.0)
+
+        else:
+            msg = "\nCalculated phase type not recognised"
+            raise ValueError(msg)
+
     def __get_properties(self, PhaseProps) -> Properties:
         """
         Helper function to retrieve the fluid properties
@@ -434,44 +690,7 @@ class CoolPropEngine(Engine):
                     props["V"] = 1 / self.state.rhomass()
 
                 case "Q":
-                    phase = self.state.phase()
-
-                    def check_Q(Q_tar):
-
-                        if self.mixtureFlag:
-                            z = self.state.get_mole_fractions()
-                            x = self.state.mole_fractions_liquid()
-                            y = self.state.mole_fractions_vapor()
-
-                            Q = (z[0] - x[0]) / (y[0] - x[0])
-
-                            rho = self.state.rhomass()
-                            if rho < 100:
-                               Q = 1.0
-                            elif rho > 500:
-                                Q = 0.0
-
-                            if abs(Q - Q_tar) > 0.01:
-                                props["Q"] = Q
-                        else:
-                            pass
-
-                    if phase in [cp.iphase_twophase]:
-                        props["Q"] = self.state.Q()
-
-                    elif phase in [cp.iphase_supercritical_liquid, cp.iphase_liquid]:
-                        props["Q"] = 0.0
-
-                        check_Q(0.0)
-
-                    elif phase in [cp.iphase_supercritical, cp.iphase_critical_point, cp.iphase_supercritical_gas, cp.iphase_gas]:
-                        props["Q"] = 1.0
-
-                        check_Q(1.0)
-
-                    else:
-                        msg = "\nCalculated phase type not recognised"
-                        raise ValueError(msg)
+                    props["Q"] = self.__get_Q()
 
                 case "MU":
                     try:
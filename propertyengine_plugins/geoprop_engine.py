@@ -1,12 +1,15 @@
+from collections import deque
+
 from scipy.optimize import root_scalar
 import numpy as np
-from typing import Optional, Union, NoReturn
+from typing import Callable, Optional, Union, NoReturn
 
 from .base_engine import Engine
 from .coolprop_engine import CoolPropEngine
 
 from FluidProperties.properties import Properties
 from FluidProperties import factory, Tref, Pref
+from FluidProperties.reference import reference_states
 
 from GeoProp.Model.Databases import Comp as GeoComp
 from GeoProp.Model.Fluid import Fluid as GeoFluid
@@ -15,6 +18,175 @@ from GeoProp.Model.PropertyModel import PropertyModelOptions  #, PropertyModel
 from GeoProp.Model.State import State
 
 
+class SolutionCache:
+    """
+    This class keeps the most recent state solutions of a GeoPropEngine, i.e. the pressure, temperature, specific
+    enthalpy, specific entropy and vapour quality. The inverse state calculations (e.g. pressure-enthalpy) start their
+    root searches from the solutions closest to the requested state, e.g. the previous node of a heat exchanger,
+    instead of from a fixed initial guess. Every iteration of these searches is a complete partition and property
+    calculation.
+
+    Attributes
+    ----------
+    maxsize: int
+        the maximum number of solutions kept in the cache
+    rtol: float
+        the relative tolerance within which the fixed state variable of a solution must match the requested state for
+        it to be used as a starting point
+    solutions: deque[tuple[float, float, float, float, float]]
+        the most recent solutions as (P, T, H, S, Q)
+    counters: dict[str, dict[str, int]]
+        the number of inversions, iterations (i.e. state calculations), seeded searches and full bracket searches of
+        each input specification
+    """
+
+    variables = {"P": 0, "T": 1, "H": 2, "S": 3, "Q": 4}
+
+    def __init__(self, maxsize: Optional[int]=32, rtol: Optional[float]=0.05) -> NoReturn:
+        """
+        instantiates the SolutionCache
+
+        Parameters
+        ----------
+        maxsize: Optional[int]
+            the maximum number of solutions kept in the cache
+        rtol: Optional[float]
+            the relative tolerance within which the fixed state variable of a solution must match the requested state
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.maxsize = maxsize
+        self.rtol = rtol
+
+        self.solutions = deque(maxlen=maxsize)
+        self.counters = {}
+
+    def add(self, props: Properties) -> NoReturn:
+        """
+        adds a solution to the cache
+
+        Parameters
+        ----------
+        props: Properties
+            the state properties, which must include P, T, H, S and Q
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        solution = (props.P, props.T, props.H, props.S, props.Q)
+
+        if all(np.isfinite(solution)):
+            self.solutions.append(solution)
+
+    def seeds(self, fixed: str, fixed_value: float, target: str, target_value: float,
+              unknown: str) -> tuple[list[tuple[float, float]], Union[tuple[float, float], None]]:
+        """
+        finds the cached solutions closest to the requested state, i.e. with (nearly) the same fixed state variable and
+        the closest values of the specified state variable. Solutions on either side of the requested state are
+        preferred
+
+        Parameters
+        ----------
+        fixed: str
+            the fixed state variable, e.g. "P" for a pressure-enthalpy calculation
+        fixed_value: float
+            the value of the fixed state variable
+        target: str
+            the specified state variable, e.g. "H" for a pressure-enthalpy calculation
+        target_value: float
+            the value of the specified state variable
+        unknown: str
+            the state variable to be solved for, e.g. "T" for a pressure-enthalpy calculation
+
+        Returns
+        -------
+        tuple[list[tuple[float, float]], Union[tuple[float, float], None]]
+            up to two solutions as (unknown, specified) state variables, closest first, and a bracket of the unknown
+            state variable if the solutions lie on either side of the requested state
+        """
+
+        i_fixed = self.variables[fixed]
+        i_target = self.variables[target]
+        i_unknown = self.variables[unknown]
+
+        candidates = []
+        for solution in self.solutions:
+            if abs(solution[i_fixed] - fixed_value) <= self.rtol * abs(fixed_value):
+                candidates.append((abs(solution[i_target] - target_value), solution[i_unknown], solution[i_target]))
+
+        candidates.sort()
+        points = [(x, value) for _, x, value in candidates]
+
+        below = next((point for point in points if point[1] <= target_value), None)
+        above = next((point for point in points if point[1] >= target_value), None)
+
+        if below is not None and above is not None and below[0] != above[0]:
+            points = [below, above] if points.index(below) < points.index(above) else [above, below]
+            return points, (min(below[0], above[0]), max(below[0], above[0]))
+
+        return points[:2], None
+
+    def record(self, spec: str, iterations: int, seeded: bool, fallback: bool) -> NoReturn:
+        """
+        records the statistics of an inversion
+
+        Parameters
+        ----------
+        spec: str
+            the input specification, e.g. "PH"
+        iterations: int
+            the number of state calculations of the root search
+        seeded: bool
+            flag indicating whether the root search started from cached solutions
+        fallback: bool
+            flag indicating whether the root search had to fall back to the full bracket
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        counters = self.counters.setdefault(spec, {"inversions": 0, "iterations": 0, "seeded": 0, "fallbacks": 0})
+
+        counters["inversions"] += 1
+        counters["iterations"] += iterations
+        counters["seeded"] += seeded
+        counters["fallbacks"] += fallback
+
+    def clear(self) -> NoReturn:
+        """
+        removes all solutions from the cache and resets the counters
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.solutions.clear()
+        self.counters = {}
+
+    def stats(self) -> dict[str, any]:
+        """
+        returns the cache statistics, including the mean number of iterations per inversion of each input
+        specification
+
+        Returns
+        -------
+        dict[str, any]
+        """
+
+        specs = {}
+        for spec, counters in self.counters.items():
+            specs[spec] = counters | {"iterations_per_inversion": counters["iterations"] / counters["inversions"]}
+
+        return {"size": len(self.solutions), "specs": specs}
+
+
 class GeoPropEngine(Engine):
 
     """
@@ -64,6 +236,8 @@ class GeoPropEngine(Engine):
         flag to indicate whether the properties have been initialised
     state_properties: Properties
         the state properties
+    solution_cache: SolutionCache
+        the most recent state solutions, used as starting points of the inverse state calculations
     """
 
     properties = ["H", "S", "P", "T", "D", "V", "Q", "Mr", "LiqProps", "VapProps"]  # list of all supported properties
@@ -199,6 +373,8 @@ class GeoPropEngine(Engine):
         self.properties_initialised = False
         self.state_properties = Properties({"P": 0.0})
 
+        self.solution_cache = SolutionCache()
+
     def set_calc_options(self,
                          part_opts: Optional[Union[str, None]]=None,
                          prop_opts: Optional[Union[str, None]]=None) -> NoReturn:
@@ -258,6 +434,24 @@ class GeoPropEngine(Engine):
 
         self.state = State(part_options=self.part_opts, prop_options=self.prop_opts)
 
+    def copy(self) -> "GeoPropEngine":
+        """
+        Creates a copy of the engine for a copy of a fluid. The GeoProp fluid is replaced by the partitioned result of
+        every calculation, so the copy gets its own, as well as its own solution cache. The GeoProp State only holds
+        the models and a scratch fluid used within a single calculation, so it is shared
+
+        Returns
+        -------
+        GeoPropEngine
+        """
+
+        temp_engine = super().copy()
+
+        temp_engine.fluid = self.fluid.copy()
+        temp_engine.solution_cache = SolutionCache(self.solution_cache.maxsize, self.solution_cache.rtol)
+
+        return temp_engine
+
     def update_composition(self, composition: list[float]) -> NoReturn:
         """
         Updates the component mole fractions in the underlying state
@@ -276,6 +470,7 @@ class GeoPropEngine(Engine):
 
         self.fluid = GeoFluid(components=components_geoprop, composition=composition, CompInMole=True)
         self.properties_initialised = False
+        self.solution_cache.clear()
 
         components = self.components
         self.mixtureFlag = (len(composition) > 1)
@@ -347,10 +542,12 @@ class GeoPropEngine(Engine):
 
             case "PT":
                 self.state_properties = self.__calc_PT(Input1, Input2, **kwargs)
+                self.solution_cache.add(self.state_properties)
                 return
 
             case "TP":
                 self.state_properties = self.__calc_PT(Input2, Input1, **kwargs)
+                self.solution_cache.add(self.state_properties)
                 return
 
             case "PH":
@@ -390,6 +587,73 @@ class GeoPropEngine(Engine):
                 raise ValueError(msg)
 
 
+    def calc_batch(self, InputSpec: str, Input1: np.ndarray, Input2: np.ndarray, *args: tuple[any], **kwargs: dict[any]) -> Properties:
+        """
+        Evaluates the properties of the fluid for arrays of state specifications. Pure fluids are passed on to the
+        CoolProp engine. For mixtures, pressure-temperature states are split by region, so that all states outside
+        the GeoProp validation region are evaluated by CoolProp in a single batch.
+
+        Parameters
+        ----------
+        InputSpec: str
+            The state variables. This should be two letter, e.g. "PH" for a pressure enthalpy calculation
+        Input1: np.ndarray
+            The values corresponding to state variable 1
+        Input2: np.ndarray
+            The values corresponding to state variable 2
+
+        Returns
+        -------
+        Properties
+
+        Raises
+        ------
+        ValueError
+            The combination of state variables is not supported
+        """
+
+        kwargs["PhaseProps"] = False
+
+        if not self.properties_initialised:
+            self.__init_props(**kwargs)
+
+        if not self.mixtureFlag:
+            return self.cp_state_pure.calc_batch(InputSpec, Input1, Input2, *args, **kwargs)
+
+        if InputSpec not in ["PT", "TP"]:
+            return super().calc_batch(InputSpec, Input1, Input2, *args, **kwargs)
+
+        inputs1, inputs2 = self._broadcast_inputs(Input1, Input2)
+        if InputSpec == "TP":
+            inputs1, inputs2 = inputs2, inputs1
+
+        p, T = inputs1, inputs2
+        results = self._empty_batch(p.shape)
+
+        in_T = (self.Tmin <= T) & (T <= self.Tmax)
+        geoprop = in_T & (self.Pmin <= p) & (p <= self.Pmax)
+        coolprop = ((self.Pminmin <= p) & (p < self.Pmin) & (T >= self.Tmin)) | ((T > self.Tmax) & (self.Pminmin <= p) & (p <= self.Pmax))
+
+        if coolprop.any():
+            cp_results = self.cp_state_mixture.calc_batch("PT", p[coolprop], T[coolprop], **kwargs)
+            for prop in self.batch_properties:
+                results[prop][coolprop] = cp_results[prop]
+
+        for i in np.ndindex(p.shape):
+            if not geoprop[i]:
+                continue
+
+            try:
+                self.fluid = self.state.calc_PT(self.fluid, p[i], T[i])
+                props = self.__get_properties_from_GeoProp()
+            except ValueError:
+                continue
+
+            for prop in ["H", "S", "T", "P", "D", "Q"]:
+                results[prop][i] = props[prop]
+
+        return Properties(results)
+
     def __init_props(self, **kwargs) -> NoReturn:
         """
         Initialises the properties at the reference conditions
@@ -399,15 +663,28 @@ class GeoPropEngine(Engine):
         NoReturn
         """
 
+        def calc_reference():
+            if self.mixtureFlag:
+                props = self.__calc_PT(Pref, Tref)
+                return props.H, props.S
+            else:
+                self.cp_state_pure.calc("PT", Pref, Tref, **kwargs)
+                props = self.cp_state_pure.state_properties
+                return props.H + self.cp_state_pure.h0, props.S + self.cp_state_pure.s0
+
         if self.mixtureFlag:
-            props = self.__calc_PT(Pref, Tref)
-            self.h0 = props.H
-            self.s0 = props.S
+            # the reference state depends on both the partition model and the property model options
+            thermofun = self.prop_opts.ThermoFun
+            coolprop = self.prop_opts.CoolProp
+            backend = "geoprop-{}-thermofun-{}-{:g}-coolprop-{:g}".format(self.part_opts.model.name,
+                                                                          thermofun.database.name,
+                                                                          thermofun.massfracCutOff,
+                                                                          coolprop.massfracCutOff)
         else:
-            self.cp_state_pure.calc("PT", Pref, Tref, **kwargs)
-            props = self.cp_state_pure.state_properties
-            self.h0 = props.H + self.cp_state_pure.h0
-            self.s0 = props.S + self.cp_state_pure.s0
+            backend = "geoprop-coolprop"
+        key = reference_states.key(backend, self.components, self.composition)
+
+        self.h0, self.s0 = reference_states.get(key, calc_reference)
 
         self.properties_initialised = True
 
@@ -518,20 +795,10 @@ class GeoPropEngine(Engine):
 
             return temp_props.H - H
 
-        try:
-            solution = root_scalar(h, method="secant", x0=350, rtol=0.001)
-
-            if solution.converged:
-                T = solution.root
-            else:
-                raise ValueError
-
-        except:
-            solution = root_scalar(h, method="brentq", bracket=[self.Tmin + 1, self.Tmax - 1], rtol=0.001)
-
-            T = solution.root
+        T = self.__solve("PH", h, ("P", p), ("H", H), "T", 350, [self.Tmin + 1, self.Tmax - 1], rtol=0.001)
 
         fin_props = self.__calc_PT(p, T, **kwargs)
+        self.solution_cache.add(fin_props)
 
         if abs(fin_props.H - H)/max([abs(fin_props.H), abs(H), 1e-5]) > 0.001:
 
@@ -577,18 +844,10 @@ class GeoPropEngine(Engine):
 
             return temp_props.S - S
 
-        try:
-            solution = root_scalar(s, method="secant", x0=350, rtol=0.0001)
-
-            if solution.converged:
-                T = solution.root
-            else:
-                raise ValueError
-        except:
-            solution = root_scalar(s, method="brentq", bracket=[self.Tmin + 1, self.Tmax - 1], rtol=0.0001)
-            T = solution.root
+        T = self.__solve("PS", s, ("P", p), ("S", S), "T", 350, [self.Tmin + 1, self.Tmax - 1], rtol=0.0001)
 
         fin_props = self.__calc_PT(p, T, **kwargs)
+        self.solution_cache.add(fin_props)
 
         if abs(fin_props.S - S) / max([abs(fin_props.S), abs(S), 1e-5]) > 0.001:
 
@@ -634,19 +893,10 @@ class GeoPropEngine(Engine):
 
             return temp_props.Q - Q
 
-        try:
-            solution = root_scalar(q, method="secant", x0=350)
-
-            if solution.converged:
-                T = solution.root
-            else:
-                raise ValueError
-
-        except:
-            solution = root_scalar(q, method="brentq", bracket=[self.Tmin + 1, self.Tmax - 1])
-            T = solution.root
+        T = self.__solve("PQ", q, ("P", p), ("Q", Q), "T", 350, [self.Tmin + 1, self.Tmax - 1])
 
         fin_props = self.__calc_PT(p, T)
+        self.solution_cache.add(fin_props)
 
         if abs(fin_props.Q - Q) / max([abs(fin_props.Q), abs(Q), 1e-5]) > 0.001:
 
@@ -692,19 +942,10 @@ class GeoPropEngine(Engine):
 
             return temp_props.Q - Q
 
-        try:
-            solution = root_scalar(q, method="secant", x0=2e5, rtol=0.001)
-
-            if solution.converged:
-                p = solution.root
-            else:
-                raise ValueError
-
-        except:
-            solution = root_scalar(q, method="brentq", bracket=[self.Pminmin + 1, self.Pmax - 1], rtol=0.001)
-            p = solution.root
+        p = self.__solve("TQ", q, ("T", T), ("Q", Q), "P", 2e5, [self.Pminmin + 1, self.Pmax - 1], rtol=0.001)
 
         fin_props = self.__calc_PT(p, T, **kwargs)
+        self.solution_cache.add(fin_props)
 
         if abs(fin_props.Q - Q) / max([abs(fin_props.Q), abs(Q), 1e-5]) > 0.001:
 
@@ -718,6 +959,97 @@ class GeoPropEngine(Engine):
 
         return fin_props
 
+    def __solve(self,
+                spec: str,
+                func: Callable[[float], float],
+                fixed: tuple[str, float],
+                target: tuple[str, float],
+                unknown: str,
+                x0: float,
+                bracket: list[float],
+                rtol: Optional[Union[float, None]]=None) -> float:
+        """
+        Helper function to solve an inverse state calculation. The secant search starts from the root interpolated
+        between the two cached solutions closest to the requested state, from the closest cached solution if there is
+        only one, or else from the default initial guess. A close starting point converges with two state
+        calculations. If the secant search fails, a Brent search is performed over the bracket of the cached solutions
+        (widened, as they were calculated at a slightly different state), and finally over the full bracket
+
+        Parameters
+        ----------
+        spec: str
+            the input specification, e.g. "PH"
+        func: Callable[[float], float]
+            the residual of the specified state variable as a function of the unknown state variable
+        fixed: tuple[str, float]
+            the name and value of the fixed state variable, e.g. ("P", p)
+        target: tuple[str, float]
+            the name and value of the specified state variable, e.g. ("H", H)
+        unknown: str
+            the name of the unknown state variable, e.g. "T"
+        x0: float
+            the default initial guess of the unknown state variable
+        bracket: list[float]
+            the full bracket of the unknown state variable
+        rtol: Optional[Union[float, None]]
+            the relative tolerance of the root searches, the SciPy default if None
+
+        Returns
+        -------
+        float
+            the value of the unknown state variable
+        """
+
+        options = {} if rtol is None else {"rtol": rtol}
+
+        iterations = [0]
+
+        def residual(x):
+            iterations[0] += 1
+            return func(x)
+
+        points, seed_bracket = self.solution_cache.seeds(fixed[0], fixed[1], target[0], target[1], unknown)
+
+        fallback = False
+        try:
+            if len(points) == 2 and points[0][0] != points[1][0] and points[0][1] != points[1][1]:
+                # the root is interpolated between the cached solutions
+                (x1, value1), (x2, value2) = points
+                start = x1 + (target[1] - value1) * (x2 - x1) / (value2 - value1)
+            elif points:
+                start = points[0][0]
+            else:
+                start = x0
+
+            solution = root_scalar(residual, method="secant", x0=min(max(start, bracket[0]), bracket[1]), **options)
+
+            if solution.converged:
+                root = solution.root
+            else:
+                raise ValueError
+
+        except:
+            fallback = True
+            root = None
+
+            if seed_bracket is not None:
+                width = seed_bracket[1] - seed_bracket[0]
+                try:
+                    solution = root_scalar(residual, method="brentq", bracket=[max(seed_bracket[0] - width, bracket[0]),
+                                                                               min(seed_bracket[1] + width, bracket[1])],
+                                           **options)
+                    root = solution.root
+                except:
+                    pass
+
+            if root is None:
+                solution = root_scalar(residual, method="brentq", bracket=bracket, **options)
+                root = solution.root
+
+        self.solution_cache.record(spec, iterations[0], bool(points), fallback)
+
+        return root
+
     def __get_properties_from_GeoProp(self) -> Properties:
         """
         Helper function to retrieve the properties from GeoProp
@@ -751,15 +1083,15 @@ class GeoPropEngine(Engine):
 
                 case "Q":
 
-                    moles_g = sum([self.fluid.gaseous.moles[i] for i in self.fluid.gaseous.components])
-                    moles_l = sum([self.fluid.aqueous.moles[i] for i in self.fluid.aqueous.components])
+                    moles_g = self.fluid.gaseous.moles.total()
+                    moles_l = self.fluid.aqueous.moles.total()
 
                     props["Q"] = moles_g / (moles_l + moles_g)
 
                 case "Mr":
 
-                    moles = sum([self.fluid.total.moles[i] for i in self.fluid.total.components])
-                    mass = sum([self.fluid.total.mass[i] for i in self.fluid.total.components])
+                    moles = self.fluid.total.moles.total()
+                    mass = self.fluid.total.mass.total()
 
                     props["Mr"] = mass / moles
 
@@ -770,8 +1102,8 @@ class GeoPropEngine(Engine):
                         composition = [compo for compo in self.fluid.aqueous.molefrac]
                         components = [self.CompToName[comp] for comp in self.fluid.aqueous.components]
 
-                        moles = sum([self.fluid.aqueous.moles[i] for i in self.fluid.aqueous.components])
-                        mass = sum([self.fluid.aqueous.mass[i] for i in self.fluid.aqueous.components])
+                        moles = self.fluid.aqueous.moles.total()
+                        mass = self.fluid.aqueous.mass.total()
                         Mr = mass / (moles + 1e-15)
 
                         liq_props = {"composition": composition,
@@ -799,8 +1131,8 @@ class GeoPropEngine(Engine):
                         composition = [compo for compo in self.fluid.gaseous.molefrac]
                         components = [self.CompToName[comp] for comp in self.fluid.gaseous.components]
 
-                        moles = sum([self.fluid.gaseous.moles[i] for i in self.fluid.gaseous.components])
-                        mass = sum([self.fluid.gaseous.mass[i] for i in self.fluid.gaseous.components])
+                        moles = self.fluid.gaseous.moles.total()
+                        mass = self.fluid.gaseous.mass.total()
                         Mr = mass / (moles + 1e-15)
 
                         vap_props = {"composition": composition,
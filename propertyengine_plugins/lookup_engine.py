@@ -1,8 +1,11 @@
 from typing import NoReturn, Optional, Union
+import hashlib
+import json
 import math
+import multiprocessing
+import os
 import pickle
 import matplotlib.pyplot as plt
-import scipy
 from scipy.optimize import root_scalar
 import numpy as np
 
@@ -12,6 +15,8 @@ from .coolprop_engine import CoolPropEngine
 from FluidProperties import factory
 from FluidProperties.properties import Properties
 
+TABLE_FORMAT_VERSION = 1  # version of the LookUpTable file format written by LookUpTable.save
+
 
 class LookUpTable(Engine):
 
@@ -34,6 +39,10 @@ class LookUpTable(Engine):
         the filepath and name of the LookUpTable
     loaded: bool
         flag indicating that the table has been loaded
+    memory_mapped: bool
+        flag indicating that the table values are memory mapped from a table directory
+    error_report: dict | None
+        the interpolation error of the table against the underlying engine, see LookUpTable.interpolation_error
     mixtureFlag: bool
         flag indicating that the fluid is a mixture
     cp_state_pure: CoolPropEngine
@@ -58,11 +67,15 @@ class LookUpTable(Engine):
     ValuesQ
     ValuesD
     ValuesV
+    Values
+        all tabulated properties stacked along the last axis, in the order of "table_properties"
 
     """
 
     properties = ["H", "S", "P", "T", "D", "V", "Q"]  # list of all supported properties
 
+    table_properties = ["P", "T", "H", "S", "Q", "D"]  # the order of the properties in the stacked table
+
     calc_input_pairs = ["PT", "TP", "PH", "HP", "PS", "SP", "PQ", "QP", "TQ", "QT"]
 
     def __init__(self,
@@ -104,6 +117,9 @@ class LookUpTable(Engine):
 
         self.InputSpec = InputSpec
 
+        self.memory_mapped = False
+        self.error_report = None
+
         if filename is not None:
             self.load(filename)
         else:
@@ -298,13 +314,24 @@ class LookUpTable(Engine):
             self.min2 = min
             self.max2 = max
 
-    def generateTable(self, fluid: "Fluid") -> NoReturn:
+    def generateTable(self,
+                      fluid: "Fluid",
+                      processes: Optional[int]=1,
+                      checkpoint: Optional[str | None]=None) -> NoReturn:
         """
-        generate the LookUpTable
+        generate the LookUpTable. The table is calculated row by row (i.e. for each composition and value of state
+        variable 1), optionally sharded across a pool of processes. If a checkpoint directory is given, every
+        completed composition slice is written to it, and slices found in it are not recalculated, so that an
+        interrupted generation can be resumed.
 
         Parameters
         ----------
         fluid: Fluid
+            the fluid for which the table is generated
+        processes: Optional[int]
+            the number of processes used to generate the table
+        checkpoint: Optional[str | None]
+            the directory in which completed composition slices are stored
 
         Returns
         -------
@@ -313,105 +340,466 @@ class LookUpTable(Engine):
         Raises
         ValueError
             no values can be calculated for a given pressure
+        ValueError
+            the checkpoint directory belongs to a table with a different grid
         """
 
         nzH = self.Composition.size
         n1 = self.Inputs1.size
         n2 = self.Inputs2.size
 
-        # Results
-        self.ValuesT = np.empty((nzH, n1, n2))
-        self.ValuesP = np.empty((nzH, n1, n2))
-        self.ValuesH = np.empty((nzH, n1, n2))
-        self.ValuesS = np.empty((nzH, n1, n2))
-        self.ValuesQ = np.empty((nzH, n1, n2))
-        self.ValuesD = np.empty((nzH, n1, n2))
-        self.ValuesV = np.empty((nzH, n1, n2))
+        # Results, in the order T, P, H, S, Q, D, V along the last axis
+        values = np.empty((nzH, n1, n2, 7))
 
-        for i, z in enumerate(self.Composition):
+        finished = self.__load_checkpoint(checkpoint)
+        for i in finished:
+            values[i] = finished[i]
 
-            composition = [z, 1 - np.sum(z)]
+        tasks = [(i, j, float(z), float(Input1)) for i, z in enumerate(self.Composition) if i not in finished for j, Input1 in enumerate(self.Inputs1)]
+        remaining = {i: n1 for i in range(nzH) if i not in finished}
 
-            print("generating table for {}".format(composition))
+        fluid_spec = (fluid.components, fluid.engine, fluid.args, fluid.kwargs)
+        initargs = (fluid_spec, self.InputSpec, np.asarray(self.Inputs2, dtype=float))
 
-            base_fluid = fluid.update_composition(composition, InPlace=False)
+        def collect(rows):
+            for i, j, row in rows:
+                values[i, j] = row
 
+                remaining[i] -= 1
+                if remaining[i] == 0:
+                    print("generated table for {}".format([self.Composition[i], 1 - self.Composition[i]]))
+                    self.__save_checkpoint(checkpoint, i, values[i])
 
-            for j, Input1 in enumerate(self.Inputs1):
-                for k, Input2 in enumerate(self.Inputs2):
+        if processes > 1:
+            with multiprocessing.Pool(processes, initializer=_init_table_worker, initargs=initargs) as pool:
+                collect(pool.imap_unordered(_calc_table_row, tasks))
+        else:
+            _init_table_worker(*initargs)
+            collect(map(_calc_table_row, tasks))
 
-                    try:
-                        temp_fluid = base_fluid.copy()
-                        temp_fluid.update(self.InputSpec, Input1, Input2)
+        self.__set_values(values)
 
-                        # TODO there is an issue in GeoProp whereby the composition changes during the calculation...
-                        # print(sum(temp_fluid.state.state.fluid.total.molefrac[-4:-3]))
+    def __set_values(self, values: np.ndarray) -> NoReturn:
+        """
+        Helper function to set the table values and points for the current grid and prepare the table for look ups
 
-                        self.ValuesT[i, j, k] = temp_fluid.properties.T
-                        self.ValuesP[i, j, k] = temp_fluid.properties.P
-                        self.ValuesH[i, j, k] = temp_fluid.properties.H
-                        self.ValuesS[i, j, k] = temp_fluid.properties.S
-                        self.ValuesQ[i, j, k] = temp_fluid.properties.Q
-                        self.ValuesD[i, j, k] = temp_fluid.properties.D
-                        self.ValuesV[i, j, k] = 1 / temp_fluid.properties.D
+        Parameters
+        ----------
+        values: np.ndarray
+            the table values, in the order T, P, H, S, Q, D, V along the last axis
 
-                    except:
-                        self.ValuesT[i, j, k] = np.NaN
-                        self.ValuesP[i, j, k] = np.NaN
-                        self.ValuesH[i, j, k] = np.NaN
-                        self.ValuesS[i, j, k] = np.NaN
-                        self.ValuesQ[i, j, k] = np.NaN
-                        self.ValuesD[i, j, k] = np.NaN
-                        self.ValuesV[i, j, k] = np.NaN
+        Returns
+        -------
+        NoReturn
+        """
 
-                isNaN = np.isnan(self.ValuesT[i, j, :])
-                if sum(isNaN) > 0:
-                    if sum(isNaN) >= n2 - 1:
-                        raise ValueError("uh uh cannot calculate any values for this pressure :(")
+        self.ValuesT = values[..., 0]
+        self.ValuesP = values[..., 1]
+        self.ValuesH = values[..., 2]
+        self.ValuesS = values[..., 3]
+        self.ValuesQ = values[..., 4]
+        self.ValuesD = values[..., 5]
+        self.ValuesV = values[..., 6]
 
-                    bad_indeces = isNaN
-                    good_indeces = np.logical_not(isNaN)
+        if self.mode1 == "log":
+            inputs1 = np.log10(self.Inputs1)
+        else:
+            inputs1 = self.Inputs1
 
-                    good_x = self.Inputs2[good_indeces]
-                    bad_x = self.Inputs2[bad_indeces]
+        if self.mode2 == "log":
+            inputs2 = np.log10(self.Inputs2)
+        else:
+            inputs2 = self.Inputs2
 
-                    good_T = self.ValuesT[i, j, good_indeces]
-                    interpolated_T = np.interp(bad_x, good_x, good_T)
-                    self.ValuesT[i, j, bad_indeces] = interpolated_T
+        self.Points = [self.Composition, inputs1, inputs2]
 
-                    good_P = self.ValuesP[i, j, good_indeces]
-                    interpolated_P = np.interp(bad_x, good_x, good_P)
-                    self.ValuesP[i, j, bad_indeces] = interpolated_P
+        self.memory_mapped = False
 
-                    good_H = self.ValuesH[i, j, good_indeces]
-                    interpolated_H = np.interp(bad_x, good_x, good_H)
-                    self.ValuesH[i, j, bad_indeces] = interpolated_H
+        self.__init_lookup()
 
-                    good_S = self.ValuesS[i, j, good_indeces]
-                    interpolated_S = np.interp(bad_x, good_x, good_S)
-                    self.ValuesS[i, j, bad_indeces] = interpolated_S
+        self.loaded = True
 
-                    good_Q = self.ValuesQ[i, j, good_indeces]
-                    interpolated_Q = np.interp(bad_x, good_x, good_Q)
-                    self.ValuesQ[i, j, bad_indeces] = interpolated_Q
+    def __calc_rows(self,
+                    fluid: "Fluid",
+                    tasks: list[tuple[int, int, float, float]],
+                    Inputs2: np.ndarray,
+                    processes: int) -> list[tuple[int, int, np.ndarray]]:
+        """
+        Helper function to calculate table rows with the underlying engine, without patching states that cannot be
+        calculated
 
-                    good_D = self.ValuesD[i, j, good_indeces]
-                    interpolated_D = np.interp(bad_x, good_x, good_D)
-                    self.ValuesD[i, j, bad_indeces] = interpolated_D
-                    self.ValuesV[i, j, bad_indeces] = 1 / interpolated_D
+        Parameters
+        ----------
+        fluid: Fluid
+            the fluid for which the table is generated
+        tasks: list[tuple[int, int, float, float]]
+            the composition index, the state variable 1 index, the composition and the value of state variable 1 of
+            each row
+        Inputs2: np.ndarray
+            the values for state variable 2
+        processes: int
+            the number of processes used to evaluate the engine
 
+        Returns
+        -------
+        list[tuple[int, int, np.ndarray]]
+            the composition index, the state variable 1 index and the row values (T, P, H, S, Q, D, V)
+        """
 
-        if self.mode1 == "log":
-            inputs1 = np.log10(self.Inputs1)
-        else:
-            inputs1 = self.Inputs1
+        if not tasks:
+            return []
 
-        if self.mode2 == "log":
-            inputs2 = np.log10(self.Inputs2)
+        fluid_spec = (fluid.components, fluid.engine, fluid.args, fluid.kwargs)
+        initargs = (fluid_spec, self.InputSpec, np.asarray(Inputs2, dtype=float), False)
+
+        if processes > 1:
+            with multiprocessing.Pool(processes, initializer=_init_table_worker, initargs=initargs) as pool:
+                return list(pool.imap_unordered(_calc_table_row, tasks))
+
+        _init_table_worker(*initargs)
+        return list(map(_calc_table_row, tasks))
+
+    def generateAdaptiveTable(self,
+                              fluid: "Fluid",
+                              tolerance: Optional[float]=1e-3,
+                              properties: Optional[list[str]]=("H", "D", "Q"),
+                              max_iter: Optional[int]=4,
+                              max_points: Optional[int]=400,
+                              processes: Optional[int]=1,
+                              samples: Optional[int]=2000) -> dict:
+        """
+        generate the LookUpTable on an adaptively refined grid. Starting from the grid set by set_Input1 and
+        set_Input2, intervals of either state variable axis are halved wherever the estimated linear interpolation
+        error of any of the selected properties exceeds the tolerance, e.g. at the edges of the two-phase dome. Only
+        the new rows and columns are calculated and merged into the existing values. The resulting axes are
+        non-uniform. Finally, the interpolation error is evaluated against the underlying engine.
+
+        Parameters
+        ----------
+        fluid: Fluid
+            the fluid for which the table is generated
+        tolerance: Optional[float]
+            the maximum estimated interpolation error, relative to the range of each property
+        properties: Optional[list[str]]
+            the properties used to decide where the grid is refined
+        max_iter: Optional[int]
+            the maximum number of refinement iterations
+        max_points: Optional[int]
+            the maximum number of points along each state variable axis
+        processes: Optional[int]
+            the number of processes used to generate the table
+        samples: Optional[int]
+            the maximum number of states used to evaluate the interpolation error
+
+        Returns
+        -------
+        dict
+            the interpolation error report, see LookUpTable.interpolation_error
+        """
+
+        self.generateTable(fluid, processes=processes)
+
+        for iteration in range(max_iter):
+
+            new1 = self.__refine_axis(1, properties, tolerance, max_points)
+            new2 = self.__refine_axis(2, properties, tolerance, max_points)
+
+            if new1.size == 0 and new2.size == 0:
+                break
+
+            self.__extend_table(fluid, new1, new2, processes)
+
+            print("refinement {}: {} x {} points".format(iteration + 1, self.Inputs1.size, self.Inputs2.size))
+
+        self.error_report = self.interpolation_error(fluid, properties=properties, processes=processes, samples=samples)
+
+        return self.error_report
+
+    def __refine_axis(self, dim: int, properties: list[str], tolerance: float, max_points: int) -> np.ndarray:
+        """
+        Helper function to find the intervals of a state variable axis to be halved. The linear interpolation error of
+        each interval is estimated separately in every slice of the table along the axis (i.e. every row or column
+        and composition) from the second derivative of the properties, h^2/8 |f''|. The smaller of the second
+        derivatives at the two ends of the interval is used, so that a kink (e.g. a phase boundary) only marks the
+        interval it lies in. As the table is a tensor grid, an interval is halved if its error exceeds the tolerance
+        in any of the slices.
+
+        Parameters
+        ----------
+        dim: int
+            the table axis, i.e. 1 for state variable 1 and 2 for state variable 2
+        properties: list[str]
+            the properties used to decide where the grid is refined
+        tolerance: float
+            the maximum estimated interpolation error, relative to the range of each property
+        max_points: int
+            the maximum number of points along the axis
+
+        Returns
+        -------
+        np.ndarray
+            the new values of the state variable, empty if no interval needs to be refined
+        """
+
+        u = np.asarray(self.Points[dim], dtype=float)
+        h = np.diff(u)
+        n = u.size
+
+        if n < 3:
+            return np.empty(0)
+
+        error = np.zeros(n - 1)
+        for prop in properties:
+            values = np.moveaxis(getattr(self, "Values" + prop), dim, -1).reshape(-1, n)
+
+            scale = np.nanmax(values) - np.nanmin(values)
+            if not scale > 0:
+                continue
+
+            slopes = np.diff(values, axis=-1) / h
+
+            # the second derivative at every node of every slice, taken from the neighbouring node at the ends
+            curvature = np.abs(2 * np.diff(slopes, axis=-1) / (h[:-1] + h[1:]))
+            curvature = np.concatenate((curvature[:, :1], curvature, curvature[:, -1:]), axis=-1)
+
+            slice_error = h * h / 8 * np.minimum(curvature[:, :-1], curvature[:, 1:]) / scale
+            slice_error = np.nan_to_num(slice_error)
+
+            error = np.maximum(error, slice_error.max(axis=0))
+
+        refine = np.flatnonzero(error > tolerance)
+
+        # refine the worst intervals first, if the number of points would exceed the maximum
+        refine = refine[np.argsort(error[refine])[::-1]][:max(max_points - n, 0)]
+
+        u_new = np.sort(u[refine] + h[refine] / 2)
+
+        mode = self.mode1 if dim == 1 else self.mode2
+        return 10 ** u_new if mode == "log" else u_new
+
+    def __extend_table(self, fluid: "Fluid", new1: np.ndarray, new2: np.ndarray, processes: int) -> NoReturn:
+        """
+        Helper function to add values of the state variables to the table. Only the new columns of the existing rows
+        and the new rows are calculated, the existing values are kept.
+
+        Parameters
+        ----------
+        fluid: Fluid
+            the fluid for which the table is generated
+        new1: np.ndarray
+            the new values of state variable 1
+        new2: np.ndarray
+            the new values of state variable 2
+        processes: int
+            the number of processes used to evaluate the engine
+
+        Returns
+        -------
+        NoReturn
+
+        Raises
+        ------
+        ValueError
+            no values can be calculated for a given pressure
+        """
+
+        old1 = np.asarray(self.Inputs1, dtype=float)
+        old2 = np.asarray(self.Inputs2, dtype=float)
+
+        inputs1 = np.sort(np.concatenate((old1, new1)))
+        inputs2 = np.sort(np.concatenate((old2, new2)))
+
+        # the position of the existing and new values on the extended axes
+        j_old = np.searchsorted(inputs1, old1)
+        j_new = np.searchsorted(inputs1, new1)
+        k_old = np.searchsorted(inputs2, old2)
+        k_new = np.searchsorted(inputs2, new2)
+
+        old = np.stack([self.ValuesT, self.ValuesP, self.ValuesH, self.ValuesS, self.ValuesQ, self.ValuesD, self.ValuesV], axis=-1)
+
+        values = np.full((self.Composition.size, inputs1.size, inputs2.size, 7), np.nan)
+        values[:, j_old[:, np.newaxis], k_old[np.newaxis, :]] = old
+
+        # the new columns of the existing rows
+        tasks = [(i, j, float(z), float(old1[j])) for i, z in enumerate(self.Composition) for j in range(old1.size)]
+        for i, j, row in self.__calc_rows(fluid, tasks if new2.size else [], new2, processes):
+            values[i, j_old[j], k_new] = row
+
+        # the new rows
+        tasks = [(i, j, float(z), float(new1[j])) for i, z in enumerate(self.Composition) for j in range(new1.size)]
+        for i, j, row in self.__calc_rows(fluid, tasks, inputs2, processes):
+            values[i, j_new[j]] = row
+
+        for i in range(self.Composition.size):
+            for j in range(inputs1.size):
+                values[i, j] = _patch_row(values[i, j], inputs2)
+
+        self.Inputs1 = inputs1
+        self.Inputs2 = inputs2
+
+        self.__set_values(values)
+
+    def interpolation_error(self,
+                            fluid: "Fluid",
+                            properties: Optional[list[str]]=("H", "D", "Q"),
+                            processes: Optional[int]=1,
+                            samples: Optional[int]=2000) -> dict:
+        """
+        evaluates the interpolation error of the table against the underlying engine at the centres of the table
+        cells (a subset of them if there are more cells than samples)
+
+        Parameters
+        ----------
+        fluid: Fluid
+            the fluid for which the table is generated
+        properties: Optional[list[str]]
+            the properties to be evaluated
+        processes: Optional[int]
+            the number of processes used to evaluate the engine
+        samples: Optional[int]
+            the maximum number of states to be evaluated
+
+        Returns
+        -------
+        dict
+            the number of table points and states evaluated, and for each property the maximum absolute error, the
+            maximum and 95th percentile error relative to the range of the property and the state at which the
+            maximum occurs
+        """
+
+        centres = []
+        for dim in [1, 2]:
+            u = np.asarray(self.Points[dim], dtype=float)
+            centres.append((u[:-1] + u[1:]) / 2)
+
+        # evenly thin out the cell centres to the number of samples
+        n_per_axis = max(int(math.sqrt(samples / self.Composition.size)), 1)
+        for dim in [0, 1]:
+            if centres[dim].size > n_per_axis:
+                centres[dim] = centres[dim][np.linspace(0, centres[dim].size - 1, n_per_axis).astype(int)]
+
+        inputs = [10 ** c if mode == "log" else c for c, mode in zip(centres, [self.mode1, self.mode2])]
+
+        tasks = [(i, j, float(z), float(Input1)) for i, z in enumerate(self.Composition) for j, Input1 in enumerate(inputs[0])]
+
+        exact = np.empty((self.Composition.size, inputs[0].size, inputs[1].size, 7))
+
+        for i, j, row in self.__calc_rows(fluid, tasks, inputs[1], processes):
+            exact[i, j] = row
+
+        z, x1, x2 = np.meshgrid(self.Composition, centres[0], centres[1], indexing="ij")
+        table = self.__interpolate(z.ravel(), x1.ravel(), x2.ravel()).reshape(z.shape + (len(self.table_properties),))
+
+        report = {"points": int(self.Values[..., 0].size), "samples": int(exact[..., 0].size)}
+        columns = ["T", "P", "H", "S", "Q", "D", "V"]
+        for prop in properties:
+            engine = exact[..., columns.index(prop)]
+            error = np.abs(table[..., self.table_properties.index(prop)] - engine)
+            valid = ~np.isnan(error)
+            error[~valid] = -1
+
+            scale = np.nanmax(engine) - np.nanmin(engine)
+            scale = scale if scale > 0 else 1.0
+            k = np.unravel_index(np.argmax(error), error.shape)
+            p95 = np.percentile(error[valid], 95) if valid.any() else 0.0
+
+            report[prop] = {"max_error": float(max(error[k], 0.0)),
+                            "max_relative_error": float(max(error[k], 0.0) / scale),
+                            "p95_relative_error": float(p95 / scale),
+                            "state": {"z": float(self.Composition[k[0]]),
+                                      self.InputSpec[0]: float(inputs[0][k[1]]),
+                                      self.InputSpec[1]: float(inputs[1][k[2]])}}
+
+        return report
+
+    def __checkpoint_grid(self) -> dict:
+        """
+        Helper function to describe the table grid, used to check that a checkpoint belongs to this table
+
+        Returns
+        -------
+        dict
+        """
+
+        return {"InputSpec": self.InputSpec,
+                "Composition": np.asarray(self.Composition, dtype=float).tolist(),
+                "Inputs1": np.asarray(self.Inputs1, dtype=float).tolist(),
+                "Inputs2": np.asarray(self.Inputs2, dtype=float).tolist()}
+
+    def __load_checkpoint(self, checkpoint: str | None) -> dict[int, np.ndarray]:
+        """
+        Helper function to load the completed composition slices from a checkpoint directory
+
+        Parameters
+        ----------
+        checkpoint: str | None
+            the checkpoint directory
+
+        Returns
+        -------
+        dict[int, np.ndarray]
+            the completed slices for each composition index
+
+        Raises
+        ------
+        ValueError
+            the checkpoint directory belongs to a table with a different grid
+        """
+
+        if checkpoint is None:
+            return {}
+
+        os.makedirs(checkpoint, exist_ok=True)
+
+        grid = self.__checkpoint_grid()
+        grid_file = os.path.join(checkpoint, "grid.json")
+
+        if os.path.exists(grid_file):
+            with open(grid_file, "r") as file:
+                if json.load(file) != grid:
+                    msg = "\nThe checkpoint directory {} belongs to a table with a different grid".format(checkpoint)
+                    raise ValueError(msg)
         else:
-            inputs2 = self.Inputs2
+            with open(grid_file, "w") as file:
+                json.dump(grid, file)
 
-        self.Points = [self.Composition, inputs1, inputs2]
+        finished = {}
+        for i in range(self.Composition.size):
+            slice_file = os.path.join(checkpoint, "slice_{:04d}.npy".format(i))
+            if os.path.exists(slice_file):
+                finished[i] = np.load(slice_file)
+
+        if finished:
+            print("resuming table generation, {} of {} compositions already generated".format(len(finished), self.Composition.size))
+
+        return finished
+
+    def __save_checkpoint(self, checkpoint: str | None, i: int, values: np.ndarray) -> NoReturn:
+        """
+        Helper function to write a completed composition slice to the checkpoint directory
+
+        Parameters
+        ----------
+        checkpoint: str | None
+            the checkpoint directory
+        i: int
+            the composition index
+        values: np.ndarray
+            the table values of the composition slice
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        if checkpoint is None:
+            return
+
+        # write to a temporary file first, so an interruption cannot leave a partial slice behind
+        slice_file = os.path.join(checkpoint, "slice_{:04d}.npy".format(i))
+        with open(slice_file + ".tmp", "wb") as file:
+            np.save(file, values)
+        os.replace(slice_file + ".tmp", slice_file)
 
     def plot(self,
              filename: Optional[str]="",
@@ -467,9 +855,54 @@ class LookUpTable(Engine):
         if filename:
             fig.savefig(filename)
 
-    def save(self, filename:str) -> NoReturn:
+    def save(self, filename: str) -> NoReturn:
         """
-        save the LookUpTable to File
+        save the LookUpTable to a table directory, containing a JSON header (axes, modes, composition grid, format
+        version and checksum) and the stacked table values as a ".npy" file, which can be memory mapped when loading
+
+        Parameters
+        ----------
+        filename: str
+            the path of the table directory
+
+        Returns
+        -------
+        NoReturn
+
+        """
+
+        os.makedirs(filename, exist_ok=True)
+
+        values = np.ascontiguousarray(np.stack([getattr(self, "Values" + prop) for prop in self.table_properties], axis=-1), dtype=np.float64)
+        np.save(os.path.join(filename, "Values.npy"), values)
+
+        header = {"version": TABLE_FORMAT_VERSION,
+                  "InputSpec": self.InputSpec,
+                  "Composition": np.asarray(self.Composition, dtype=float).tolist(),
+                  "minZ": float(self.minZ),
+                  "maxZ": float(self.maxZ),
+                  "Inputs1": np.asarray(self.Inputs1, dtype=float).tolist(),
+                  "min1": float(self.min1),
+                  "max1": float(self.max1),
+                  "mode1": self.mode1,
+                  "Inputs2": np.asarray(self.Inputs2, dtype=float).tolist(),
+                  "min2": float(self.min2),
+                  "max2": float(self.max2),
+                  "mode2": self.mode2,
+                  "properties": self.table_properties,
+                  "shape": list(values.shape),
+                  "dtype": str(values.dtype),
+                  "checksum": hashlib.sha256(values.tobytes()).hexdigest()}
+
+        if getattr(self, "error_report", None) is not None:
+            header["error_report"] = self.error_report
+
+        with open(os.path.join(filename, "header.json"), "w") as file:
+            json.dump(header, file, indent=4)
+
+    def save_pickle(self, filename: str) -> NoReturn:
+        """
+        save the LookUpTable to a (legacy) pickle file
 
         Parameters
         ----------
@@ -505,9 +938,93 @@ class LookUpTable(Engine):
         with open(filename, "wb") as file:
             pickle.dump(container, file)
 
-    def load(self, filename: str) -> NoReturn:
+    def load(self, filename: str, verify: Optional[bool]=False) -> NoReturn:
+        """
+        loads the Look Up Table from a table directory (see LookUpTable.save) or a legacy pickle file. The values of a
+        table directory are memory mapped, i.e. they are read on demand and shared between processes.
+
+        Parameters
+        ----------
+        filename:
+            path of the table directory or filepath and name of the pickle file
+        verify: Optional[bool]
+            flag indicating whether the checksum of a table directory should be verified (reads the whole table)
+
+        Returns
+        -------
+        NoReturn
+
+        Raises
+        ------
+        ValueError
+            the table format version is not supported
+        ValueError
+            the table values do not match the checksum
+        """
+
+        if not os.path.isdir(filename):
+            self.__load_pickle(filename)
+            self.memory_mapped = False
+
+            self.__init_lookup()
+
+            self.loaded = True
+            self.filename = filename
+            return
+
+        with open(os.path.join(filename, "header.json"), "r") as file:
+            header = json.load(file)
+
+        if header["version"] > TABLE_FORMAT_VERSION:
+            msg = "\nThe LookUpTable format version {} is not supported (supported up to version {}). " \
+                  "Please update the LookUpTable engine".format(header["version"], TABLE_FORMAT_VERSION)
+            raise ValueError(msg)
+
+        self.InputSpec = header["InputSpec"]
+        self.error_report = header.get("error_report", None)
+
+        self.Composition = np.array(header["Composition"])
+        self.minZ = header["minZ"]
+        self.maxZ = header["maxZ"]
+
+        self.Inputs1 = np.array(header["Inputs1"])
+        self.min1 = header["min1"]
+        self.max1 = header["max1"]
+        self.mode1 = header["mode1"]
+
+        self.Inputs2 = np.array(header["Inputs2"])
+        self.min2 = header["min2"]
+        self.max2 = header["max2"]
+        self.mode2 = header["mode2"]
+
+        inputs1 = np.log10(self.Inputs1) if self.mode1 == "log" else self.Inputs1
+        inputs2 = np.log10(self.Inputs2) if self.mode2 == "log" else self.Inputs2
+        self.Points = [self.Composition, inputs1, inputs2]
+
+        self.Values = np.asarray(np.load(os.path.join(filename, "Values.npy"), mmap_mode="r"))
+
+        if list(self.Values.shape) != header["shape"] or str(self.Values.dtype) != header["dtype"]:
+            msg = "\nThe LookUpTable values in {} do not match the header".format(filename)
+            raise ValueError(msg)
+
+        if verify and hashlib.sha256(np.ascontiguousarray(self.Values).tobytes()).hexdigest() != header["checksum"]:
+            msg = "\nThe LookUpTable values in {} do not match the checksum".format(filename)
+            raise ValueError(msg)
+
+        # the property tables are views of the memory mapped values
+        for i, prop in enumerate(header["properties"]):
+            setattr(self, "Values" + prop, self.Values[..., i])
+
+        self.memory_mapped = True
+
+        self.__init_lookup(stack=False)
+
+        self.loaded = True
+        self.filename = filename
+
+    def __load_pickle(self, filename: str) -> NoReturn:
         """
-        loads the Look Up Table from a file
+        Helper function to load the Look Up Table from a (legacy) pickle file
 
         Parameters
         ----------
@@ -547,8 +1064,42 @@ class LookUpTable(Engine):
         self.ValuesQ = container["ValuesQ"]
         self.ValuesD = container["ValuesD"]
 
-        self.loaded = True
-        self.filename = filename
+    def __getstate__(self) -> dict:
+        """
+        returns the state for pickling, i.e. when the engine is sent to another process. Memory mapped values are not
+        pickled but mapped again from the table directory by the receiving process.
+
+        Returns
+        -------
+        dict
+        """
+
+        state = self.__dict__.copy()
+
+        if state.get("memory_mapped", False):
+            for key in ["Values"] + ["Values" + prop for prop in self.table_properties]:
+                state.pop(key, None)
+
+        return state
+
+    def __setstate__(self, state: dict) -> NoReturn:
+        """
+        restores the state after unpickling
+
+        Parameters
+        ----------
+        state: dict
+            the pickled state
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        self.__dict__.update(state)
+
+        if state.get("memory_mapped", False):
+            self.load(self.filename)
 
     def update_composition(self, Zs: Union[list[float], np.array]) -> NoReturn:
         """
@@ -620,6 +1171,12 @@ class LookUpTable(Engine):
 
         z = self.composition[0]
 
+        # direct look up if one of the state variables is an axis of the table
+        point = self.__lookup_point(z, InputSpec, Input1, Input2)
+        if point is not None:
+            self.state_properties = self.__get_properties(point)
+            return
+
         match InputSpec:
 
             case "PT":
@@ -666,6 +1223,61 @@ class LookUpTable(Engine):
                 msg = "\nThe input specification {} has not yet been implemented".format(InputSpec)
                 raise ValueError(msg)
 
+    def calc_batch(self, InputSpec: str, Input1: np.ndarray, Input2: np.ndarray, *args: tuple[any], **kwargs: dict[any]) -> Properties:
+        """
+        Evaluates the properties of the fluid for arrays of state specifications. If the state variables are the
+        ones the table was generated for, all states are interpolated at once, otherwise every state is solved
+        individually.
+
+        Parameters
+        ----------
+        InputSpec: str
+            The state variables. This should be two letter, e.g. "PH" for a pressure enthalpy calculation
+        Input1: np.ndarray
+            The values corresponding to state variable 1
+        Input2: np.ndarray
+            The values corresponding to state variable 2
+
+        Returns
+        -------
+        Properties
+
+        Raises
+        ------
+        ValueError
+            the combination of state variables is not supported
+        """
+
+        if not self.loaded:
+            self.load(self.filename)
+
+        if not self.mixtureFlag:
+            return self.cp_state_pure.calc_batch(InputSpec, Input1, Input2, *args, **kwargs)
+
+        self._check_input_spec(InputSpec)
+
+        if InputSpec not in [self.InputSpec, self.InputSpec[::-1]]:
+            return super().calc_batch(InputSpec, Input1, Input2, *args, **kwargs)
+
+        inputs1, inputs2 = self._broadcast_inputs(Input1, Input2)
+
+        if InputSpec != self.InputSpec:
+            inputs1, inputs2 = inputs2, inputs1
+
+        if self.mode1 == "log":
+            inputs1 = np.log10(inputs1)
+
+        if self.mode2 == "log":
+            inputs2 = np.log10(inputs2)
+
+        values = self.__interpolate(np.full(inputs1.size, self.composition[0]), inputs1.ravel(), inputs2.ravel())
+
+        results = self._empty_batch(inputs1.shape)
+        for i, prop in enumerate(self.table_properties):
+            results[prop] = values[..., i].reshape(inputs1.shape)
+
+        return Properties(results)
+
     def __calc_PT(self, z: float, Input1: float, Input2: float) -> Properties:
         """
         Helper function for performing a state calculation using pressure and temperature
@@ -718,7 +1330,7 @@ class LookUpTable(Engine):
                 def T_search(x):
                     point[2] = x
 
-                    T = scipy.interpolate.interpn(self.Points, self.ValuesT, point)[0]
+                    T = self.__interpolate_point("T", point)
 
                     return T - Input2
 
@@ -727,7 +1339,7 @@ class LookUpTable(Engine):
                 solution_T = root_scalar(T_search, method="brentq", bracket=[min2, max2], rtol=0.001)
                 point[2] = solution_T.root
 
-                P = scipy.interpolate.interpn(self.Points, self.ValuesP, point)[0]
+                P = self.__interpolate_point("P", point)
 
                 return P - Input1
 
@@ -775,7 +1387,7 @@ class LookUpTable(Engine):
                 def H_search(x):
                     point[2] = x
 
-                    H = scipy.interpolate.interpn(self.Points, self.ValuesH, point)[0]
+                    H = self.__interpolate_point("H", point)
 
                     return H - Input2
 
@@ -791,7 +1403,7 @@ class LookUpTable(Engine):
                 solution_H = root_scalar(H_search, method="brentq", bracket=[min2, max2], rtol=0.001)
                 point[2] = solution_H.root
 
-                P = scipy.interpolate.interpn(self.Points, self.ValuesP, point)[0]
+                P = self.__interpolate_point("P", point)
 
                 return P - Input1
 
@@ -850,7 +1462,7 @@ class LookUpTable(Engine):
             def H_search(x):
                 point[2] = x
 
-                H = scipy.interpolate.interpn(self.Points, self.ValuesH, point)[0]
+                H = self.__interpolate_point("H", point)
 
                 return H - Input2
 
@@ -914,7 +1526,7 @@ class LookUpTable(Engine):
                 def S_search(x):
                     point[2] = x
 
-                    S = scipy.interpolate.interpn(self.Points, self.ValuesS, point)[0]
+                    S = self.__interpolate_point("S", point)
 
                     return S - Input2
 
@@ -923,7 +1535,7 @@ class LookUpTable(Engine):
                 solution_S = root_scalar(S_search, method="brentq", bracket=[min2, max2], rtol=0.001)
                 point[2] = solution_S.root
 
-                P = scipy.interpolate.interpn(self.Points, self.ValuesP, point)[0]
+                P = self.__interpolate_point("P", point)
 
                 return P - Input1
 
@@ -985,7 +1597,7 @@ class LookUpTable(Engine):
                 def Q_search(x):
                     point[2] = x
 
-                    Q = scipy.interpolate.interpn(self.Points, self.ValuesQ, point)[0]
+                    Q = self.__interpolate_point("Q", point)
 
                     return Q - Input2
 
@@ -994,7 +1606,7 @@ class LookUpTable(Engine):
                 solution_Q = root_scalar(Q_search, method="brentq", bracket=[min2, max2], rtol=0.001)
                 point[2] = solution_Q.root
 
-                P = scipy.interpolate.interpn(self.Points, self.ValuesP, point)[0]
+                P = self.__interpolate_point("P", point)
 
                 return P - Input1
 
@@ -1056,7 +1668,7 @@ class LookUpTable(Engine):
                 def Q_search(x):
                     point[2] = x
 
-                    Q = scipy.interpolate.interpn(self.Points, self.ValuesQ, point)[0]
+                    Q = self.__interpolate_point("Q", point)
 
                     return Q - Input2
 
@@ -1065,7 +1677,7 @@ class LookUpTable(Engine):
                 solution_Q = root_scalar(Q_search, method="brentq", bracket=[min2, max2], rtol=0.001)
                 point[2] = solution_Q.root
 
-                T = scipy.interpolate.interpn(self.Points, self.ValuesT, point)[0]
+                T = self.__interpolate_point("T", point)
 
                 return T - Input1
 
@@ -1075,6 +1687,287 @@ class LookUpTable(Engine):
 
         return self.__get_properties(point)
 
+    def __init_lookup(self, stack: Optional[bool]=True) -> NoReturn:
+        """
+        Helper function to prepare the table for direct look ups, i.e. stacking all properties into a single array and
+        determining which axes are uniformly spaced. An axis with a single point (e.g. a table for a single
+        composition) is degenerate: it has zero spacing and is not interpolated along
+
+        Parameters
+        ----------
+        stack: Optional[bool]
+            flag indicating whether the properties need to be stacked (not required for tables loaded from a table
+            directory, whose values are stored stacked)
+
+        Returns
+        -------
+        NoReturn
+        """
+
+        if stack:
+            self.Values = np.ascontiguousarray(np.stack([getattr(self, "Values" + prop) for prop in self.table_properties], axis=-1))
+
+        self.__axes = [np.atleast_1d(np.asarray(axis, dtype=float)) for axis in self.Points]
+        self.__spacing = []
+        self.__next = []  # the offset of the upper cell boundary, 0 along a degenerate axis
+        for axis in self.__axes:
+            if axis.size < 2:
+                self.__spacing.append(0.0)
+                self.__next.append(0)
+                continue
+
+            steps = np.diff(axis)
+            if np.allclose(steps, steps[0], rtol=1e-9, atol=0.0):
+                self.__spacing.append(steps[0])
+            else:
+                self.__spacing.append(None)
+            self.__next.append(1)
+
+    def __locate(self, dim: int, x: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Helper function to find the table cell and the interpolation weight for values along one of the table axes.
+        Uniformly spaced axes are indexed directly, otherwise the cell is found by bisection. Along a degenerate axis
+        the index and weight are 0 and only the value of its single point is in bounds.
+
+        Parameters
+        ----------
+        dim: int
+            the table axis, i.e. 0 for the composition, 1 for state variable 1 and 2 for state variable 2
+        x: np.ndarray
+            the values along the table axis
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            the index of the lower cell boundary, the interpolation weight and a flag whether the value is in bounds
+        """
+
+        axis = self.__axes[dim]
+        spacing = self.__spacing[dim]
+
+        x = np.asarray(x, dtype=float)
+
+        if axis.size < 2:
+            valid = np.isclose(x, axis[0], rtol=1e-6, atol=1e-12)
+            if x.ndim == 0:
+                return 0, 0.0, bool(valid)
+
+            return np.zeros(x.shape, dtype=int), np.zeros(x.shape), valid
+
+        if x.ndim == 0:
+            x = float(x)
+
+            if spacing is not None and not math.isnan(x):
+                i = int((x - axis[0]) // spacing)
+            else:
+                i = int(np.searchsorted(axis, x, side="right")) - 1
+            i = min(max(i, 0), axis.size - 2)
+
+            w = (x - axis[i]) / (axis[i + 1] - axis[i])
+
+            return i, w, axis[0] <= x <= axis[-1]
+
+        if spacing is not None:
+            i = np.floor((x - axis[0]) / spacing)
+            i = np.clip(np.nan_to_num(i), 0, axis.size - 2).astype(int)
+        else:
+            i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, axis.size - 2)
+
+        w = (x - axis[i]) / (axis[i + 1] - axis[i])
+
+        valid = (x >= axis[0]) & (x <= axis[-1])
+
+        return i, w, valid
+
+    def __interpolate(self, z: np.ndarray, x1: np.ndarray, x2: np.ndarray) -> np.ndarray:
+        """
+        Helper function to interpolate all tabulated properties (trilinear interpolation). Points outside of the table
+        return NaN.
+
+        Parameters
+        ----------
+        z: np.ndarray
+            the composition
+        x1: np.ndarray
+            the values of state variable 1 (as log10 if the axis is logarithmic)
+        x2: np.ndarray
+            the values of state variable 2 (as log10 if the axis is logarithmic)
+
+        Returns
+        -------
+        np.ndarray
+            the properties in the order of "table_properties" along the last axis
+        """
+
+        iz, wz, valid_z = self.__locate(0, z)
+        i1, w1, valid_1 = self.__locate(1, x1)
+        i2, w2, valid_2 = self.__locate(2, x2)
+
+        if np.ndim(iz) == 0:
+            # single point: interpolate the 2x2x2 cell
+            # (the cell has a single layer along degenerate axes, whose weight is 0)
+            cell = self.Values[iz:iz + 2, i1:i1 + 2, i2:i2 + 2]
+            cell = (1 - wz) * cell[0] + wz * cell[-1]
+            cell = (1 - w1) * cell[0] + w1 * cell[-1]
+            values = (1 - w2) * cell[0] + w2 * cell[-1]
+
+            if not (valid_z and valid_1 and valid_2):
+                values[:] = np.nan
+
+            return values
+
+        wz = wz[..., np.newaxis]
+        w1 = w1[..., np.newaxis]
+        w2 = w2[..., np.newaxis]
+
+        nz, n1, n2 = self.__next
+
+        values = np.zeros(np.shape(iz) + (len(self.table_properties),))
+        for dz, fz in [(0, 1 - wz), (nz, wz)]:
+            for d1, f1 in [(0, 1 - w1), (n1, w1)]:
+                for d2, f2 in [(0, 1 - w2), (n2, w2)]:
+                    values = values + fz * f1 * f2 * self.Values[iz + dz, i1 + d1, i2 + d2]
+
+        values[~(valid_z & valid_1 & valid_2)] = np.nan
+
+        return values
+
+    def __interpolate_point(self, prop: str, point: list[float]) -> float:
+        """
+        Helper function to interpolate a single property at a single table point
+
+        Parameters
+        ----------
+        prop: str
+            the property
+        point: list[float]
+            the composition and the values of state variables 1 and 2 (as log10 if the axis is logarithmic)
+
+        Returns
+        -------
+        float
+
+        Raises
+        ------
+        ValueError
+            the point is outside of the table
+        """
+
+        for axis, x in zip(self.__axes, point):
+            if not (axis[0] <= x <= axis[-1] or (axis.size < 2 and math.isclose(x, axis[0], rel_tol=1e-6, abs_tol=1e-12))):
+                msg = "\nThe requested state is outside of the LookUpTable"
+                raise ValueError(msg)
+
+        return self.__interpolate(point[0], point[1], point[2])[self.table_properties.index(prop)]
+
+    def __invert(self, z: float, dim: int, x: float, prop: str, value: float) -> float:
+        """
+        Helper function to find the position along a table axis at which a property takes a given value, with the
+        other table axis fixed. The interpolated property is piecewise linear along the table axis, so the first
+        crossing of the target value is found directly from the (z, x) interpolated column of the table.
+
+        Parameters
+        ----------
+        z: float
+            the composition
+        dim: int
+            the known table axis, i.e. 1 for state variable 1 and 2 for state variable 2
+        x: float
+            the value along the known table axis (as log10 if the axis is logarithmic)
+        prop: str
+            the target property
+        value: float
+            the target value
+
+        Returns
+        -------
+        float
+            the value along the other table axis (as log10 if the axis is logarithmic)
+
+        Raises
+        ------
+        ValueError
+            the point is outside of the table
+        ValueError
+            the target value is not found
+        """
+
+        iz, wz, valid_z = self.__locate(0, z)
+        ik, wk, valid_k = self.__locate(dim, x)
+
+        if not (valid_z and valid_k):
+            msg = "\nThe requested state is outside of the LookUpTable"
+            raise ValueError(msg)
+
+        p = self.table_properties.index(prop)
+
+        if dim == 1:
+            block = self.Values[iz:iz + 2, ik:ik + 2, :, p]
+            axis = self.__axes[2]
+        else:
+            block = self.Values[iz:iz + 2, :, ik:ik + 2, p].transpose(0, 2, 1)
+            axis = self.__axes[1]
+
+        column = (1 - wz) * ((1 - wk) * block[0, 0] + wk * block[0, -1]) + wz * ((1 - wk) * block[-1, 0] + wk * block[-1, -1])
+
+        # find the first cell in which the column crosses the target value (ignoring plateaus at the target value)
+        d = column - value
+        crossing = (d[:-1] * d[1:] <= 0) & ~((d[:-1] == 0) & (d[1:] == 0))
+        cells = np.flatnonzero(crossing)
+
+        if cells.size == 0:
+            msg = "\nThe value {} = {} is not found in the LookUpTable".format(prop, value)
+            raise ValueError(msg)
+
+        j = cells[0]
+        frac = d[j] / (d[j] - d[j + 1]) if d[j] != d[j + 1] else 0.0
+
+        return axis[j] + frac * (axis[j + 1] - axis[j])
+
+    def __lookup_point(self, z: float, InputSpec: str, Input1: float, Input2: float) -> list[float, float, float] | None:
+        """
+        Helper function to find the table point of a state, if one of the state variables is an axis of the table
+
+        Parameters
+        ----------
+        z: float
+            the composition
+        InputSpec: str
+            The state variables. This should be two letter, e.g. "PH" for a pressure enthalpy calculation
+        Input1: float
+            The value corresponding to state variable 1
+        Input2: float
+            The value corresponding to state variable 2
+
+        Returns
+        -------
+        list[float, float, float] | None
+            the table point, or None if neither state variable is an axis of the table
+        """
+
+        inputs = {InputSpec[0]: Input1, InputSpec[1]: Input2}
+        modes = [self.mode1, self.mode2]
+
+        def to_axis(dim, x):
+            return math.log10(x) if modes[dim - 1] == "log" else x
+
+        if set(inputs) == set(self.InputSpec):
+            return [z, to_axis(1, inputs[self.InputSpec[0]]), to_axis(2, inputs[self.InputSpec[1]])]
+
+        for dim in [1, 2]:
+            known = self.InputSpec[dim - 1]
+            if known in inputs:
+                target = [i for i in inputs if i != known][0]
+                if target not in self.table_properties:
+                    return None
+
+                x = to_axis(dim, inputs[known])
+                y = self.__invert(z, dim, x, target, inputs[target])
+
+                return [z, x, y] if dim == 1 else [z, y, x]
+
+        return None
+
     def __get_properties(self, point: list[float, float, float]) -> Properties:
         """
         Helper function to retrieve the properties for a given point
@@ -1087,19 +1980,167 @@ class LookUpTable(Engine):
         Returns
         -------
         Properties
+
+        Raises
+        ------
+        ValueError
+            the point is outside of the table
         """
 
-        P = scipy.interpolate.interpn(self.Points, self.ValuesP, point)[0]
-        T = scipy.interpolate.interpn(self.Points, self.ValuesT, point)[0]
-        H = scipy.interpolate.interpn(self.Points, self.ValuesH, point)[0]
-        S = scipy.interpolate.interpn(self.Points, self.ValuesS, point)[0]
-        Q = scipy.interpolate.interpn(self.Points, self.ValuesQ, point)[0]
-        D = scipy.interpolate.interpn(self.Points, self.ValuesD, point)[0]
+        values = self.__interpolate(point[0], point[1], point[2])
+
+        if np.isnan(values).all():
+            msg = "\nThe requested state is outside of the LookUpTable"
+            raise ValueError(msg)
+
+        P, T, H, S, Q, D = (float(i) for i in values)
         V = 1 / D
 
         return Properties({"P": P, "T": T, "H": H, "S": S, "Q": Q, "D": D, "V": V})
 
 
+_table_worker = {}  # the fluid and grid used by the table generation in this process
+
+
+def _init_table_worker(fluid_spec: tuple, InputSpec: str, Inputs2: np.ndarray, patch: Optional[bool]=True) -> NoReturn:
+    """
+    Initialises a process for the table generation
+
+    Parameters
+    ----------
+    fluid_spec: tuple
+        the components, engine, args and kwargs of the fluid for which the table is generated
+    InputSpec: str
+        the state variables for which the LookUpTable is generated
+    Inputs2: np.ndarray
+        the values for state variable 2
+    patch: Optional[bool]
+        flag indicating whether states that cannot be calculated are interpolated from the rest of the row
+
+    Returns
+    -------
+    NoReturn
+    """
+
+    _table_worker.clear()
+    _table_worker["fluid_spec"] = fluid_spec
+    _table_worker["InputSpec"] = InputSpec
+    _table_worker["Inputs2"] = Inputs2
+    _table_worker["patch"] = patch
+    _table_worker["fluids"] = {}
+
+
+def _calc_table_row(task: tuple[int, int, float, float]) -> tuple[int, int, np.ndarray]:
+    """
+    Calculates one row of the LookUpTable, i.e. all values of state variable 2 for a given composition and value of
+    state variable 1. States that cannot be calculated are interpolated from the rest of the row.
+
+    Parameters
+    ----------
+    task: tuple[int, int, float, float]
+        the composition index, the state variable 1 index, the composition and the value of state variable 1
+
+    Returns
+    -------
+    tuple[int, int, np.ndarray]
+        the composition index, the state variable 1 index and the row values (T, P, H, S, Q, D, V)
+
+    Raises
+    ------
+    ValueError
+        no values can be calculated for a given pressure
+    """
+
+    from FluidProperties.fluid import Fluid
+
+    i, j, z, Input1 = task
+
+    InputSpec = _table_worker["InputSpec"]
+    Inputs2 = _table_worker["Inputs2"]
+    n2 = Inputs2.size
+
+    # the fluid of each composition is only created once per process
+    if z not in _table_worker["fluids"]:
+        components, engine, args, kwargs = _table_worker["fluid_spec"]
+
+        comps = []
+        for comp, compo in zip(components, [z, 1 - z]):
+            comps.append(comp)
+            comps.append(compo)
+
+        _table_worker["fluids"][z] = Fluid(comps, *args, engine=engine, **kwargs)
+
+    base_fluid = _table_worker["fluids"][z]
+
+    row = np.empty((n2, 7))
+    for k, Input2 in enumerate(Inputs2):
+
+        try:
+            temp_fluid = base_fluid.copy()
+            temp_fluid.update(InputSpec, Input1, Input2)
+
+            # TODO there is an issue in GeoProp whereby the composition changes during the calculation...
+            # print(sum(temp_fluid.state.state.fluid.total.molefrac[-4:-3]))
+
+            row[k] = [temp_fluid.properties.T,
+                      temp_fluid.properties.P,
+                      temp_fluid.properties.H,
+                      temp_fluid.properties.S,
+                      temp_fluid.properties.Q,
+                      temp_fluid.properties.D,
+                      1 / temp_fluid.properties.D]
+
+        except:
+            row[k] = np.nan
+
+    if not _table_worker["patch"]:
+        return i, j, row
+
+    return i, j, _patch_row(row, Inputs2)
+
+
+def _patch_row(row: np.ndarray, Inputs2: np.ndarray) -> np.ndarray:
+    """
+    Interpolates the states of a LookUpTable row that could not be calculated from the rest of the row
+
+    Parameters
+    ----------
+    row: np.ndarray
+        the row values (T, P, H, S, Q, D, V)
+    Inputs2: np.ndarray
+        the values for state variable 2
+
+    Returns
+    -------
+    np.ndarray
+
+    Raises
+    ------
+    ValueError
+        no values can be calculated for a given pressure
+    """
+
+    n2 = Inputs2.size
+
+    isNaN = np.isnan(row[:, 0])
+    if sum(isNaN) > 0:
+        if sum(isNaN) >= n2 - 1:
+            raise ValueError("uh uh cannot calculate any values for this pressure :(")
+
+        bad_indeces = isNaN
+        good_indeces = np.logical_not(isNaN)
+
+        good_x = Inputs2[good_indeces]
+        bad_x = Inputs2[bad_indeces]
+
+        # interpolate T, P, H, S, Q and D, the specific volume follows from the density
+        for p in range(6):
+            row[bad_indeces, p] = np.interp(bad_x, good_x, row[good_indeces, p])
+        row[bad_indeces, 6] = 1 / row[bad_indeces, 5]
+
+    return row
+
+
 def register() -> NoReturn:
     """
     Registers the LookUpTable property calculation engine